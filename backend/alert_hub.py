@@ -0,0 +1,172 @@
+"""
+Alert fan-out hub for server-push delivery
+Write handlers publish once; every connected stream (SSE) receives the event without touching the database.
+The same broker carries internal events (e.g. cache invalidations) between workers.
+"""
+import asyncio
+import json
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Set, Tuple
+
+# Per-connection buffer. A client that falls this far behind is disconnected
+# and will reconnect (EventSource does so automatically).
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class AlertBroker(ABC):
+    """
+    Transport between worker processes.
+
+    The hub hands every published event to the broker, and the broker calls the
+    deliver callback for every event that should reach local subscribers
+    (including the ones this process published itself).
+    """
+
+    @abstractmethod
+    def start(self, deliver: Callable[[dict], None]) -> None:
+        ...
+
+    @abstractmethod
+    def publish(self, event: dict) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class InProcessBroker(AlertBroker):
+    """Single-worker broker: delivers events straight back to the local hub."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[dict], None]] = None
+
+    def start(self, deliver: Callable[[dict], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, event: dict) -> None:
+        if self._deliver:
+            self._deliver(event)
+
+
+class RedisBroker(AlertBroker):
+    """
+    Multi-worker broker using Redis pub/sub.
+    Requires the optional `redis` package; select it with ALERT_BROKER_URL=redis://host:port/db
+    """
+
+    def __init__(self, url: str, channel: str = "andreabrgy:alerts"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("ALERT_BROKER_URL points to Redis but the 'redis' package is not installed")
+        self._client = redis.Redis.from_url(url)
+        self._channel = channel
+        self._pubsub = None
+        self._thread = None
+
+    def start(self, deliver: Callable[[dict], None]) -> None:
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+
+        def handler(message):
+            try:
+                deliver(json.loads(message["data"]))
+            except (ValueError, TypeError):
+                pass
+
+        self._pubsub.subscribe(**{self._channel: handler})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, event: dict) -> None:
+        self._client.publish(self._channel, json.dumps(event, default=str))
+
+    def close(self) -> None:
+        if self._thread:
+            self._thread.stop()
+        if self._pubsub:
+            self._pubsub.close()
+
+
+class AlertHub:
+    """In-process fan-out of broker events to connected stream subscribers."""
+
+    def __init__(self, broker: AlertBroker):
+        self._broker = broker
+        self._lock = threading.Lock()
+        self._subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._listeners: List[Callable[[dict], None]] = []
+        self._broker.start(self._deliver)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict, internal: bool = False) -> None:
+        """
+        Publish an event. Safe to call from sync route handlers running in the threadpool.
+        Internal events reach in-process listeners on every worker but are not streamed to browsers.
+        """
+        event = {"id": uuid.uuid4().hex, "type": event_type, "data": data}
+        if internal:
+            event["internal"] = True
+        self._broker.publish(event)
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        """Call listener(event) for every event delivered to this worker."""
+        self._listeners.append(listener)
+
+    def subscribe(self) -> Tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        """Register a subscriber on the running event loop. Pair with unsubscribe()."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _deliver(self, event: dict) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Alert hub listener failed: {e}")
+        if event.get("internal"):
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, event)
+            except RuntimeError:
+                # Loop already closed; drop the subscriber
+                self.unsubscribe((loop, queue))
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, event: dict) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: signal the stream to close so the client reconnects
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+
+def create_broker() -> AlertBroker:
+    """Build the broker selected by ALERT_BROKER_URL (unset means single-process)."""
+    url = os.getenv("ALERT_BROKER_URL", "").strip()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBroker(url)
+    return InProcessBroker()
+
+
+def format_sse(event: dict) -> str:
+    """Serialize a hub event as a Server-Sent Events frame."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+alert_hub = AlertHub(create_broker())
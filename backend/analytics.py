@@ -0,0 +1,96 @@
+"""
+GROUP BY helpers for the analytics endpoints
+Aggregation happens in the database, so responses grow with the number of buckets rather than table size
+"""
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+
+BUCKETS = ("day", "week", "month")
+
+# strftime-style formats per dialect; weeks are ISO weeks on MySQL, Monday-based weeks on SQLite
+_MYSQL_FORMATS = {"day": "%Y-%m-%d", "week": "%x-W%v", "month": "%Y-%m"}
+_SQLITE_FORMATS = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def bucket_expression(db: Session, column, bucket: str):
+    """SQL expression labelling each row with its period (e.g. 2024-06-01, 2024-W22, 2024-06)."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        return func.date_format(column, _MYSQL_FORMATS[bucket])
+    if dialect == "sqlite":
+        return func.strftime(_SQLITE_FORMATS[bucket], column)
+    raise ValueError(f"Time bucketing is not supported on {dialect}")
+
+
+def duration_seconds(db: Session, start_column, end_column):
+    """SQL expression for end - start in seconds."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        return func.timestampdiff(literal_column("SECOND"), start_column, end_column)
+    if dialect == "sqlite":
+        return (func.julianday(end_column) - func.julianday(start_column)) * 86400.0
+    raise ValueError(f"Duration arithmetic is not supported on {dialect}")
+
+
+def apply_date_range(query, column, date_from: Optional[datetime], date_to: Optional[datetime]):
+    if date_from is not None:
+        query = query.filter(column >= date_from)
+    if date_to is not None:
+        query = query.filter(column < date_to)
+    return query
+
+
+def _key(value) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def bucketed_counts(db: Session, model, group_column, bucket: str,
+                    date_from: Optional[datetime], date_to: Optional[datetime]) -> Dict:
+    """
+    Count rows of model per (period, group_column) in one GROUP BY query.
+    Returns {"totals": {key: count}, "buckets": [{"period", "key", "count"}, ...]}.
+    """
+    period = bucket_expression(db, model.created_at, bucket).label("period")
+    query = db.query(period, group_column, func.count(model.id))
+    query = apply_date_range(query, model.created_at, date_from, date_to)
+    rows = query.group_by(period, group_column).order_by(period).all()
+
+    totals: Dict[str, int] = {}
+    buckets: List[Dict] = []
+    for row_period, value, count in rows:
+        key = _key(value)
+        totals[key] = totals.get(key, 0) + count
+        buckets.append({"period": row_period, "key": key, "count": count})
+    return {"totals": totals, "buckets": buckets}
+
+
+def duration_percentiles(db: Session, model, start_column, end_column,
+                         date_from: Optional[datetime], date_to: Optional[datetime]) -> Dict:
+    """
+    Nearest-rank percentiles of end - start (in hours) over rows where end is set.
+    Each percentile is one ORDER BY ... LIMIT 1 OFFSET k query, so only single values leave the database.
+    """
+    duration = duration_seconds(db, start_column, end_column)
+    base = db.query(duration.label("duration")).filter(end_column.isnot(None))
+    base = apply_date_range(base, model.created_at, date_from, date_to)
+
+    summary = db.query(func.count(model.id), func.avg(duration)).filter(end_column.isnot(None))
+    count, average = apply_date_range(summary, model.created_at, date_from, date_to).one()
+    result = {"resolved_count": count or 0, "average_hours": None}
+    for p in PERCENTILES:
+        result[f"p{p}_hours"] = None
+    if not count:
+        return result
+
+    result["average_hours"] = round(float(average) / 3600.0, 2)
+    for p in PERCENTILES:
+        offset = max(0, math.ceil(p / 100.0 * count) - 1)
+        value = base.order_by(duration).limit(1).offset(offset).scalar()
+        result[f"p{p}_hours"] = round(float(value) / 3600.0, 2) if value is not None else None
+    return result
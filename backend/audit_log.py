@@ -0,0 +1,141 @@
+"""
+Asynchronous, batched writer for system_logs
+Handlers enqueue audit records without touching the database; a background thread
+bulk-inserts them every AUDIT_BATCH_SIZE records or AUDIT_FLUSH_INTERVAL_MS milliseconds
+"""
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import insert
+
+from database import engine
+from log_retention import log_expiry
+from models import SystemLog
+
+AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', '200'))
+AUDIT_FLUSH_INTERVAL_MS = int(os.getenv('AUDIT_FLUSH_INTERVAL_MS', '500'))
+AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', '10000'))
+# What to do when the queue is full: drop_newest (discard the incoming record)
+# or drop_oldest (discard the oldest queued record to make room)
+AUDIT_OVERFLOW_POLICY = os.getenv('AUDIT_OVERFLOW_POLICY', 'drop_newest')
+
+
+class AuditLogWriter:
+    def __init__(self, bind=engine, batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval_ms: int = AUDIT_FLUSH_INTERVAL_MS, max_queue: int = AUDIT_QUEUE_SIZE,
+                 overflow_policy: str = AUDIT_OVERFLOW_POLICY):
+        self.bind = bind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.overflow_policy = overflow_policy
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"queued": 0, "flushed": 0, "dropped": 0, "failed": 0, "batches": 0}
+        # Called from the writer thread after each successful flush
+        self.on_flush: Optional[Callable[[int], None]] = None
+
+    def record(self, action: str, user_id: Optional[int], details: str) -> bool:
+        """Enqueue an audit record. Never blocks; returns False if the record was dropped."""
+        self.start()
+        # Stamp now so the log reflects when the action happened, not when it was flushed
+        timestamp = datetime.now(timezone.utc)
+        row = {
+            "action": action,
+            "user_id": user_id,
+            "details": details,
+            "timestamp": timestamp,
+            "expires_at": log_expiry(action, timestamp),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            if self.overflow_policy != 'drop_oldest':
+                self._count("dropped")
+                return False
+            try:
+                self._queue.get_nowait()
+                self._count("dropped")
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self._count("dropped")
+                return False
+        self._count("queued")
+        return True
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued, then stop the writer thread."""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        # Sentinel goes through the queue so every record ahead of it is flushed first
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _run(self) -> None:
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                row = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                row = False
+            if row is None:
+                self._flush(batch)
+                return
+            if row:
+                batch.append(row)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch: list) -> None:
+        if not batch:
+            return
+        try:
+            # One multi-row INSERT (executemany) and one commit per batch
+            with self.bind.begin() as conn:
+                conn.execute(insert(SystemLog.__table__), batch)
+        except Exception as e:
+            print(f"Audit log flush failed, dropping {len(batch)} records: {e}")
+            self._count("failed", len(batch))
+            return
+        self._count("flushed", len(batch))
+        self._count("batches")
+        if self.on_flush is not None:
+            try:
+                self.on_flush(len(batch))
+            except Exception as e:
+                print(f"Audit log flush callback failed: {e}")
+
+
+audit_log = AuditLogWriter()
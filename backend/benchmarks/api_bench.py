@@ -0,0 +1,312 @@
+"""
+API benchmark suite
+Boots server.app in-process (httpx ASGITransport, startup/shutdown hooks included) against a
+bulk-seeded database and runs scripted scenarios with N concurrent clients, then prints
+throughput and latency percentiles as JSON for run-to-run comparison.
+
+    cd backend && python -m benchmarks.api_bench --scale small
+    python -m benchmarks.api_bench --scale medium --scenarios dashboard,report_listing \\
+        --output after.json --baseline before.json
+
+Scenarios: login_storm, alert_polling, dashboard, report_listing, chatbot. The default database
+is a SQLite file per scale in the temp directory, reused across runs; --database-url points at a
+MySQL test database instead (it must be empty or hold an earlier benchmark seed).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIO_NAMES = ("login_storm", "alert_polling", "dashboard", "report_listing", "chatbot")
+CHATBOT_MESSAGES = (
+    "How do I report a flood?",
+    "What are the barangay office hours?",
+    "Where is the nearest evacuation center?",
+    "How can I request a barangay clearance?",
+    "Who do I call for an emergency?",
+)
+REPORT_PAGES = 5
+# (users, reports, alerts)
+SCALES = {
+    "small": (200, 1_000, 100),
+    "medium": (10_000, 100_000, 2_000),
+    "large": (10_000, 1_000_000, 10_000),
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+
+    def add(self, seconds: float, status_code: int) -> None:
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        if 200 <= status_code < 400:
+            self.latencies.append(seconds)
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+
+        def pct(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000, 2)
+
+        total = sum(self.statuses.values())
+        return {
+            "requests": total,
+            "ok": len(latencies),
+            "errors": total - len(latencies),
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+            "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+            "p50_ms": pct(50),
+            "p90_ms": pct(90),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+
+
+def client_for(app, n: int) -> httpx.AsyncClient:
+    # A distinct address per simulated client, like real traffic, so per-IP limits apply per client
+    transport = httpx.ASGITransport(app=app, client=(f"10.0.{n // 250}.{n % 250 + 1}", 40000 + n))
+    return httpx.AsyncClient(transport=transport, base_url="http://bench.local", timeout=120.0)
+
+
+async def timed(recorder: Recorder, request) -> httpx.Response:
+    start = time.perf_counter()
+    response = await request
+    recorder.add(time.perf_counter() - start, response.status_code)
+    return response
+
+
+async def login_storm(client, ctx, n, recorder, stop_at):
+    from benchmarks.dataset import resident_email, PASSWORD
+    i = n
+    while time.monotonic() < stop_at:
+        email = resident_email(i % ctx["residents"])
+        i += ctx["clients"]
+        await timed(recorder, client.post("/api/auth/login", json={"email": email, "password": PASSWORD}))
+
+
+async def alert_polling(client, ctx, n, recorder, stop_at):
+    headers = ctx["resident_headers"](n)
+    since = None
+    while time.monotonic() < stop_at:
+        params = {"since": since} if since else {}
+        response = await timed(recorder, client.get("/api/alerts/new", params=params, headers=headers))
+        if response.status_code == 200:
+            alerts = response.json()
+            # Poll for anything newer than what this client has already seen
+            since = alerts[0]["created_at"] if alerts else since or datetime.now(timezone.utc).isoformat()
+
+
+async def dashboard(client, ctx, n, recorder, stop_at):
+    headers = ctx["admin_headers"]
+    while time.monotonic() < stop_at:
+        await timed(recorder, client.get("/api/stats/dashboard", headers=headers))
+
+
+async def report_listing(client, ctx, n, recorder, stop_at):
+    headers = ctx["official_headers"](n)
+    while time.monotonic() < stop_at:
+        cursor = None
+        for _ in range(REPORT_PAGES):
+            params = {"limit": 20}
+            if cursor:
+                params["cursor"] = cursor
+            response = await timed(recorder, client.get("/api/reports", params=params, headers=headers))
+            cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+            if not cursor or time.monotonic() >= stop_at:
+                break
+
+
+async def chatbot(client, ctx, n, recorder, stop_at):
+    headers = ctx["resident_headers"](n)
+    i = n
+    while time.monotonic() < stop_at:
+        message = CHATBOT_MESSAGES[i % len(CHATBOT_MESSAGES)]
+        i += 1
+        await timed(recorder, client.post("/api/chatbot/query", json={"message": message}, headers=headers))
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "alert_polling": alert_polling,
+    "dashboard": dashboard,
+    "report_listing": report_listing,
+    "chatbot": chatbot,
+}
+
+
+async def run_scenario(app, name: str, ctx: dict, clients: int, duration: float) -> dict:
+    recorder = Recorder()
+    http_clients = [client_for(app, n) for n in range(clients)]
+    try:
+        started = time.monotonic()
+        stop_at = started + duration
+        await asyncio.gather(*(SCENARIOS[name](c, ctx, n, recorder, stop_at) for n, c in enumerate(http_clients)))
+        elapsed = time.monotonic() - started
+    finally:
+        await asyncio.gather(*(c.aclose() for c in http_clients))
+    return dict(recorder.summary(elapsed), clients=clients, duration_s=round(elapsed, 2))
+
+
+async def run(args, scenario_names) -> dict:
+    import server
+    from database import SessionLocal
+    from models import User, UserRole
+    from benchmarks.dataset import ADMIN_EMAIL, account_counts
+
+    if not args.keep_rate_limits:
+        # Measure the handlers, not the throttle; real clients would mostly see 429s here
+        for limiter in (server.chatbot_account_limiter, server.chatbot_ip_limiter):
+            limiter.limit = 10 ** 9
+
+    db = SessionLocal()
+    try:
+        users = db.query(User.id, User.email, User.role).all()
+    finally:
+        db.close()
+    by_role = {role: [u for u in users if u.role == role] for role in UserRole}
+    admin = next(u for u in by_role[UserRole.ADMIN] if u.email == ADMIN_EMAIL)
+
+    def token_headers(user):
+        return {"Authorization": f"Bearer {server.create_access_token(user.id, user.email, user.role.value)}"}
+
+    def rotating(role):
+        accounts = by_role[role]
+        return lambda n: token_headers(accounts[n % len(accounts)])
+
+    _, residents = account_counts(args.users)
+    ctx = {
+        "clients": args.clients,
+        "residents": min(residents, len(by_role[UserRole.RESIDENT])),
+        "admin_headers": token_headers(admin),
+        "resident_headers": rotating(UserRole.RESIDENT),
+        "official_headers": rotating(UserRole.OFFICIAL),
+    }
+
+    results = {}
+    async with server.app.router.lifespan_context(server.app):
+        for name in scenario_names:
+            if args.warmup:
+                await run_scenario(server.app, name, ctx, min(args.clients, 5), args.warmup)
+            results[name] = await run_scenario(server.app, name, ctx, args.clients, args.duration)
+            print(f"{name:>15}: {results[name]['rps']} rps, p95 {results[name]['p95_ms']} ms, "
+                  f"errors {results[name]['errors']}", file=sys.stderr)
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """Percent change per scenario against an earlier run (positive rps / negative p95 is better)."""
+    changes = {}
+    for name, current in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        changes[name] = {}
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            if previous.get(key) and current.get(key) is not None:
+                changes[name][key] = round((current[key] - previous[key]) / previous[key] * 100, 1)
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="small", help="small, medium or large")
+    parser.add_argument("--users", type=int, help="override the scale's user count")
+    parser.add_argument("--reports", type=int, help="override the scale's report count")
+    parser.add_argument("--alerts", type=int, help="override the scale's alert count")
+    parser.add_argument("--scenarios", default=",".join(SCENARIO_NAMES))
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of warmup per scenario (0 to skip)")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--fresh", action="store_true", help="drop the default SQLite file and reseed")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="leave the chatbot limits in place")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    scenario_names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenario_names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    if args.scale not in SCALES:
+        parser.error(f"--scale must be one of {', '.join(SCALES)}")
+    users, reports, alerts = SCALES[args.scale]
+    args.users = args.users or users
+    args.reports = args.reports if args.reports is not None else reports
+    args.alerts = args.alerts if args.alerts is not None else alerts
+
+    database_url = args.database_url
+    if database_url is None:
+        path = os.path.join(tempfile.gettempdir(),
+                            f"andreabrgy-bench-{args.users}u-{args.reports}r-{args.alerts}a.db")
+        if args.fresh and os.path.exists(path):
+            os.remove(path)
+        database_url = f"sqlite:///{path}"
+    # Must be in place before database.py is imported
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+    os.environ.setdefault("STATS_RECONCILE_INTERVAL_SECONDS", "0")
+    os.environ.setdefault("PROFILE_SLOW_MS", "0")
+    sys.path.insert(0, BACKEND_DIR)
+
+    from benchmarks import dataset
+    if dataset.is_seeded():
+        counts = dataset.row_counts()
+        print(f"Reusing seeded database: {counts}", file=sys.stderr)
+    else:
+        started = time.perf_counter()
+        counts = dataset.seed(args.users, args.reports, args.alerts)
+        print(f"Seeded {counts} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    results = asyncio.run(run(args, scenario_names))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "database": database_url.split("://")[0],
+            "rows": counts,
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "async_db": os.getenv("ASYNC_DB", "false"),
+        },
+        "scenarios": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["change_pct"] = compare(results, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
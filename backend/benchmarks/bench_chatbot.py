@@ -0,0 +1,86 @@
+"""
+Micro-benchmark for the chatbot rule index
+Grows the rule set from the built-in intents to thousands of synthetic ones and reports the
+per-query cost of the keyword trie next to the old linear substring scan.
+
+    cd backend && python -m benchmarks.bench_chatbot [--queries 2000] [--sizes 10,100,500,2000]
+"""
+import argparse
+import random
+import time
+
+from chatbot import INTENTS, Intent, RuleIndex
+
+SYLLABLES = ("ba", "ka", "da", "ga", "ha", "la", "ma", "na", "pa", "ra", "sa", "ta", "wa", "ya",
+             "bi", "ki", "lo", "mu", "ni", "po", "ru", "si", "to", "yu")
+# Filler words are drawn from disjoint syllables so only the inserted keyword can match
+FILLER_SYLLABLES = ("qe", "xo", "zu", "vi", "fe", "je", "xi", "qo", "zo", "vu")
+
+
+def synthetic_word(rng: random.Random, syllables=SYLLABLES) -> str:
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+
+
+def build_intents(size: int, rng: random.Random):
+    intents = list(INTENTS)
+    while len(intents) < size:
+        keywords = tuple(
+            " ".join(synthetic_word(rng) for _ in range(rng.choice((1, 1, 1, 2, 3))))
+            for _ in range(7)
+        )
+        intents.append(Intent(f"intent_{len(intents)}", keywords, f"Response {len(intents)}"))
+    return intents
+
+
+def build_queries(intents, count: int, rng: random.Random):
+    queries = []
+    for n in range(count):
+        words = [synthetic_word(rng, FILLER_SYLLABLES) for _ in range(rng.randint(4, 12))]
+        if n % 4:
+            # Three out of four queries contain a real keyword
+            words.insert(rng.randrange(len(words) + 1), rng.choice(rng.choice(intents).keywords))
+        queries.append(" ".join(words))
+    return queries
+
+
+def linear_scan(intents, message: str):
+    """The previous engine: first intent with any keyword as a substring wins."""
+    message_lower = message.lower().strip()
+    for intent in intents:
+        if any(keyword in message_lower for keyword in intent.keywords):
+            return intent
+    return None
+
+
+def per_query_us(match, queries, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in queries:
+            match(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--sizes", default="10,100,500,2000")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'intents':>8} {'keywords':>9} {'build ms':>9} {'trie us/q':>10} {'linear us/q':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        intents = build_intents(size, rng)
+        queries = build_queries(intents, args.queries, rng)
+        start = time.perf_counter()
+        index = RuleIndex(intents)
+        build_ms = (time.perf_counter() - start) * 1000
+        trie = per_query_us(index.match, queries)
+        linear = per_query_us(lambda q: linear_scan(intents, q), queries)
+        print(f"{size:>8} {index.keyword_count:>9} {build_ms:>9.1f} {trie:>10.2f} {linear:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
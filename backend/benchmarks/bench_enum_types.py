@@ -0,0 +1,173 @@
+"""
+Micro-benchmark for the enum column types in models.py
+Compares the previous per-call loop over enum members with the precomputed lookup of
+CaseInsensitiveEnum, per value and for hydrating report and alert rows from SQLite.
+
+    cd backend && python -m benchmarks.bench_enum_types [--rows 100000] [--calls 200000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, TypeDecorator, create_engine, insert, select
+
+from models import (
+    AlertType, AlertPriority, AlertStatus, ReportType, ReportStatus,
+    AlertTypeEnum, AlertPriorityEnum, AlertStatusEnum, ReportTypeEnum, ReportStatusEnum,
+)
+
+
+class LoopEnum(TypeDecorator):
+    """The previous implementation: scan every member, calling lower() on each."""
+    impl = String(50)
+    cache_ok = True
+
+    def __init__(self, enum_class, default):
+        super().__init__()
+        self.enum_class = enum_class
+        self.default = default
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, self.enum_class):
+            return value.value
+        if isinstance(value, str):
+            value_lower = value.lower()
+            for enum_item in self.enum_class:
+                if enum_item.value.lower() == value_lower:
+                    return enum_item.value
+        return str(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, self.enum_class):
+            return value
+        if isinstance(value, str):
+            value_lower = value.lower()
+            for enum_item in self.enum_class:
+                if enum_item.value.lower() == value_lower:
+                    return enum_item
+        return self.default
+
+
+LOOP_TYPES = {
+    "alert_type": lambda: LoopEnum(AlertType, AlertType.INFO),
+    "alert_priority": lambda: LoopEnum(AlertPriority, AlertPriority.MEDIUM),
+    "alert_status": lambda: LoopEnum(AlertStatus, AlertStatus.ACTIVE),
+    "report_type": lambda: LoopEnum(ReportType, ReportType.OTHER),
+    "report_status": lambda: LoopEnum(ReportStatus, ReportStatus.PENDING),
+}
+LOOKUP_TYPES = {
+    "alert_type": AlertTypeEnum,
+    "alert_priority": AlertPriorityEnum,
+    "alert_status": AlertStatusEnum,
+    "report_type": ReportTypeEnum,
+    "report_status": ReportStatusEnum,
+}
+
+
+def tables(types):
+    metadata = MetaData()
+    reports = Table(
+        "reports", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("type", types["report_type"]()),
+        Column("title", String(255)),
+        Column("description", Text),
+        Column("status", types["report_status"]()),
+        Column("created_at", DateTime),
+    )
+    alerts = Table(
+        "alerts", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("type", types["alert_type"]()),
+        Column("title", String(255)),
+        Column("priority", types["alert_priority"]()),
+        Column("status", types["alert_status"]()),
+        Column("created_at", DateTime),
+    )
+    return metadata, reports, alerts
+
+
+def seed(engine, rows: int, rng: random.Random) -> None:
+    metadata, reports, alerts = tables(LOOKUP_TYPES)
+    metadata.create_all(engine)
+    now = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(reports), [
+            {"type": rng.choice(list(ReportType)), "title": f"Report {n}", "description": "x" * 40,
+             "status": rng.choice(list(ReportStatus)), "created_at": now}
+            for n in range(rows)
+        ])
+        conn.execute(insert(alerts), [
+            {"type": rng.choice(list(AlertType)), "title": f"Alert {n}", "priority": rng.choice(list(AlertPriority)),
+             "status": rng.choice(list(AlertStatus)), "created_at": now}
+            for n in range(rows)
+        ])
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_calls(calls: int, rng: random.Random, repeat: int):
+    # Mostly stored lowercase values, as in the database, with some mixed-case input
+    values = [rng.choice(list(ReportType)).value for _ in range(calls)]
+    values[::10] = [value.upper() for value in values[::10]]
+    results = {}
+    for label, column_type in (("loop", LOOP_TYPES["report_type"]()), ("lookup", ReportTypeEnum())):
+        to_python = column_type.process_result_value
+        to_db = column_type.process_bind_param
+        results[label] = (
+            best_of(repeat, lambda: [to_python(value, None) for value in values]) / calls * 1e9,
+            best_of(repeat, lambda: [to_db(value, None) for value in values]) / calls * 1e9,
+        )
+    return results
+
+
+def bench_rows(engine, rows: int, repeat: int):
+    results = {}
+    for label, types in (("loop", LOOP_TYPES), ("lookup", LOOKUP_TYPES)):
+        _, reports, alerts = tables(types)
+
+        def load():
+            with engine.connect() as conn:
+                conn.execute(select(reports)).all()
+                conn.execute(select(alerts)).all()
+
+        results[label] = best_of(repeat, load) / (rows * 2) * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows per table")
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    calls = bench_calls(args.calls, rng, args.repeat)
+    print(f"{'':>8} {'result ns/value':>16} {'bind ns/value':>14}")
+    for label, (to_python, to_db) in calls.items():
+        print(f"{label:>8} {to_python:16.0f} {to_db:14.0f}")
+
+    engine = create_engine("sqlite://")
+    seed(engine, args.rows, rng)
+    rows = bench_rows(engine, args.rows, args.repeat)
+    print(f"\nrow hydration ({args.rows:,} reports + {args.rows:,} alerts, 5 enum columns):")
+    for label, micros in rows.items():
+        print(f"{label:>8} {micros:8.2f} us/row")
+    print(f"{'speedup':>8} {rows['loop'] / rows['lookup']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
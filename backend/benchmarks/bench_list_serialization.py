@@ -0,0 +1,126 @@
+"""
+Micro-benchmark for list endpoint serialization
+Times the alert and report list bodies built the previous way (ORM entities with the joined
+creator, a dict and model_validate().model_dump() per row, then response_model validation and
+json.dumps) against column projections dumped straight to JSON through a TypeAdapter, and
+compares peak allocations.
+
+    cd backend && python -m benchmarks.bench_list_serialization [--rows 2000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="alerts and reports in each list")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_lists_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy import desc, insert, select
+    from sqlalchemy.orm import joinedload
+    from typing import List
+
+    import generate_data
+    import server
+    from database import Base, SessionLocal, engine
+    from models import Alert, Report, User, UserRole
+    from schemas import AlertResponse, ReportResponse
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        author = conn.execute(insert(User).values(
+            email="bench@example.com", password_hash="x", name="Bench Official", role=UserRole.OFFICIAL
+        )).inserted_primary_key[0]
+    timeline = generate_data.Timeline(datetime.now(timezone.utc), 365)
+    reporter = generate_data.WeightedChoice([author], [1])
+    generate_data.insert_rows(Alert, generate_data.alert_rows(random.Random(1), args.rows, [author], timeline),
+                              args.rows, progress=None)
+    generate_data.insert_rows(Report, generate_data.report_rows(random.Random(2), args.rows, reporter, timeline),
+                              args.rows, progress=None)
+
+    alert_list = TypeAdapter(List[AlertResponse])
+    report_list = TypeAdapter(List[ReportResponse])
+
+    def render(content) -> bytes:
+        # What FastAPI does with a response_model and the default JSONResponse
+        return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+
+    def alerts_before():
+        with SessionLocal() as db:
+            alerts = db.execute(
+                select(Alert).options(joinedload(Alert.creator)).order_by(desc(Alert.created_at))
+            ).scalars().unique().all()
+            rows = []
+            for alert in alerts:
+                alert_dict = {
+                    "id": alert.id, "type": str(alert.type.value), "title": alert.title, "message": alert.message,
+                    "priority": alert.priority, "status": alert.status, "created_by": alert.created_by,
+                    "created_at": alert.created_at, "created_by_name": alert.creator.name,
+                }
+                rows.append(AlertResponse.model_validate(alert_dict).model_dump())
+            return render(alert_list.dump_python(alert_list.validate_python(rows), mode="json"))
+
+    def alerts_after():
+        with SessionLocal() as db:
+            return server.alert_rows_json(db.execute(server.alerts_statement()).all())
+
+    def reports_before():
+        with SessionLocal() as db:
+            reports = db.execute(
+                select(Report).options(joinedload(Report.creator))
+                .order_by(desc(Report.created_at), desc(Report.id)).limit(args.rows + 1)
+            ).scalars().unique().all()
+            items = [server.add_creator_name(ReportResponse.model_validate(report).model_dump(), report.creator.name)
+                     for report in reports[:args.rows]]
+            return render({"items": report_list.dump_python(report_list.validate_python(items), mode="json"),
+                           "next_cursor": None})
+
+    def reports_after():
+        with SessionLocal() as db:
+            stmt = select(*server.REPORT_LIST_COLUMNS).select_from(Report).outerjoin(User, Report.creator)
+            stmt = stmt.order_by(desc(Report.created_at), desc(Report.id)).limit(args.rows + 1)
+            return server.report_page_json(db.execute(stmt).all(), args.rows)
+
+    print(f"{args.rows:,} rows per list (SQLite, best of {args.repeat})")
+    print(f"{'':>16} {'ms':>9} {'peak KiB':>10}")
+    for name, before, after in (("alerts", alerts_before, alerts_after), ("reports", reports_before, reports_after)):
+        before_time, before_peak, before_body = measure(before, args.repeat)
+        after_time, after_peak, after_body = measure(after, args.repeat)
+        if json.loads(before_body) != json.loads(after_body):
+            print(f"warning: {name} bodies differ")
+        print(f"{name + ' before':>16} {before_time * 1000:9.1f} {before_peak / 1024:10.0f}")
+        print(f"{name + ' after':>16} {after_time * 1000:9.1f} {after_peak / 1024:10.0f}")
+        print(f"{'speedup':>16} {before_time / after_time:8.1f}x {before_peak / after_peak:9.1f}x less")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Bulk-seeded benchmark database
+Benchmark accounts with predictable emails plus reports and alerts from generate_data.py (skewed,
+deterministic, Core bulk inserts with one shared bcrypt hash), so the API can be measured at
+production-like sizes.
+"""
+import random
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from database import engine, Base
+from models import User, Report, Alert, UserRole
+import generate_data
+
+ADMIN_EMAIL = "bench-admin@example.com"
+PASSWORD = "Bench12345"
+CHUNK_SIZE = 5_000
+# Share of accounts that are officials; the rest are residents
+OFFICIAL_SHARE = 0.02
+# History the reports and alerts are spread over
+HISTORY_DAYS = 365
+
+
+def resident_email(n: int) -> str:
+    return f"resident{n}@bench.example.com"
+
+
+def official_email(n: int) -> str:
+    return f"official{n}@bench.example.com"
+
+
+def account_counts(users: int) -> tuple:
+    officials = max(1, int(users * OFFICIAL_SHARE))
+    return officials, max(1, users - officials)
+
+
+def is_seeded() -> bool:
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        return conn.execute(select(User.id).where(User.email == ADMIN_EMAIL)).first() is not None
+
+
+def row_counts() -> dict:
+    with engine.connect() as conn:
+        return {
+            "users": conn.execute(select(func.count(User.id))).scalar(),
+            "reports": conn.execute(select(func.count(Report.id))).scalar(),
+            "alerts": conn.execute(select(func.count(Alert.id))).scalar(),
+        }
+
+
+def seed(users: int, reports: int, alerts: int, seed_value: int = 1, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Create the schema and insert the dataset (same rows for the same arguments)."""
+    Base.metadata.create_all(bind=engine)
+    # Hashed once at the server's cost factor, so logins do not trigger a rehash
+    password_hash = generate_data.hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+    officials, residents = account_counts(users)
+    timeline = generate_data.Timeline(now, HISTORY_DAYS)
+
+    accounts = [{"email": ADMIN_EMAIL, "password_hash": password_hash, "name": "Benchmark Admin",
+                 "role": UserRole.ADMIN, "created_at": now}]
+    accounts += [{"email": official_email(n), "password_hash": password_hash, "name": f"Official {n}",
+                  "role": UserRole.OFFICIAL, "created_at": now} for n in range(officials)]
+    accounts += [{"email": resident_email(n), "password_hash": password_hash, "name": f"Resident {n}",
+                  "role": UserRole.RESIDENT, "created_at": now} for n in range(residents)]
+    generate_data.insert_rows(User, accounts, len(accounts), chunk_size, progress=None)
+
+    with engine.connect() as conn:
+        ids = {
+            role: list(conn.execute(select(User.id).where(User.role == role).order_by(User.id)).scalars())
+            for role in UserRole
+        }
+    reporter = generate_data.activity_picker(random.Random(f"{seed_value}:reporters"), ids[UserRole.RESIDENT])
+    staff = ids[UserRole.ADMIN] + ids[UserRole.OFFICIAL]
+
+    generate_data.insert_rows(
+        Report, generate_data.report_rows(random.Random(f"{seed_value}:reports"), reports, reporter, timeline),
+        reports, chunk_size, progress=None
+    )
+    generate_data.insert_rows(
+        Alert, generate_data.alert_rows(random.Random(f"{seed_value}:alerts"), alerts, staff, timeline),
+        alerts, chunk_size, progress=None
+    )
+    return row_counts()
@@ -0,0 +1,183 @@
+"""
+Load test: sync (threadpool) vs ASYNC_DB=true route handlers
+Starts the API under uvicorn once per mode against the same seeded database and drives the hot
+read routes with a few hundred concurrent clients, then prints throughput and latency percentiles.
+
+    cd backend && python -m benchmarks.load_async [--clients 300] [--duration 20]
+
+The default database is a throwaway SQLite file; the gap is largest against MySQL, where every
+query waits on the network. Point --database-url at a test MySQL database to measure that
+(it must be empty, or already contain the admin account below).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADMIN_EMAIL = "loadtest-admin@example.com"
+ADMIN_PASSWORD = "LoadTest123"
+PATHS = (
+    "/api/alerts/new",
+    "/api/reports?limit=20",
+    "/api/stats/dashboard",
+)
+
+
+def seed(database_url: str, reports: int, alerts: int) -> None:
+    """Create the schema and bulk-insert demo rows (in a subprocess-free, sync engine)."""
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, BACKEND_DIR)
+    import bcrypt
+    from sqlalchemy import insert, select
+    from database import engine, Base
+    from models import User, Report, Alert, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        admin_id = conn.execute(select(User.id).where(User.email == ADMIN_EMAIL)).scalar()
+        if admin_id is not None:
+            return
+        password_hash = bcrypt.hashpw(ADMIN_PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+        admin_id = conn.execute(insert(User).values(
+            email=ADMIN_EMAIL, password_hash=password_hash, name="Load Test", role=UserRole.ADMIN
+        )).inserted_primary_key[0]
+        now = datetime.now(timezone.utc)
+        rng = random.Random(1)
+        # Explicit timestamps: keyset pagination needs distinct, full-precision created_at values
+        conn.execute(insert(Report), [
+            {
+                "type": rng.choice(["crime", "flood", "complaint", "request"]),
+                "title": f"Load test report {n}",
+                "description": "Generated row for the async load test",
+                "location": f"Zone {n % 7 + 1}",
+                "status": rng.choice(["pending", "in_progress", "resolved"]),
+                "created_by": admin_id,
+                "created_at": now - timedelta(seconds=n),
+            }
+            for n in range(reports)
+        ])
+        conn.execute(insert(Alert), [
+            {
+                "type": "announcement",
+                "title": f"Load test alert {n}",
+                "message": "Generated row for the async load test",
+                "priority": "medium",
+                "status": "active",
+                "created_by": admin_id,
+                "created_at": now - timedelta(seconds=n),
+            }
+            for n in range(alerts)
+        ])
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def run_load(base_url: str, clients: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        response = await client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['token']}"}
+        latencies = []
+        errors = 0
+        stop_at = time.monotonic() + duration
+
+        async def worker(n: int):
+            nonlocal errors
+            i = n
+            while time.monotonic() < stop_at:
+                path = PATHS[i % len(PATHS)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    r = await client.get(path, headers=headers)
+                    ok = r.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000, 1) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--reports", type=int, default=5000)
+    parser.add_argument("--alerts", type=int, default=500)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="load_async_")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'load.db')}"
+    seed(database_url, args.reports, args.alerts)
+
+    results = {}
+    for mode, async_db in (("sync", "false"), ("async", "true")):
+        env = dict(os.environ, DATABASE_URL=database_url, ASYNC_DB=async_db,
+                   RATE_LIMIT_BACKEND="memory", STATS_RECONCILE_INTERVAL_SECONDS="0")
+        server = start_server(args.port, env)
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            asyncio.run(wait_ready(base_url))
+            results[mode] = asyncio.run(run_load(base_url, args.clients, args.duration))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        print(f"{mode:>5}: {json.dumps(results[mode])}")
+
+    if results["sync"]["rps"]:
+        print(f"async/sync throughput: {results['async']['rps'] / results['sync']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Rule-based chatbot for barangay questions
+The rules are compiled once into a word-level keyword trie, so a query costs one dictionary walk per
+word no matter how many intents exist. Every intent whose keywords appear is scored and the best one wins.
+"""
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Words: letters/digits, optionally joined by hyphens or apostrophes (mag-report, i-click)
+_TOKEN_RE = re.compile(r"\w+(?:[-'’]\w+)*")
+# Marks the end of a keyword in the trie; maps to the intents that keyword belongs to
+_TERMINAL = ""
+
+
+@dataclass(frozen=True)
+class Intent:
+    name: str
+    keywords: Tuple[str, ...]
+    response: str
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words with a trailing plural 's' folded (alerts -> alert, services -> service)."""
+    return [_fold(token) for token in _TOKEN_RE.findall(text.lower())]
+
+
+def _fold(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+class RuleIndex:
+    """
+    Keyword trie over word tokens.
+
+    Matching walks the trie from every word and takes the longest keyword starting there,
+    so phrases win over their parts ("how to report" is not also counted as "how"), and
+    keywords only match whole words ("hi" never matches inside "which").
+    Each matched keyword scores its length in words; ties go to the intent listed first.
+    """
+
+    def __init__(self, intents: Sequence[Intent]):
+        self.intents = list(intents)
+        self._root: dict = {}
+        self.keyword_count = 0
+        for position, intent in enumerate(self.intents):
+            for keyword in intent.keywords:
+                self._add(tokenize(keyword), position)
+
+    def _add(self, tokens: List[str], position: int) -> None:
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        owners = node.setdefault(_TERMINAL, [])
+        if position not in owners:
+            owners.append(position)
+            self.keyword_count += 1
+
+    def scores(self, message: str) -> Dict[int, int]:
+        """Score per intent position for every intent with at least one matching keyword."""
+        tokens = tokenize(message)
+        scores: Dict[int, int] = {}
+        seen = set()
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            match: Optional[Tuple[int, list]] = None
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERMINAL in node:
+                    match = (j, node[_TERMINAL])
+            if match is None:
+                i += 1
+                continue
+            end, owners = match
+            phrase = tuple(tokens[i:end])
+            if phrase not in seen:
+                seen.add(phrase)
+                for position in owners:
+                    scores[position] = scores.get(position, 0) + (end - i)
+            i = end
+        return scores
+
+    def match(self, message: str) -> Optional[Intent]:
+        """Best-scoring intent, or None if no keyword matched."""
+        scores = self.scores(message)
+        if not scores:
+            return None
+        best = min(scores, key=lambda position: (-scores[position], position))
+        return self.intents[best]
+
+
+# Order matters only for ties: an earlier intent wins over a later one with the same score
+INTENTS: Tuple[Intent, ...] = (
+    # Office hours
+    Intent(
+        "office_hours",
+        ('oras', 'hours', 'open', 'close', 'bukas', 'sara', 'office time', 'orasan'),
+        "Ang barangay office ay bukas mula Lunes hanggang Biyernes, 8:00 AM - 5:00 PM. "
+        "Para sa emergency, maaari kayong tumawag sa hotline: (02) 123-4567.",
+    ),
+    # How to report
+    Intent(
+        "report",
+        ('report', 'mag-report', 'paano mag-report', 'how to report', 'submit report', 'ireport', 'i-report'),
+        "Para mag-submit ng report:\n"
+        "1. Pumunta sa 'Report' sa menu\n"
+        "2. Piliin ang uri ng problema (Emergency, Crime, Infrastructure, etc.)\n"
+        "3. Ilagay ang detalye ng problema\n"
+        "4. Maglagay ng lokasyon kung saan nangyari\n"
+        "5. I-click ang 'Send Report'\n\n"
+        "Para sa emergency, maaari din kayong tumawag sa barangay hotline.",
+    ),
+    # Alert types
+    Intent(
+        "alert_types",
+        ('alert', 'alerts', 'uri ng alert', 'types of alert', 'anong alert', 'what alerts'),
+        "May apat na uri ng alerts:\n"
+        "• Emergency - Para sa mga emergency na sitwasyon\n"
+        "• Announcement - Mga anunsyo mula sa barangay\n"
+        "• Warning - Mga babala at paalala\n"
+        "• Info - Pangkalahatang impormasyon\n\n"
+        "Makikita ninyo ang lahat ng alerts sa 'Alerts' page.",
+    ),
+    # Emergency
+    Intent(
+        "emergency",
+        ('emergency', 'emergency report', 'sakuna', 'sunog', 'baha', 'aksidente', 'urgent'),
+        "Para sa emergency:\n"
+        "1. Tumawag agad sa barangay hotline: (02) 123-4567\n"
+        "2. O mag-submit ng emergency report sa app\n"
+        "3. Para sa life-threatening emergencies, tumawag sa 911\n\n"
+        "Ang emergency reports ay inuuna namin at may mabilis na response.",
+    ),
+    # Services
+    Intent(
+        "services",
+        ('service', 'services', 'serbisyo', 'ano ang serbisyo', 'what services', 'available services'),
+        "Mga serbisyo ng barangay:\n"
+        "• Emergency Response\n"
+        "• Report Management\n"
+        "• Community Alerts\n"
+        "• Public Information\n"
+        "• Complaint Handling\n"
+        "• Infrastructure Requests\n\n"
+        "Para sa karagdagang impormasyon, bisitahin ang barangay hall.",
+    ),
+    # Status check
+    Intent(
+        "report_status",
+        ('status', 'check status', 'report status', 'ano na ang report', 'update', 'update ng report'),
+        "Para makita ang status ng inyong report:\n"
+        "1. Pumunta sa 'My Reports' sa menu\n"
+        "2. Makikita ninyo ang lahat ng inyong reports\n"
+        "3. Ang status ay maaaring: Pending, In Progress, Resolved, o Rejected\n"
+        "4. Makikita din ninyo ang response mula sa barangay officials kung mayroon.",
+    ),
+    # Contact
+    Intent(
+        "contact",
+        ('contact', 'tawag', 'phone', 'number', 'telepono', 'paano makipag-ugnayan', 'how to contact'),
+        "Para makipag-ugnayan sa barangay:\n"
+        "• Hotline: (02) 123-4567\n"
+        "• Email: info@brgykorokan.gov.ph\n"
+        "• Address: Barangay Hall, Zone 1, Barangay Korokan\n"
+        "• Office Hours: Lunes-Biyernes, 8:00 AM - 5:00 PM",
+    ),
+    # Registration
+    Intent(
+        "registration",
+        ('register', 'sign up', 'mag-register', 'paano mag-register', 'account', 'gumawa ng account'),
+        "Para mag-register:\n"
+        "1. Pumunta sa 'Register' page\n"
+        "2. Ilagay ang inyong email, pangalan, at password\n"
+        "3. Piliin ang inyong role (Resident, Official, o Admin)\n"
+        "4. I-click ang 'Register'\n\n"
+        "Kailangan ng password na may hindi bababa sa 8 characters, may uppercase, lowercase, at number.",
+    ),
+    # Greeting
+    Intent(
+        "greeting",
+        ('hello', 'hi', 'kamusta', 'kumusta', 'magandang araw', 'good morning', 'good afternoon', 'good evening'),
+        "Magandang araw! Ako si BarangayBot, ang inyong AI assistant. Paano ko kayo matutulungan ngayon?",
+    ),
+    # Help
+    Intent(
+        "help",
+        ('help', 'tulong', 'paano', 'how', 'help me', 'tulungan'),
+        "Ako ay nandito para tumulong! Maaari ninyo akong tanungin tungkol sa:\n"
+        "• Oras ng barangay office\n"
+        "• Paano mag-submit ng report\n"
+        "• Mga uri ng alerts\n"
+        "• Status ng inyong reports\n"
+        "• Mga serbisyo ng barangay\n"
+        "• Emergency procedures\n\n"
+        "Ano ang gusto ninyong malaman?",
+    ),
+)
+
+DEFAULT_RESPONSES: Tuple[str, ...] = (
+    "Pasensya, hindi ko lubos na naintindihan ang inyong tanong. Maaari ba ninyong magtanong tungkol sa:\n"
+    "• Oras ng barangay office\n"
+    "• Paano mag-report\n"
+    "• Mga uri ng alerts\n"
+    "• Status ng reports\n\n"
+    "O subukan ninyong magtanong sa ibang paraan.",
+
+    "Ako ay nandito para tumulong sa inyong mga katanungan tungkol sa barangay. "
+    "Maaari ba ninyong magtanong tungkol sa office hours, reports, alerts, o serbisyo?",
+
+    "Para sa mas tiyak na impormasyon, maaari ninyong:\n"
+    "• Bisitahin ang 'Alerts' page para sa mga anunsyo\n"
+    "• Gumawa ng report sa 'Report' page\n"
+    "• Tumawag sa barangay hotline: (02) 123-4567",
+)
+
+rule_index = RuleIndex(INTENTS)
+
+
+def get_chatbot_response(message: str) -> str:
+    """Response of the best-matching intent, or one of the fallback prompts."""
+    intent = rule_index.match(message)
+    if intent is not None:
+        return intent.response
+    return random.choice(DEFAULT_RESPONSES)
@@ -0,0 +1,225 @@
+"""
+Connection pool instrumentation
+Records checkout latency (time spent waiting for a pooled connection, including any connect
+and pre-ping), checked-out and overflow counts, invalidations, disconnects and pre-ping cost,
+so the pool settings in database.py can be tuned from measurements.
+"""
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Upper bounds in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyStats:
+    """Count/sum/max plus cumulative bucket counts for a stream of durations."""
+
+    def __init__(self, buckets_ms: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total_ms += ms
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total_ms, max_ms = self.count, self.total_ms, self.max_ms
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets_ms + (float("inf"),), counts):
+            running += bucket_count
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {
+            "count": count,
+            "sum_ms": round(total_ms, 3),
+            "mean_ms": round(total_ms / count, 3) if count else None,
+            "max_ms": round(max_ms, 3),
+            "buckets_ms": cumulative,
+        }
+
+
+class PoolMetrics:
+    """Counters for one engine's pool. Attach with instrument_engine()."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.checkout = LatencyStats()
+        self.pre_ping = LatencyStats()
+        self._lock = threading.Lock()
+        self._counters = {
+            "checkouts": 0,
+            "checkins": 0,
+            "connects": 0,
+            "invalidations": 0,
+            "soft_invalidations": 0,
+            "disconnects": 0,
+            "pre_ping_failures": 0,
+            "checkout_timeouts": 0,
+        }
+        self.peak_checked_out = 0
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def note_checked_out(self, checked_out: int) -> None:
+        with self._lock:
+            if checked_out > self.peak_checked_out:
+                self.peak_checked_out = checked_out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            peak = self.peak_checked_out
+        pool = self.pool
+        gauges = {}
+        if pool is not None:
+            gauges["class"] = type(pool).__name__
+            for name in ("size", "checkedout", "checkedin", "overflow"):
+                method = getattr(pool, name, None)
+                if callable(method):
+                    gauges[name] = method()
+            gauges["max_overflow"] = getattr(pool, "_max_overflow", None)
+            gauges["timeout"] = getattr(pool, "_timeout", None)
+            gauges["recycle"] = getattr(pool, "_recycle", None)
+            gauges["pre_ping"] = getattr(pool, "_pre_ping", None)
+        gauges["peak_checked_out"] = peak
+        if isinstance(gauges.get("size"), int) and isinstance(gauges.get("max_overflow"), int):
+            # Sizing hint: a peak at capacity with checkout waits means the pool (or the
+            # database's max_connections) is the bottleneck; a peak far below size means it is oversized
+            gauges["capacity"] = gauges["size"] + max(gauges["max_overflow"], 0)
+            gauges["saturated"] = peak >= gauges["capacity"]
+        return {
+            "pool": gauges,
+            "counters": counters,
+            "checkout": self.checkout.snapshot(),
+            "pre_ping": self.pre_ping.snapshot(),
+        }
+
+
+_metrics: Dict[str, PoolMetrics] = {}
+
+
+def pool_metrics(name: str) -> PoolMetrics:
+    """Get or create the metrics holder for a named engine ("sync", "async")."""
+    metrics = _metrics.get(name)
+    if metrics is None:
+        metrics = _metrics.setdefault(name, PoolMetrics(name))
+    return metrics
+
+
+def snapshot() -> dict:
+    return {name: metrics.snapshot() for name, metrics in _metrics.items()}
+
+
+class _TimedCheckout:
+    """Pool mixin timing connect(): queue wait + new connection + pre-ping."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.count("checkout_timeouts")
+            raise
+        if self.metrics is not None:
+            self.metrics.checkout.observe(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting on the live one
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Register pool/engine listeners recording into pool_metrics(name)."""
+    metrics = pool_metrics(name)
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    metrics.pool = pool
+    if isinstance(pool, _TimedCheckout):
+        pool.metrics = metrics
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.count("checkouts")
+        checkedout = getattr(metrics.pool, "checkedout", None)
+        if callable(checkedout):
+            metrics.note_checked_out(checkedout())
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.count("checkins")
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    @event.listens_for(pool, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("soft_invalidations")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context):
+        if context.is_disconnect:
+            metrics.count("disconnects")
+
+    # Pre-ping has no event of its own; time the dialect's ping
+    dialect = sync_engine.dialect
+    do_ping = dialect.do_ping
+
+    def timed_ping(dbapi_connection):
+        start = time.perf_counter()
+        try:
+            alive = do_ping(dbapi_connection)
+        except Exception:
+            metrics.count("pre_ping_failures")
+            raise
+        finally:
+            metrics.pre_ping.observe(time.perf_counter() - start)
+        if not alive:
+            metrics.count("pre_ping_failures")
+        return alive
+
+    dialect.do_ping = timed_ping
+    return metrics
@@ -75,6 +75,7 @@ CREATE TABLE IF NOT EXISTS alerts (
     INDEX idx_alerts_created_by (created_by),
     INDEX idx_alerts_created_at (created_at),
     INDEX idx_alert_status_created (status, created_at),
+    FULLTEXT INDEX ft_alerts_text (title, message),
     
     -- Foreign Keys
     FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE CASCADE
@@ -104,6 +105,7 @@ CREATE TABLE IF NOT EXISTS reports (
     INDEX idx_reports_created_at (created_at),
     INDEX idx_report_status_created (status, created_at),
     INDEX idx_report_user_created (created_by, created_at),
+    FULLTEXT INDEX ft_reports_text (title, description, location),
     
     -- Foreign Keys
     FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE CASCADE
@@ -111,23 +113,60 @@ CREATE TABLE IF NOT EXISTS reports (
 
 -- =====================================================
 -- Table: system_logs
--- Description: System activity and audit logs
+-- Description: System activity and audit logs. Partitioned by expiry
+-- month: the API server (log_retention.py) splits monthly partitions
+-- off pfuture ahead of time, archives each fully expired month to
+-- gzipped JSONL and drops its partition. Rows kept forever land in
+-- pforever. Partitioned tables cannot have foreign keys, and every
+-- unique key must include expires_at
 -- =====================================================
 CREATE TABLE IF NOT EXISTS system_logs (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT AUTO_INCREMENT,
     action VARCHAR(100) NOT NULL,
     user_id INT NULL,
     details TEXT NULL,
     timestamp DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6),
+    expires_at DATETIME NOT NULL DEFAULT '9999-12-31 00:00:00',
+    
+    PRIMARY KEY (id, expires_at),
     
     -- Indexes
     INDEX idx_system_logs_action (action),
     INDEX idx_system_logs_user_id (user_id),
     INDEX idx_system_logs_timestamp (timestamp),
     INDEX idx_log_timestamp_action (timestamp, action),
-    
-    -- Foreign Keys
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+    INDEX idx_log_user_timestamp (user_id, timestamp),
+    INDEX ix_system_logs_expires_at (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE COLUMNS(expires_at) (
+    PARTITION pfuture VALUES LESS THAN ('9999-01-01'),
+    PARTITION pforever VALUES LESS THAN (MAXVALUE)
+);
+
+-- =====================================================
+-- Table: stats_counters
+-- Description: Materialized dashboard counters. Updated in the same
+-- transaction as the rows they count and reconciled periodically
+-- by the API server (rows are created on first startup)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS stats_counters (
+    name VARCHAR(64) NOT NULL PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- =====================================================
+-- Table: sync_tombstones
+-- Description: Deleted reports and alerts, so /api/sync clients can
+-- drop them. Pruned after SYNC_TOMBSTONE_DAYS by the API server
+-- =====================================================
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    object_id INT NOT NULL,
+    owner_id INT NULL,
+    deleted_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    INDEX idx_tombstone_deleted (deleted_at, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- =====================================================
@@ -154,6 +193,115 @@ PREPARE alterIfNotExists FROM @preparedStatement;
 EXECUTE alterIfNotExists;
 DEALLOCATE PREPARE alterIfNotExists;
 
+-- Add the FULLTEXT search indexes (used by /api/search) if they don't exist
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'reports' AND INDEX_NAME = 'ft_reports_text'
+    ) > 0,
+    "SELECT 'Index already exists.' AS result;",
+    "ALTER TABLE reports ADD FULLTEXT INDEX ft_reports_text (title, description, location);"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'alerts' AND INDEX_NAME = 'ft_alerts_text'
+    ) > 0,
+    "SELECT 'Index already exists.' AS result;",
+    "ALTER TABLE alerts ADD FULLTEXT INDEX ft_alerts_text (title, message);"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+-- Add the last-change indexes walked by /api/sync (functional key parts need MySQL 8.0.13+)
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'reports' AND INDEX_NAME = 'idx_report_changed'
+    ) > 0,
+    "SELECT 'Index already exists.' AS result;",
+    "CREATE INDEX idx_report_changed ON reports ((coalesce(updated_at, created_at)), id);"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'alerts' AND INDEX_NAME = 'idx_alert_changed'
+    ) > 0,
+    "SELECT 'Index already exists.' AS result;",
+    "CREATE INDEX idx_alert_changed ON alerts ((coalesce(updated_at, created_at)), id);"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+-- Add the per-user log index used by /api/logs?user_id= if it doesn't exist
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'system_logs' AND INDEX_NAME = 'idx_log_user_timestamp'
+    ) > 0,
+    "SELECT 'Index already exists.' AS result;",
+    "CREATE INDEX idx_log_user_timestamp ON system_logs (user_id, timestamp);"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+-- Partition system_logs by expiry month (see the table definition). Afterwards run
+-- `python log_retention.py --restamp` once so existing rows get their action's retention;
+-- until then they are kept forever
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'system_logs' AND COLUMN_NAME = 'expires_at'
+    ) > 0,
+    "SELECT 'Column already exists.' AS result;",
+    "ALTER TABLE system_logs ADD COLUMN expires_at DATETIME NOT NULL DEFAULT '9999-12-31 00:00:00', ADD INDEX ix_system_logs_expires_at (expires_at);"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+SET @foreignKey = (
+    SELECT CONSTRAINT_NAME FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
+    WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'system_logs' AND CONSTRAINT_TYPE = 'FOREIGN KEY'
+    LIMIT 1
+);
+SET @preparedStatement = IF(
+    @foreignKey IS NULL,
+    "SELECT 'No foreign key to drop.' AS result;",
+    CONCAT("ALTER TABLE system_logs DROP FOREIGN KEY ", @foreignKey, ";")
+);
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+SET @preparedStatement = (SELECT IF(
+    (
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = @dbname AND TABLE_NAME = 'system_logs' AND PARTITION_NAME IS NOT NULL
+    ) > 0,
+    "SELECT 'Table already partitioned.' AS result;",
+    "ALTER TABLE system_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, expires_at) PARTITION BY RANGE COLUMNS(expires_at) (PARTITION pfuture VALUES LESS THAN ('9999-01-01'), PARTITION pforever VALUES LESS THAN (MAXVALUE));"
+));
+PREPARE alterIfNotExists FROM @preparedStatement;
+EXECUTE alterIfNotExists;
+DEALLOCATE PREPARE alterIfNotExists;
+
+-- Note: InnoDB FULLTEXT ignores words shorter than innodb_ft_min_token_size (default 3)
+-- and uses an English stopword list. To also skip common Tagalog words, create a table
+-- with a single VARCHAR column named `value`, fill it, and before building the indexes run:
+--   SET GLOBAL innodb_ft_server_stopword_table = 'andreabrgy/ft_stopwords';
+
 -- =====================================================
 -- STEP 5: Verify Schema
 -- =====================================================
@@ -208,10 +356,12 @@ ON DUPLICATE KEY UPDATE email=email;
 --   1. users - User accounts and authentication
 --   2. alerts - Public alerts and announcements
 --   3. reports - Incident reports from residents
---   4. system_logs - System activity logs
+--   4. system_logs - System activity logs (partitioned by expiry month)
+--   5. stats_counters - Materialized dashboard counters
+--   6. sync_tombstones - Deleted reports/alerts for incremental sync
 --
 -- Total Indexes: 20+
--- Foreign Keys: 3
+-- Foreign Keys: 2
 --
 -- =====================================================
 -- End of Schema
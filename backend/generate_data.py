@@ -0,0 +1,388 @@
+"""
+Synthetic data generator for scale testing
+Streams realistic users, reports, alerts and system logs into the database with SQLAlchemy Core
+bulk inserts in chunked transactions. Output is deterministic for a given --seed and --end.
+
+    python generate_data.py --users 10000 --reports 1000000 --alerts 20000 --logs 2000000
+
+Every generated account shares one password (--password), hashed once at BCRYPT_ROUNDS.
+"""
+import argparse
+import bisect
+import itertools
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import bcrypt
+from sqlalchemy import insert, select
+
+from database import engine, Base
+from log_retention import log_expiry
+from models import User, Report, Alert, SystemLog, UserRole
+from password_hashing import BCRYPT_ROUNDS
+
+CHUNK_SIZE = 5000
+DEFAULT_PASSWORD = "Generated123"
+EMAIL_DOMAIN = "generated.example.com"
+
+FIRST_NAMES = (
+    "Juan", "Maria", "Jose", "Ana", "Pedro", "Rosa", "Carlos", "Elena", "Ramon", "Luz",
+    "Miguel", "Teresa", "Antonio", "Carmen", "Manuel", "Josefina", "Ricardo", "Gloria",
+    "Eduardo", "Cristina", "Roberto", "Lourdes", "Fernando", "Angelica", "Mark", "Joy",
+)
+LAST_NAMES = (
+    "Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Torres", "Flores",
+    "Villanueva", "Ramos", "Aquino", "Castillo", "Rivera", "Gonzales", "Dela Cruz", "Navarro",
+    "Soriano", "Pascual", "Domingo", "Marquez", "Lopez", "Salazar", "Fernandez",
+)
+ZONES = tuple(f"Zone {n}" for n in range(1, 8))
+LANDMARKS = (
+    "near the basketball court", "main road", "beside the chapel", "near the elementary school",
+    "by the public market", "along the creek", "near the health center", "at the corner store",
+)
+
+# (weight, type, titles, descriptions); flood weight is boosted in the rainy season
+REPORT_KINDS = (
+    (30, "complaint", ("Garbage Collection Issue", "Noise Complaint", "Stray Dogs", "Illegal Parking"),
+     ("Garbage has not been collected in {zone} for the past week.",
+      "Loud karaoke past midnight every weekend in {zone}.",
+      "A pack of stray dogs is chasing children {landmark}.",
+      "Vehicles are blocking the road {landmark} every evening.")),
+    (20, "request", ("Request for Street Light", "Barangay Clearance Follow-up", "Tree Trimming Request"),
+     ("Requesting installation of street light in {zone} for safety.",
+      "Following up on my barangay clearance request filed last week.",
+      "Overgrown branches are touching the power lines {landmark}.")),
+    (15, "infrastructure", ("Damaged Road", "Clogged Drainage", "Broken Water Pipe"),
+     ("Large potholes on the road {landmark} in {zone}.",
+      "The drainage {landmark} is clogged and overflowing.",
+      "A water pipe burst {landmark} and is leaking onto the street.")),
+    (10, "other", ("General Inquiry", "Lost and Found"),
+     ("Asking about the schedule of the next community event in {zone}.",
+      "Found a wallet {landmark}; turned it over to the tanod.")),
+    (8, "crime", ("Theft Report", "Vandalism"),
+     ("A motorcycle was stolen {landmark} in {zone} last night.",
+      "Graffiti was sprayed on the walls {landmark}.")),
+    (7, "health", ("Dengue Cases", "Health Center Supplies"),
+     ("Several dengue cases reported in {zone}; requesting fogging.",
+      "The health center {landmark} has run out of basic medicine.")),
+    (6, "flood", ("Flooding in the Area", "Rising Creek Water"),
+     ("Knee-deep flooding in {zone} {landmark} after heavy rain.",
+      "The creek water is rising quickly {landmark} in {zone}.")),
+    (4, "emergency", ("Fire Incident", "Medical Emergency"),
+     ("Smoke and fire seen from a house {landmark} in {zone}.",
+      "A resident collapsed {landmark} and needs immediate assistance.")),
+)
+RAINY_MONTHS = range(6, 11)
+OFFICIAL_RESPONSES = (
+    "Thank you for reporting. Our team has been dispatched.",
+    "This has been forwarded to the municipal engineering office.",
+    "Resolved. Please report again if the problem comes back.",
+    "We could not verify this report; closing for now.",
+)
+
+# (weight, type, priority weights high/medium/low, titles, messages)
+ALERT_KINDS = (
+    (50, "announcement", (5, 60, 35), ("Barangay Assembly Meeting", "Community Clean-up Drive", "Vaccination Schedule"),
+     ("Monthly barangay assembly meeting will be held on Saturday at 2 PM.",
+      "Join the clean-up drive in {zone} this Sunday at 6 AM.",
+      "Free vaccination at the health center for residents of {zone}.")),
+    (25, "info", (2, 38, 60), ("Water Interruption", "Office Hours Update"),
+     ("Scheduled water interruption in {zone} from 8 AM to 5 PM.",
+      "The barangay hall will be closed on the coming holiday.")),
+    (15, "warning", (40, 50, 10), ("Typhoon Advisory", "Heat Index Warning"),
+     ("A typhoon is expected to make landfall within 48 hours. Prepare emergency kits.",
+      "Heat index is expected to reach dangerous levels; avoid outdoor activity at noon.")),
+    (10, "emergency", (90, 10, 0), ("Emergency Evacuation Notice", "Fire Alert"),
+     ("All residents in {zone} are advised to evacuate immediately due to flooding.",
+      "Fire reported in {zone}; keep the roads clear for responders.")),
+)
+
+# (weight, action, detail template)
+LOG_ACTIONS = (
+    (40, "user_login", "User logged in"),
+    (25, "chatbot_query", "Chatbot query: {question}"),
+    (12, "report_create", "Created report: {title}"),
+    (9, "report_status_update", "Updated report #{ref} status to {status}"),
+    (5, "user_register", "New user registered"),
+    (4, "alert_create", "Created alert: {title}"),
+    (2, "alert_update", "Updated alert #{ref}"),
+    (1, "report_delete", "Deleted report #{ref}"),
+    (1, "alert_delete", "Deleted alert #{ref}"),
+    (1, "user_role_update", "Changed role of user #{ref}"),
+)
+CHATBOT_QUESTIONS = (
+    "How do I get a barangay clearance?", "What are the office hours?", "Where is the evacuation center?",
+    "How do I report flooding?", "Paano mag-report ng sunog?", "Who is the barangay captain?",
+)
+# Activity by hour of day (local time), peaking in the morning and early evening
+HOURLY_WEIGHTS = (1, 1, 1, 1, 1, 2, 4, 7, 9, 9, 8, 7, 7, 7, 7, 7, 8, 9, 9, 7, 5, 3, 2, 1)
+
+
+class WeightedChoice:
+    """Draw from weighted options with one random() and a bisect (random.choices re-sums per call)."""
+
+    def __init__(self, options: Sequence, weights: Sequence[float]):
+        self.options = tuple(options)
+        self.cumulative = list(itertools.accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def __call__(self, rng: random.Random):
+        return self.options[bisect.bisect_right(self.cumulative, rng.random() * self.total)]
+
+
+_hour = WeightedChoice(range(24), HOURLY_WEIGHTS)
+
+
+class Timeline:
+    """
+    Timestamps over [end - days, end] with activity growing over time (density ~ t^growth) and a
+    daily cycle. Rows generated in order get roughly increasing timestamps, like real ids.
+    """
+
+    def __init__(self, end: datetime, days: int, growth: float = 1.0):
+        self.end = end
+        self.days = days
+        self.exponent = 1.0 / (growth + 1.0)
+
+    def at(self, rng: random.Random, index: int, count: int) -> datetime:
+        fraction = ((index + rng.random()) / count) ** self.exponent
+        day = min(int(fraction * self.days), self.days - 1)
+        start = self.end - timedelta(days=self.days - day)
+        return start.replace(hour=_hour(rng), minute=rng.randrange(60), second=rng.randrange(60),
+                             microsecond=rng.randrange(1_000_000))
+
+
+def activity_picker(rng: random.Random, ids: Sequence[int], alpha: float = 1.16, cap: float = 50.0) -> WeightedChoice:
+    """
+    80/20-style activity: Pareto weights (alpha 1.16) give a minority of users most of the rows,
+    capped so no single account dominates.
+    """
+    return WeightedChoice(ids, [min(rng.paretovariate(alpha), cap) for _ in ids])
+
+
+def hash_password(password: str) -> str:
+    # Once per run; every generated account reuses it
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+
+
+def user_rows(rng: random.Random, count: int, password_hash: str, timeline: Timeline, seed: int,
+              official_share: float = 0.01) -> Iterator[dict]:
+    for n in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        if n == 0:
+            role = UserRole.ADMIN
+        elif rng.random() < official_share:
+            role = UserRole.OFFICIAL
+        else:
+            role = UserRole.RESIDENT
+        yield {
+            "email": f"{first}.{last}.{n}".lower().replace(" ", "") + f"@s{seed}.{EMAIL_DOMAIN}",
+            "password_hash": password_hash,
+            "name": f"{first} {last}",
+            "role": role,
+            "phone": f"+63 9{rng.randrange(10, 100)} {rng.randrange(1000):03d} {rng.randrange(10000):04d}",
+            "address": f"{rng.choice(ZONES)}, Barangay Korokan",
+            "created_at": timeline.at(rng, n, count),
+        }
+
+
+_report_kind = WeightedChoice(REPORT_KINDS, [kind[0] for kind in REPORT_KINDS])
+_report_kind_rainy = WeightedChoice(REPORT_KINDS, [kind[0] * (4 if kind[1] == "flood" else 1) for kind in REPORT_KINDS])
+
+
+def report_rows(rng: random.Random, count: int, reporter: WeightedChoice, timeline: Timeline) -> Iterator[dict]:
+    """Reports from a skewed set of residents; older reports are far more likely to be closed."""
+    for n in range(count):
+        created_at = timeline.at(rng, n, count)
+        kind = (_report_kind_rainy if created_at.month in RAINY_MONTHS else _report_kind)(rng)
+        _, report_type, titles, descriptions = kind
+        pick = rng.randrange(len(titles))
+        zone, landmark = rng.choice(ZONES), rng.choice(LANDMARKS)
+        age = (timeline.end - created_at).total_seconds() / 86400
+        closed_chance = min(0.97, 0.15 + age / 30)
+        roll = rng.random()
+        if roll < closed_chance * 0.93:
+            status = "resolved"
+        elif roll < closed_chance:
+            status = "rejected"
+        elif roll < closed_chance + (1 - closed_chance) * 0.4:
+            status = "in_progress"
+        else:
+            status = "pending"
+        row = {
+            "type": report_type,
+            "title": titles[pick],
+            "description": descriptions[pick % len(descriptions)].format(zone=zone, landmark=landmark),
+            "location": f"{zone}, {landmark}",
+            "status": status,
+            "official_response": None,
+            "created_by": reporter(rng),
+            "created_at": created_at,
+            "updated_at": None,
+            "resolved_at": None,
+        }
+        if status != "pending":
+            # Log-normal handling time: most within a day or two, a long tail of weeks
+            handled_at = min(created_at + timedelta(hours=rng.lognormvariate(math.log(18), 1.2)), timeline.end)
+            row["updated_at"] = handled_at
+            if status in ("resolved", "rejected"):
+                row["official_response"] = OFFICIAL_RESPONSES[2 if status == "resolved" else 3]
+            else:
+                row["official_response"] = rng.choice(OFFICIAL_RESPONSES[:2])
+            if status == "resolved":
+                row["resolved_at"] = handled_at
+        yield row
+
+
+_alert_kind = WeightedChoice(ALERT_KINDS, [kind[0] for kind in ALERT_KINDS])
+
+
+def alert_rows(rng: random.Random, count: int, author_ids: Sequence[int], timeline: Timeline) -> Iterator[dict]:
+    """Alerts by officials and admins; only recent ones are still active."""
+    priorities = {kind[1]: WeightedChoice(("high", "medium", "low"), kind[2]) for kind in ALERT_KINDS}
+    for n in range(count):
+        created_at = timeline.at(rng, n, count)
+        _, alert_type, _, titles, messages = _alert_kind(rng)
+        pick = rng.randrange(len(titles))
+        age = (timeline.end - created_at).total_seconds() / 86400
+        if age < 7:
+            status = "active"
+        else:
+            status = "expired" if rng.random() < 0.8 else "inactive"
+        yield {
+            "type": alert_type,
+            "title": titles[pick],
+            "message": messages[pick % len(messages)].format(zone=rng.choice(ZONES)),
+            "priority": priorities[alert_type](rng),
+            "status": status,
+            "created_by": rng.choice(author_ids),
+            "created_at": created_at,
+        }
+
+
+_log_action = WeightedChoice(LOG_ACTIONS, [action[0] for action in LOG_ACTIONS])
+
+
+def log_rows(rng: random.Random, count: int, actor: WeightedChoice, timeline: Timeline) -> Iterator[dict]:
+    for n in range(count):
+        _, action, template = _log_action(rng)
+        details = template.format(
+            question=rng.choice(CHATBOT_QUESTIONS)[:50],
+            title=rng.choice(REPORT_KINDS)[2][0],
+            ref=rng.randrange(1, 100000),
+            status=rng.choice(("in_progress", "resolved", "rejected")),
+        )
+        timestamp = timeline.at(rng, n, count)
+        yield {
+            "action": action,
+            # Some registrations are logged without a user id
+            "user_id": actor(rng) if action != "user_register" or rng.random() < 0.9 else None,
+            "details": details,
+            "timestamp": timestamp,
+            "expires_at": log_expiry(action, timestamp),
+        }
+
+
+def chunked(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def insert_rows(model, rows: Iterable[dict], total: int, chunk_size: int = CHUNK_SIZE,
+                progress: Optional[Callable[[str], None]] = print) -> Tuple[int, float]:
+    """Insert in chunks of chunk_size, one transaction each; returns (rows, seconds)."""
+    table = model.__table__
+    inserted = 0
+    started = time.perf_counter()
+    next_report = started + 5
+    for chunk in chunked(rows, chunk_size):
+        with engine.begin() as conn:
+            conn.execute(insert(table), chunk)
+        inserted += len(chunk)
+        now = time.perf_counter()
+        if progress and now >= next_report:
+            progress(f"  {table.name}: {inserted:,}/{total:,} ({inserted / (now - started):,.0f} rows/s)")
+            next_report = now + 5
+    seconds = time.perf_counter() - started
+    if progress:
+        rate = inserted / seconds if seconds else 0
+        progress(f"{table.name}: {inserted:,} rows in {seconds:.1f}s ({rate:,.0f} rows/s)")
+    return inserted, seconds
+
+
+def user_ids(role_filter: Sequence[UserRole], email_suffix: str) -> List[int]:
+    with engine.connect() as conn:
+        return list(conn.execute(
+            select(User.id)
+            .where(User.role.in_(role_filter), User.email.like(f"%{email_suffix}"))
+            .order_by(User.id)
+        ).scalars())
+
+
+def generate(users: int, reports: int, alerts: int, logs: int, seed: int = 1, end: Optional[datetime] = None,
+             days: int = 730, password: str = DEFAULT_PASSWORD, chunk_size: int = CHUNK_SIZE) -> dict:
+    Base.metadata.create_all(bind=engine)
+    end = end or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    timeline = Timeline(end, days)
+    email_suffix = f"@s{seed}.{EMAIL_DOMAIN}"
+    with engine.connect() as conn:
+        if conn.execute(select(User.id).where(User.email.like(f"%{email_suffix}")).limit(1)).first():
+            raise SystemExit(f"Data for seed {seed} already exists; use another --seed or a fresh database")
+
+    # One generator per table, so changing one count does not reshuffle the others
+    def rng_for(table: str) -> random.Random:
+        return random.Random(f"{seed}:{table}")
+
+    results = {}
+    started = time.perf_counter()
+    password_hash = hash_password(password)
+    results["users"] = insert_rows(User, user_rows(rng_for("users"), max(users, 1), password_hash, timeline, seed),
+                                   max(users, 1), chunk_size)
+
+    everyone = user_ids(list(UserRole), email_suffix)
+    residents = user_ids([UserRole.RESIDENT], email_suffix) or everyone
+    staff = user_ids([UserRole.ADMIN, UserRole.OFFICIAL], email_suffix)
+    reporter = activity_picker(rng_for("reporters"), residents)
+    actor = activity_picker(rng_for("actors"), everyone)
+
+    results["reports"] = insert_rows(Report, report_rows(rng_for("reports"), reports, reporter, timeline),
+                                     reports, chunk_size)
+    results["alerts"] = insert_rows(Alert, alert_rows(rng_for("alerts"), alerts, staff, timeline), alerts, chunk_size)
+    results["system_logs"] = insert_rows(SystemLog, log_rows(rng_for("logs"), logs, actor, timeline),
+                                         logs, chunk_size)
+
+    total_rows = sum(rows for rows, _ in results.values())
+    seconds = time.perf_counter() - started
+    print(f"Total: {total_rows:,} rows in {seconds:.1f}s ({total_rows / seconds:,.0f} rows/s)")
+    print(f"Accounts: *{email_suffix} / {password} (first account is an admin)")
+    return {table: {"rows": rows, "seconds": round(secs, 2)} for table, (rows, secs) in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--reports", type=int, default=10000)
+    parser.add_argument("--alerts", type=int, default=500)
+    parser.add_argument("--logs", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--end", type=lambda value: datetime.fromisoformat(value).replace(tzinfo=timezone.utc),
+                        help="latest timestamp, YYYY-MM-DD (default: today 00:00 UTC)")
+    parser.add_argument("--days", type=int, default=730, help="history to spread rows over")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(f"Generating data into {engine.url.render_as_string(hide_password=True)}...")
+    generate(args.users, args.reports, args.alerts, args.logs, seed=args.seed, end=args.end,
+             days=args.days, password=args.password, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
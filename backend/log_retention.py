@@ -0,0 +1,310 @@
+"""
+Retention for system_logs
+Each row is stamped with expires_at = timestamp + the retention of its action (LOG_RETENTION_DAYS,
+overridden per action by LOG_RETENTION_BY_ACTION; "forever" keeps rows indefinitely). On MySQL the
+table is range-partitioned by expiry month (see final_schema.sql): once a month has fully expired,
+the job archives its rows to a gzipped JSONL file and drops the partition. Other databases, and an
+unpartitioned MySQL table, get the same behaviour through chunked range deletes on expires_at.
+
+    python log_retention.py            # one retention pass
+    python log_retention.py --restamp  # re-apply the policy to existing rows first
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, inspect, literal, select, text, update
+
+from database import engine
+from models import SystemLog, PERMANENT_LOG_EXPIRY
+
+LOG_RETENTION_DAYS = int(os.getenv('LOG_RETENTION_DAYS', '365'))
+LOG_ARCHIVE_DIR = os.getenv('LOG_ARCHIVE_DIR', 'log_archive')
+LOG_RETENTION_INTERVAL_SECONDS = int(os.getenv('LOG_RETENTION_INTERVAL_SECONDS', '86400'))  # 0 disables
+DELETE_CHUNK_SIZE = 5000
+# Monthly partitions are split off the empty pfuture partition; permanent rows live in pforever above it
+FUTURE_PARTITION = "pfuture"
+FUTURE_BOUND = datetime(9999, 1, 1)
+MONTHLY_PARTITION = re.compile(r"^p(\d{4})(\d{2})$")
+
+# Days per action (None = forever); LOG_RETENTION_BY_ACTION adds to and overrides these
+DEFAULT_ACTION_RETENTION: Dict[str, Optional[int]] = {
+    "chatbot_query": 30,
+    "user_login": 90,
+    "user_role_update": None,
+    "user_password_reset": None,
+}
+
+
+def parse_retention(spec: str) -> Dict[str, Optional[int]]:
+    """Parse "chatbot_query=30,user_role_update=forever" into {action: days or None}."""
+    retention = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        action, _, days = entry.partition("=")
+        days = days.strip().lower()
+        if not action.strip() or not days:
+            raise ValueError(f"Invalid LOG_RETENTION_BY_ACTION entry: {entry!r}")
+        retention[action.strip()] = None if days == "forever" else int(days)
+    return retention
+
+
+ACTION_RETENTION = dict(DEFAULT_ACTION_RETENTION, **parse_retention(os.getenv('LOG_RETENTION_BY_ACTION', '')))
+
+
+def retention_days(action: str) -> Optional[int]:
+    return ACTION_RETENTION.get(action, LOG_RETENTION_DAYS)
+
+
+def log_expiry(action: str, timestamp: datetime) -> datetime:
+    """expires_at for a new system_logs row."""
+    days = retention_days(action)
+    return PERMANENT_LOG_EXPIRY if days is None else timestamp + timedelta(days=days)
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _plus_days(dialect: str, column, days: int):
+    if dialect == "mysql":
+        return func.timestampadd(text("DAY"), days, column)
+    if dialect == "sqlite":
+        return func.datetime(column, f"+{days} days")
+    return column + timedelta(days=days)
+
+
+def restamp(conn) -> int:
+    """Re-apply the current policy to every row (after changing it, or after adding the column)."""
+    updated = 0
+    actions = conn.execute(select(SystemLog.action).distinct()).scalars().all()
+    for action in actions:
+        days = retention_days(action)
+        expiry = literal(PERMANENT_LOG_EXPIRY) if days is None else _plus_days(conn.dialect.name, SystemLog.timestamp, days)
+        updated += conn.execute(
+            update(SystemLog).where(SystemLog.action == action).values(expires_at=expiry)
+        ).rowcount
+        conn.commit()
+    return updated
+
+
+class LogRetentionJob:
+    """Archives and drops expired months of system_logs, in a background thread or on demand."""
+
+    def __init__(self, bind=engine, archive_dir: str = LOG_ARCHIVE_DIR,
+                 interval_seconds: int = LOG_RETENTION_INTERVAL_SECONDS):
+        self.bind = bind
+        self.archive_dir = archive_dir
+        self.interval_seconds = interval_seconds
+        self.needs_restamp = False
+        self.last_run: Optional[dict] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def ensure_schema(self) -> None:
+        """Add expires_at to a system_logs table created before it existed; the next run stamps the rows."""
+        columns = {column["name"] for column in inspect(self.bind).get_columns("system_logs")}
+        if "expires_at" in columns:
+            return
+        column_type = SystemLog.__table__.c.expires_at.type.compile(dialect=self.bind.dialect)
+        with self.bind.begin() as conn:
+            conn.execute(text(
+                f"ALTER TABLE system_logs ADD COLUMN expires_at {column_type} NOT NULL "
+                f"DEFAULT '{PERMANENT_LOG_EXPIRY:%Y-%m-%d %H:%M:%S}'"
+            ))
+            conn.execute(text("CREATE INDEX ix_system_logs_expires_at ON system_logs (expires_at)"))
+        self.needs_restamp = True
+
+    def policy(self) -> dict:
+        return {
+            "default_days": LOG_RETENTION_DAYS,
+            "actions": ACTION_RETENTION,
+            "archive_dir": os.path.abspath(self.archive_dir),
+            "interval_seconds": self.interval_seconds,
+        }
+
+    def run_once(self, now: Optional[datetime] = None) -> dict:
+        # Expiry times are stored as naive UTC
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        result = {"started_at": now.isoformat(), "restamped": 0, "partitions_added": [], "archived": []}
+        with self.bind.connect() as conn:
+            if not self._lock(conn):
+                result["skipped"] = "another worker is running the retention job"
+                return result
+            try:
+                if self.needs_restamp:
+                    result["restamped"] = restamp(conn)
+                    self.needs_restamp = False
+                partitions = self._partitions(conn)
+                result["partitioned"] = partitions is not None
+                if partitions is not None:
+                    result["partitions_added"] = self._add_partitions(conn, partitions, now)
+                for start in self._expired_months(conn, partitions, now):
+                    path, rows = self._archive(conn, start)
+                    self._drop(conn, start, partitions is not None)
+                    result["archived"].append({"month": f"{start:%Y-%m}", "rows": rows, "file": path})
+            finally:
+                self._unlock(conn)
+        self.last_run = result
+        return result
+
+    def _lock(self, conn) -> bool:
+        # Every uvicorn worker runs the job; on MySQL only one pass runs at a time
+        if conn.dialect.name != "mysql":
+            return True
+        return bool(conn.execute(text("SELECT GET_LOCK('system_logs_retention', 0)")).scalar())
+
+    def _unlock(self, conn) -> None:
+        if conn.dialect.name == "mysql":
+            conn.execute(text("SELECT RELEASE_LOCK('system_logs_retention')"))
+
+    def _partitions(self, conn) -> Optional[List[datetime]]:
+        """Start of each monthly partition, or None if system_logs is not partitioned."""
+        if conn.dialect.name != "mysql":
+            return None
+        names = conn.execute(text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'system_logs' AND PARTITION_NAME IS NOT NULL"
+        )).scalars().all()
+        if not names:
+            return None
+        months = []
+        for name in names:
+            match = MONTHLY_PARTITION.match(name)
+            if match:
+                months.append(datetime(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    def _oldest_expiry(self, conn, before: datetime) -> Optional[datetime]:
+        return conn.execute(select(func.min(SystemLog.expires_at)).where(SystemLog.expires_at < before)).scalar()
+
+    def _add_partitions(self, conn, partitions: List[datetime], now: datetime) -> List[str]:
+        """Split monthly partitions off pfuture far enough ahead for every finite retention."""
+        longest = max([LOG_RETENTION_DAYS] + [days for days in ACTION_RETENTION.values() if days is not None])
+        horizon = next_month(now + timedelta(days=longest))
+        if partitions:
+            start = next_month(partitions[-1])
+        else:
+            # First run: also cover rows written before any monthly partition existed
+            oldest = self._oldest_expiry(conn, FUTURE_BOUND)
+            start = month_start(min(oldest, now) if oldest else now)
+        months = []
+        while start < horizon:
+            months.append(start)
+            start = next_month(start)
+        if not months:
+            return []
+        definitions = ", ".join(
+            f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{next_month(month):%Y-%m-%d}')" for month in months
+        )
+        conn.execute(text(
+            f"ALTER TABLE system_logs REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({definitions}, "
+            f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN ('{FUTURE_BOUND:%Y-%m-%d}'))"
+        ))
+        return [f"p{month:%Y%m}" for month in months]
+
+    def _expired_months(self, conn, partitions: Optional[List[datetime]], now: datetime) -> List[datetime]:
+        """Months whose rows have all expired, oldest first."""
+        if partitions is not None:
+            return [month for month in partitions if next_month(month) <= now]
+        oldest = self._oldest_expiry(conn, month_start(now))
+        months = []
+        month = month_start(oldest) if oldest else None
+        while month is not None and next_month(month) <= now:
+            months.append(month)
+            month = next_month(month)
+        return months
+
+    def _archive_path(self, start: datetime) -> str:
+        # Never overwrite: a rerun after an interrupted delete archives only the remaining rows
+        base = os.path.join(self.archive_dir, f"system_logs-expired-{start:%Y-%m}")
+        path, n = f"{base}.jsonl.gz", 1
+        while os.path.exists(path):
+            n += 1
+            path = f"{base}-{n}.jsonl.gz"
+        return path
+
+    def _archive(self, conn, start: datetime) -> Tuple[Optional[str], int]:
+        """Write one expiry month to gzipped JSONL; returns (path, rows), path None if it was empty."""
+        stmt = (
+            select(SystemLog.id, SystemLog.action, SystemLog.user_id, SystemLog.details,
+                   SystemLog.timestamp, SystemLog.expires_at)
+            .where(SystemLog.expires_at >= start, SystemLog.expires_at < next_month(start))
+            .order_by(SystemLog.id)
+        )
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = self._archive_path(start)
+        partial = f"{path}.{os.getpid()}.partial"
+        rows = 0
+        with gzip.open(partial, "wt", encoding="utf-8") as f:
+            for row in conn.execution_options(stream_results=True, yield_per=1000).execute(stmt):
+                record = row._asdict()
+                record["timestamp"] = row.timestamp.isoformat() if row.timestamp else None
+                record["expires_at"] = row.expires_at.isoformat()
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                rows += 1
+        if not rows:
+            os.remove(partial)
+            return None, 0
+        os.replace(partial, path)
+        return path, rows
+
+    def _drop(self, conn, start: datetime, partitioned: bool) -> None:
+        if partitioned:
+            conn.execute(text(f"ALTER TABLE system_logs DROP PARTITION p{start:%Y%m}"))
+            return
+        expired = (SystemLog.expires_at >= start, SystemLog.expires_at < next_month(start))
+        while True:
+            ids = conn.execute(select(SystemLog.id).where(*expired).limit(DELETE_CHUNK_SIZE)).scalars().all()
+            if not ids:
+                break
+            conn.execute(delete(SystemLog).where(SystemLog.id.in_(ids)))
+            conn.commit()
+
+    def start(self) -> None:
+        if self._thread is None and self.interval_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="log-retention", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                result = self.run_once()
+                if result["archived"]:
+                    print(f"Log retention archived {sum(m['rows'] for m in result['archived'])} rows "
+                          f"from {len(result['archived'])} months")
+            except Exception as e:
+                print(f"Log retention failed: {e}")
+            if self._stop.wait(self.interval_seconds):
+                return
+
+
+log_retention = LogRetentionJob()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--restamp", action="store_true", help="re-apply the retention policy to existing rows")
+    args = parser.parse_args()
+    log_retention.ensure_schema()
+    log_retention.needs_restamp = log_retention.needs_restamp or args.restamp
+    print(json.dumps(log_retention.run_once(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
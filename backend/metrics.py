@@ -0,0 +1,311 @@
+"""
+Request and query metrics in Prometheus text format
+MetricsMiddleware records count, latency and in-flight requests per route template; SQLAlchemy
+cursor hooks attribute every query to the request that issued it, so a route whose queries per
+request climbs (an N+1) stands out.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Queries per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# If set, GET /metrics requires "Authorization: Bearer <METRICS_TOKEN>"; if not, an admin's bearer token
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Requests that match no route share one label so random 404 paths cannot blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum and count."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((_format_value(bound), running))
+        result.append(("+Inf", running + self.counts[-1]))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket (as histogram_quantile does)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        running = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, self.counts):
+            if running + count >= rank and count:
+                return lower + (bound - lower) * (rank - running) / count
+            running += count
+            lower = bound
+        # Falls in the open-ended bucket; the highest finite bound is the best estimate
+        return self.buckets[-1] if self.buckets else None
+
+
+class RequestStats:
+    """Per-request query tally, shared with worker threads through a context variable."""
+
+    __slots__ = ("route", "queries", "db_seconds")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "metrics_current_request", default=None
+)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[Labels, int] = {}
+        self._in_flight: Dict[Labels, int] = {}
+        self._latency: Dict[Labels, Histogram] = {}
+        self._query_latency: Dict[Labels, Histogram] = {}
+        self._queries_per_request: Dict[Labels, Histogram] = {}
+        self._db_time_per_request: Dict[Labels, Histogram] = {}
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]) -> None:
+        """
+        Register a callable yielding (name, type, help, samples) at scrape time, for metrics owned
+        by other modules (pool, audit writer, response cache). A sample is (labels_dict, value), or
+        (suffix, labels_dict, value) for histogram series such as "_bucket".
+        """
+        self._collectors.append(collector)
+
+    def request_started(self, method: str, route: str) -> None:
+        key = (("method", method), ("route", route))
+        with self._lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def request_finished(self, method: str, route: str, status_code: int, seconds: float,
+                         stats: RequestStats) -> None:
+        key = (("method", method), ("route", route))
+        with self._lock:
+            self._in_flight[key] -= 1
+            status_key = key + (("status", str(status_code)),)
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            self._histogram(self._latency, key, LATENCY_BUCKETS).observe(seconds)
+            self._histogram(self._queries_per_request, key, QUERY_COUNT_BUCKETS).observe(stats.queries)
+            self._histogram(self._db_time_per_request, key, LATENCY_BUCKETS).observe(stats.db_seconds)
+
+    def query_finished(self, route: str, seconds: float) -> None:
+        with self._lock:
+            self._histogram(self._query_latency, (("route", route),), QUERY_BUCKETS).observe(seconds)
+
+    @staticmethod
+    def _histogram(store: Dict[Labels, Histogram], key: Labels, buckets: Sequence[float]) -> Histogram:
+        histogram = store.get(key)
+        if histogram is None:
+            histogram = store[key] = Histogram(buckets)
+        return histogram
+
+    def route_summary(self) -> List[dict]:
+        """Per route: request count, estimated p50/p95/p99 latency and mean queries per request."""
+        with self._lock:
+            rows = []
+            for key, latency in self._latency.items():
+                labels = dict(key)
+                queries = self._queries_per_request.get(key)
+                rows.append({
+                    "method": labels["method"],
+                    "route": labels["route"],
+                    "count": latency.count,
+                    "p50_ms": _ms(latency.quantile(0.50)),
+                    "p95_ms": _ms(latency.quantile(0.95)),
+                    "p99_ms": _ms(latency.quantile(0.99)),
+                    "mean_ms": _ms(latency.sum / latency.count) if latency.count else None,
+                    "mean_queries": round(queries.sum / queries.count, 2) if queries and queries.count else None,
+                    "in_flight": self._in_flight.get(key, 0),
+                })
+        return sorted(rows, key=lambda row: -row["count"])
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            _render_simple(lines, "http_requests_total", "counter",
+                           "Requests by route template, method and status code.", self._requests)
+            _render_simple(lines, "http_requests_in_flight", "gauge",
+                           "Requests currently being served.", self._in_flight)
+            _render_histograms(lines, "http_request_duration_seconds",
+                               "Request latency by route template.", self._latency)
+            _render_histograms(lines, "http_request_db_queries",
+                               "Database queries issued per request.", self._queries_per_request)
+            _render_histograms(lines, "http_request_db_seconds",
+                               "Time spent in database queries per request.", self._db_time_per_request)
+            _render_histograms(lines, "db_query_duration_seconds",
+                               "Individual database query latency by route template.", self._query_latency)
+        for collector in self._collectors:
+            try:
+                for name, metric_type, help_text, samples in collector():
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for sample in samples:
+                        suffix, labels, value = sample if len(sample) == 3 else ("",) + tuple(sample)
+                        if value is not None:
+                            lines.append(f"{name}{suffix}{_format_labels(tuple(labels.items()))} {_format_value(value)}")
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses (SSE) are timed until their last chunk."""
+
+    def __init__(self, app, registry: "MetricsRegistry" = None, route_cache_size: int = 2048):
+        self.app = app
+        self.registry = registry or metrics_registry
+        self._routes: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._route_cache_size = route_cache_size
+        self._routes_lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = self._route_template(scope)
+        stats = RequestStats(route)
+        token = _current_request.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+        self.registry.request_started(method, route)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.request_finished(method, route, status_code, time.perf_counter() - start, stats)
+            _current_request.reset(token)
+
+    def _route_template(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        with self._routes_lock:
+            route = self._routes.get(key)
+            if route is not None:
+                self._routes.move_to_end(key)
+                return route
+        route = UNMATCHED_ROUTE
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = getattr(candidate, "path", UNMATCHED_ROUTE)
+                break
+            if match == Match.PARTIAL and route == UNMATCHED_ROUTE:
+                # Path matched but the method did not (405)
+                route = getattr(candidate, "path", UNMATCHED_ROUTE)
+        with self._routes_lock:
+            self._routes[key] = route
+            while len(self._routes) > self._route_cache_size:
+                self._routes.popitem(last=False)
+        return route
+
+
+def instrument_queries(engine, registry: "MetricsRegistry" = None) -> None:
+    """Time every cursor execution and charge it to the current request, if any."""
+    registry = registry or metrics_registry
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        stats = _current_request.get()
+        if stats is None:
+            # Background work (audit writer, reconciler) is not attributed to a request
+            return
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        registry.query_finished(stats.route, elapsed)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels) + "}"
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _render_simple(lines: List[str], name: str, metric_type: str, help_text: str, samples: Dict[Labels, float]):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for labels, value in sorted(samples.items()):
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+
+def _render_histograms(lines: List[str], name: str, help_text: str, histograms: Dict[Labels, Histogram]):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+
+metrics_registry = MetricsRegistry()
@@ -1,8 +1,27 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index, TypeDecorator
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Enum, ForeignKey, Index, TypeDecorator
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from database import Base
+from database import Base, DATABASE_URL
+from datetime import datetime
 import enum
+import os
+
+# Loading strategy for the many-to-one creator/user relationships. Handlers select the columns they
+# need (creator name included), so nothing is eager-loaded by default; "joined" restores the old
+# behaviour and "raise_on_sql" turns any accidental lazy load into an error during development.
+RELATIONSHIP_LAZY = os.getenv('RELATIONSHIP_LAZY', 'select')
+
+# expires_at of system_logs rows kept forever (see log_retention.py)
+PERMANENT_LOG_EXPIRY = datetime(9999, 12, 31)
+# On MySQL system_logs is partitioned by expires_at as in final_schema.sql; SQLite only
+# auto-increments a single-column integer primary key, so it keeps the plain table
+PARTITION_SYSTEM_LOGS = DATABASE_URL.startswith('mysql')
+
+def supports_functional_indexes(ddl, target, bind, dialect, **kw) -> bool:
+    """ddl_if rule: expression indexes need MySQL 8.0.13+ (MariaDB has none); SQLite has them."""
+    if dialect.name != 'mysql':
+        return True
+    return not dialect.is_mariadb and (dialect.server_version_info or (0,)) >= (8, 0, 13)
 
 class UserRole(str, enum.Enum):
     ADMIN = "ADMIN"
@@ -41,185 +60,77 @@ class ReportStatus(str, enum.Enum):
     RESOLVED = "resolved"
     REJECTED = "rejected"
 
-# TypeDecorator to handle AlertType enum conversion properly
-class AlertTypeEnum(TypeDecorator):
+# TypeDecorator to handle enum conversion properly (case-insensitive, with a fallback member)
+class CaseInsensitiveEnum(TypeDecorator):
+    """
+    Stores an enum's value as a string. Subclasses set enum_class, default (returned for
+    unknown stored values) and cache_ok, which SQLAlchemy does not inherit; the value -> member
+    lookup table is built once per subclass.
+    """
     impl = String(50)
     cache_ok = True
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.enum_class = AlertType
-    
+
+    enum_class = None
+    default = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.enum_class is not None:
+            members = {}
+            for enum_item in cls.enum_class:
+                members.setdefault(enum_item.value.lower(), enum_item)
+            # Exact stored values hit first; other spellings go through lower()
+            for enum_item in cls.enum_class:
+                members.setdefault(enum_item.value, enum_item)
+            cls._members = members
+
     def process_bind_param(self, value, dialect):
         if value is None:
             return None
-        if isinstance(value, AlertType):
+        if isinstance(value, self.enum_class):
             return value.value
         if isinstance(value, str):
             # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in AlertType:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item.value
+            enum_item = self._members.get(value) or self._members.get(value.lower())
+            if enum_item is not None:
+                return enum_item.value
         return str(value)
-    
+
     def process_result_value(self, value, dialect):
         if value is None:
             return None
-        if isinstance(value, AlertType):
+        if isinstance(value, self.enum_class):
             return value
         if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in AlertType:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item
-        # Default to INFO if not found
-        return AlertType.INFO
-
-# TypeDecorator to handle AlertPriority enum conversion properly
-class AlertPriorityEnum(TypeDecorator):
-    impl = String(50)
+            enum_item = self._members.get(value) or self._members.get(value.lower())
+            if enum_item is not None:
+                return enum_item
+        return self.default
+
+class AlertTypeEnum(CaseInsensitiveEnum):
     cache_ok = True
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.enum_class = AlertPriority
-    
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, AlertPriority):
-            return value.value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in AlertPriority:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item.value
-        return str(value)
-    
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, AlertPriority):
-            return value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in AlertPriority:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item
-        # Default to MEDIUM if not found
-        return AlertPriority.MEDIUM
-
-# TypeDecorator to handle AlertStatus enum conversion properly
-class AlertStatusEnum(TypeDecorator):
-    impl = String(50)
+    enum_class = AlertType
+    default = AlertType.INFO
+
+class AlertPriorityEnum(CaseInsensitiveEnum):
     cache_ok = True
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.enum_class = AlertStatus
-    
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, AlertStatus):
-            return value.value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in AlertStatus:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item.value
-        return str(value)
-    
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, AlertStatus):
-            return value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in AlertStatus:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item
-        # Default to ACTIVE if not found
-        return AlertStatus.ACTIVE
-
-# TypeDecorator to handle enum conversion properly for reports
-class ReportTypeEnum(TypeDecorator):
-    impl = String(50)
+    enum_class = AlertPriority
+    default = AlertPriority.MEDIUM
+
+class AlertStatusEnum(CaseInsensitiveEnum):
     cache_ok = True
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.enum_class = ReportType
-    
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, ReportType):
-            return value.value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in ReportType:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item.value
-        return str(value)
-    
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, ReportType):
-            return value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in ReportType:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item
-        # Default to OTHER if not found
-        return ReportType.OTHER
-
-# TypeDecorator to handle ReportStatus enum conversion properly
-class ReportStatusEnum(TypeDecorator):
-    impl = String(50)
+    enum_class = AlertStatus
+    default = AlertStatus.ACTIVE
+
+class ReportTypeEnum(CaseInsensitiveEnum):
     cache_ok = True
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.enum_class = ReportStatus
-    
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, ReportStatus):
-            return value.value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in ReportStatus:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item.value
-        return str(value)
-    
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        if isinstance(value, ReportStatus):
-            return value
-        if isinstance(value, str):
-            # Try to find enum by value (case-insensitive)
-            value_lower = value.lower()
-            for enum_item in ReportStatus:
-                if enum_item.value.lower() == value_lower:
-                    return enum_item
-        # Default to PENDING if not found
-        return ReportStatus.PENDING
+    enum_class = ReportType
+    default = ReportType.OTHER
+
+class ReportStatusEnum(CaseInsensitiveEnum):
+    cache_ok = True
+    enum_class = ReportStatus
+    default = ReportStatus.PENDING
 
 class User(Base):
     __tablename__ = "users"
@@ -237,7 +148,7 @@ class User(Base):
     # Relationships (lazy loading is fine for these as they're not always needed)
     reports = relationship("Report", back_populates="creator")
     alerts = relationship("Alert", back_populates="creator")
-    logs = relationship("SystemLog", back_populates="user")
+    logs = relationship("SystemLog", back_populates="user", primaryjoin="User.id == foreign(SystemLog.user_id)")
 
 class Alert(Base):
     __tablename__ = "alerts"
@@ -252,12 +163,16 @@ class Alert(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships with eager loading
-    creator = relationship("User", back_populates="alerts", lazy="joined")
+    # Relationships
+    creator = relationship("User", back_populates="alerts", lazy=RELATIONSHIP_LAZY)
 
     # Composite indexes for common queries
     __table_args__ = (
         Index('idx_alert_status_created', 'status', 'created_at'),
+        # /api/sync walks rows in last-change order
+        Index('idx_alert_changed', func.coalesce(updated_at, created_at), id).ddl_if(callable_=supports_functional_indexes),
+        # Backs /api/search on MySQL; other databases use the in-process index in search.py
+        Index('ft_alerts_text', 'title', 'message', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
     )
 
 class Report(Base):
@@ -275,30 +190,74 @@ class Report(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     resolved_at = Column(DateTime(timezone=True), nullable=True)
 
-    # Relationships with eager loading
-    creator = relationship("User", back_populates="reports", lazy="joined")
+    # Relationships
+    creator = relationship("User", back_populates="reports", lazy=RELATIONSHIP_LAZY)
 
     # Composite indexes for common queries
     __table_args__ = (
         Index('idx_report_status_created', 'status', 'created_at'),
         Index('idx_report_user_created', 'created_by', 'created_at'),
+        # /api/sync walks rows in last-change order
+        Index('idx_report_changed', func.coalesce(updated_at, created_at), id).ddl_if(callable_=supports_functional_indexes),
+        # Backs /api/search on MySQL; other databases use the in-process index in search.py
+        Index('ft_reports_text', 'title', 'description', 'location', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
     )
 
 class SystemLog(Base):
     __tablename__ = "system_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     action = Column(String(100), nullable=False, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    # No foreign key: partitioned tables cannot have one
+    user_id = Column(Integer, nullable=True, index=True)
     details = Column(Text, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Set from the action's retention when the row is written; MySQL partitions the table by it,
+    # so there it is part of the primary key (every unique key must include the partition column)
+    expires_at = Column(
+        DateTime(timezone=True), nullable=False, default=PERMANENT_LOG_EXPIRY, index=True,
+        primary_key=PARTITION_SYSTEM_LOGS
+    )
 
-    # Relationships (use default lazy loading, we'll use joinedload in queries)
-    user = relationship("User", back_populates="logs")
+    # Relationships
+    user = relationship(
+        "User", back_populates="logs", lazy=RELATIONSHIP_LAZY,
+        primaryjoin="User.id == foreign(SystemLog.user_id)"
+    )
 
     # Composite index for common queries
     __table_args__ = (
         Index('idx_log_timestamp_action', 'timestamp', 'action'),
+        Index('idx_log_user_timestamp', 'user_id', 'timestamp'),
+        # log_retention.py splits monthly partitions off pfuture and drops them once expired
+        {
+            'mysql_partition_by': "RANGE COLUMNS(expires_at) ("
+                                  "PARTITION pfuture VALUES LESS THAN ('9999-01-01'), "
+                                  "PARTITION pforever VALUES LESS THAN (MAXVALUE))",
+        } if PARTITION_SYSTEM_LOGS else {},
+    )
+    # Rows are identified by id alone on every database
+    __mapper_args__ = {'primary_key': [id]}
+
+class SyncTombstone(Base):
+    """Deleted reports and alerts, kept for a while so /api/sync can tell clients to drop them."""
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)  # report or alert
+    object_id = Column(Integer, nullable=False)
+    # Creator of a deleted report, so residents only receive their own deletions
+    owner_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('idx_tombstone_deleted', 'deleted_at', 'id'),
     )
 
+class StatsCounter(Base):
+    """Materialized dashboard counters, updated in the same transaction as the rows they count."""
+    __tablename__ = "stats_counters"
 
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
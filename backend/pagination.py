@@ -0,0 +1,47 @@
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque, URL-safe tokens encoding the (timestamp, id) of the last row on a page
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor."""
+    payload = json.dumps({"t": sort_value.isoformat(), "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def keyset_before(sort_column, id_column, cursor: str):
+    """
+    Build the WHERE clause selecting rows that come after the cursor in
+    (sort_column DESC, id_column DESC) order.
+
+    Expanded into a leading range plus OR rather than a row-value comparison so MySQL
+    can range-scan the composite (..., created_at) indexes. Ties are matched as "within
+    a microsecond" rather than with equality, because SQLite stores server-default
+    timestamps without fractional seconds and compares them as text (see sync.after).
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    return and_(
+        sort_column < sort_value + timedelta(microseconds=1),
+        or_(sort_column <= sort_value - timedelta(microseconds=1), id_column < row_id),
+    )
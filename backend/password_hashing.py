@@ -0,0 +1,112 @@
+"""
+Password hashing off the request path
+bcrypt runs in a small process pool so login bursts cannot starve the request threadpool or hold the GIL
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+# bcrypt cost factor for new hashes; existing hashes with a different cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Hash/verify jobs allowed to wait for a worker before new ones are rejected
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '64'))
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password worker queue is full."""
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+def _ready() -> bool:
+    return True
+
+
+def hash_cost(hashed_password: str) -> Optional[int]:
+    """Return the cost factor of a bcrypt hash ($2b$12$...), or None if it cannot be parsed."""
+    parts = hashed_password.split('$')
+    if len(parts) < 4:
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return hash_cost(hashed_password) != BCRYPT_ROUNDS
+
+
+class PasswordHasher:
+    """Bounded process pool for bcrypt work with fail-fast backpressure."""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def start(self) -> None:
+        """
+        Create the worker pool and fork every worker now, while this process has no other threads
+        (the pool only forks on its first job, by when the audit writer, counter reconciler and
+        retention threads would be running). server.py calls this from its first startup hook.
+        """
+        with self._lock:
+            if self._executor is not None:
+                return
+            # fork starts every worker on the first job; other start methods re-import __main__
+            context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            executor = self._executor
+        executor.submit(_ready).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def _submit(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+        try:
+            self.start()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, password, hashed_password)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,372 @@
+"""
+On-demand request profiling
+ProfiledRoute wraps route endpoints with cProfile when a request is selected: an admin sends
+"X-Profile: 1", the PROFILE_SAMPLE_RATE sampler picks it, or its route was armed by an earlier
+request slower than PROFILE_SLOW_MS. Each capture stores the call profile and every SQL
+statement with its timing in a bounded on-disk ring buffer under PROFILE_DIR.
+"""
+import asyncio
+import contextvars
+import cProfile
+import functools
+import glob
+import io
+import json
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.requests import Request
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'andreabrgy-profiles'))
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '50'))
+# Fraction of all requests to profile (0 disables sampling)
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+# Requests slower than this are recorded (SQL only) and arm their route so the next slow
+# request on it is captured with a call profile; 0 disables
+PROFILE_SLOW_MS = int(os.getenv('PROFILE_SLOW_MS', '1000'))
+# Per route, at most one slow capture per cooldown so one bad route cannot flush the buffer
+PROFILE_SLOW_COOLDOWN_SECONDS = int(os.getenv('PROFILE_SLOW_COOLDOWN_SECONDS', '300'))
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+# Bounds on what one capture may hold
+MAX_STATEMENTS = 500
+MAX_STATEMENT_LENGTH = 2000
+TOP_FUNCTIONS = 60
+
+_PROFILE_ID = re.compile(r"^[0-9]+-[0-9]+-[0-9]+$")
+
+
+class RequestCapture:
+    """State for one in-flight request: the SQL it ran and, if selected, its call profile."""
+
+    def __init__(self, route: str, trigger: Optional[str]):
+        self.route = route
+        self.trigger = trigger
+        self.statements: List[dict] = []
+        self.dropped_statements = 0
+        self.sql_seconds = 0.0
+        self.profile: Optional[pstats.Stats] = None
+        self.profile_error: Optional[str] = None
+
+    def add_statement(self, statement: str, seconds: float, executemany: bool) -> None:
+        self.sql_seconds += seconds
+        if len(self.statements) >= MAX_STATEMENTS:
+            self.dropped_statements += 1
+            return
+        # Parameters are left out on purpose: they can hold personal data and password hashes
+        self.statements.append({
+            "sql": statement[:MAX_STATEMENT_LENGTH],
+            "ms": round(seconds * 1000, 3),
+            "executemany": executemany,
+        })
+
+    def add_profile(self, profiler: cProfile.Profile) -> None:
+        try:
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+        except TypeError:
+            # Nothing was recorded
+            return
+        if self.profile is None:
+            self.profile = stats
+        else:
+            self.profile.add(stats)
+
+
+_current_capture: contextvars.ContextVar[Optional[RequestCapture]] = contextvars.ContextVar(
+    "profiling_current_capture", default=None
+)
+
+
+class ProfileStore:
+    """Ring buffer of captures on disk, shared by every worker that points at the same directory."""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def new_id(self) -> str:
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        return f"{int(time.time() * 1000)}-{os.getpid()}-{sequence}"
+
+    def save(self, profile_id: str, record: dict, stats: Optional[pstats.Stats]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        if stats is not None:
+            # Raw pstats dump for snakeviz / python -m pstats
+            stats.dump_stats(self._path(profile_id, ".prof"))
+        path = self._path(profile_id, ".json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(record, f)
+        os.replace(path + ".tmp", path)
+        self._trim()
+
+    def list(self) -> List[dict]:
+        """Capture summaries, newest first (without the SQL and function tables)."""
+        summaries = []
+        for path in self._records():
+            record = self._read(path)
+            if record is not None:
+                summaries.append({key: value for key, value in record.items() if key not in ("sql", "functions")})
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return self._read(self._path(profile_id, ".json"))
+
+    def pstats_path(self, profile_id: str) -> Optional[str]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self._path(profile_id, ".prof")
+        return path if os.path.exists(path) else None
+
+    def clear(self) -> int:
+        removed = 0
+        for path in glob.glob(os.path.join(self.directory, "*.json")) + glob.glob(os.path.join(self.directory, "*.prof")):
+            try:
+                os.remove(path)
+                removed += path.endswith(".json")
+            except OSError:
+                pass
+        return removed
+
+    def _path(self, profile_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, profile_id + suffix)
+
+    def _records(self) -> List[str]:
+        paths = glob.glob(os.path.join(self.directory, "*.json"))
+
+        def age(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+
+        return sorted(paths, key=age, reverse=True)
+
+    def _trim(self) -> None:
+        for path in self._records()[self.max_files:]:
+            for victim in (path, path[:-len(".json")] + ".prof"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _read(path: str) -> Optional[dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+class RequestProfiler:
+    def __init__(self, store: ProfileStore = None, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 slow_ms: int = PROFILE_SLOW_MS, slow_cooldown: int = PROFILE_SLOW_COOLDOWN_SECONDS):
+        self.store = store or ProfileStore()
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.slow_cooldown = slow_cooldown
+        # Set by the app: async (request) -> bool, True if the caller may request a profile
+        self.authorize: Optional[Callable[[Request], Awaitable[bool]]] = None
+        self._lock = threading.Lock()
+        self._armed: Dict[str, bool] = {}
+        self._last_slow_capture: Dict[str, float] = {}
+
+    async def select(self, route: str, request: Request) -> Optional[str]:
+        """Why this request should get a call profile, or None."""
+        if request.headers.get(PROFILE_HEADER) and self.authorize is not None and await self.authorize(request):
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        if self._armed.get(route):
+            with self._lock:
+                if self._armed.pop(route, False):
+                    return "armed"
+        return None
+
+    def should_save(self, route: str, seconds: float, trigger: Optional[str]) -> bool:
+        """
+        Header and sampled captures are always kept. A slow request is kept (SQL only) and arms
+        its route, at most once per route per cooldown; the armed, profiled request is kept only
+        if it is slow too, otherwise the cooldown is lifted so the next slow one can try again.
+        """
+        if trigger in ("header", "sample"):
+            return True
+        slow = bool(self.slow_ms) and seconds * 1000 >= self.slow_ms
+        now = time.monotonic()
+        with self._lock:
+            if trigger == "armed":
+                if not slow:
+                    self._last_slow_capture.pop(route, None)
+                return slow
+            if not slow:
+                return False
+            last = self._last_slow_capture.get(route)
+            if last is not None and now - last < self.slow_cooldown:
+                return False
+            self._last_slow_capture[route] = now
+            self._armed[route] = True
+        return True
+
+    def record(self, capture: RequestCapture, request: Request, status_code: int, seconds: float) -> dict:
+        return {
+            "id": None,
+            "trigger": capture.trigger or "slow",
+            "method": request.method,
+            "route": capture.route,
+            "path": request.url.path,
+            "query": request.url.query,
+            "status": status_code,
+            "duration_ms": round(seconds * 1000, 3),
+            "sql_ms": round(capture.sql_seconds * 1000, 3),
+            "sql_count": len(capture.statements) + capture.dropped_statements,
+            "sql_dropped": capture.dropped_statements,
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "profiled": capture.profile is not None,
+            "profile_error": capture.profile_error,
+            "sql": capture.statements,
+            "functions": top_functions(capture.profile) if capture.profile is not None else [],
+        }
+
+    def save(self, profile_id: str, record: dict, stats: Optional[pstats.Stats]) -> None:
+        try:
+            self.store.save(profile_id, record, stats)
+        except Exception as e:
+            print(f"Failed to save request profile {profile_id}: {e}")
+
+
+def top_functions(stats: pstats.Stats, limit: int = TOP_FUNCTIONS) -> List[dict]:
+    """The most expensive functions by cumulative time."""
+    rows = []
+    for (filename, line, name), (primitive_calls, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": name,
+            "location": f"{filename}:{line}",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "tottime_ms": round(total * 1000, 3),
+            "cumtime_ms": round(cumulative * 1000, 3),
+        })
+    rows.sort(key=lambda row: row["cumtime_ms"], reverse=True)
+    return rows[:limit]
+
+
+def _enable(profiler: cProfile.Profile, capture: RequestCapture) -> bool:
+    try:
+        profiler.enable()
+        return True
+    except ValueError as e:
+        # Only one profiler may run per thread; an overlapping async request keeps its SQL trace
+        capture.profile_error = str(e)
+        return False
+
+
+def profiled_endpoint(endpoint: Callable) -> Callable:
+    """
+    Run the endpoint under cProfile when the current request is selected. Sync endpoints are
+    profiled in their worker thread; async ones on the event loop, so other requests interleaved
+    at their awaits show up in the profile too.
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            capture = _current_capture.get()
+            if capture is None or capture.trigger is None:
+                return await endpoint(*args, **kwargs)
+            profiler = cProfile.Profile()
+            if not _enable(profiler, capture):
+                return await endpoint(*args, **kwargs)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                profiler.disable()
+                capture.add_profile(profiler)
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        capture = _current_capture.get()
+        if capture is None or capture.trigger is None:
+            return endpoint(*args, **kwargs)
+        profiler = cProfile.Profile()
+        if not _enable(profiler, capture):
+            return endpoint(*args, **kwargs)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+            capture.add_profile(profiler)
+    return sync_wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that traces SQL for every request and profiles the selected ones."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, profiled_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        profiler = request_profiler
+        route = self.path
+
+        async def profiled_handler(request: Request):
+            trigger = await profiler.select(route, request)
+            if trigger is None and not profiler.slow_ms:
+                return await handler(request)
+            capture = RequestCapture(route, trigger)
+            token = _current_capture.set(capture)
+            start = time.perf_counter()
+            try:
+                response = await handler(request)
+            finally:
+                _current_capture.reset(token)
+            seconds = time.perf_counter() - start
+            if not profiler.should_save(route, seconds, trigger):
+                return response
+            profile_id = profiler.store.new_id()
+            record = profiler.record(capture, request, response.status_code, seconds)
+            record["id"] = profile_id
+            if trigger == "header":
+                response.headers[PROFILE_ID_HEADER] = profile_id
+            # Writing to disk stays off the event loop
+            asyncio.get_running_loop().run_in_executor(None, profiler.save, profile_id, record, capture.profile)
+            return response
+
+        return profiled_handler
+
+
+def trace_queries(engine) -> None:
+    """Record every statement (without parameters) into the current request's capture."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_capture.get() is not None:
+            conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        capture = _current_capture.get()
+        starts = conn.info.get("profiling_query_start")
+        if capture is None or not starts:
+            return
+        capture.add_statement(statement, time.perf_counter() - starts.pop(), executemany)
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,211 @@
+"""
+Sliding-window rate limiting
+Each key keeps two fixed-window counters (current and previous), so checks are O(1) in time and memory.
+The in-memory backend serves a single worker; the SQLite backend shares counters between workers on one host.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Tuple
+
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'memory')
+RATE_LIMIT_SQLITE_PATH = os.getenv('RATE_LIMIT_SQLITE_PATH', 'rate_limits.sqlite3')
+# Upper bound on tracked keys in the in-memory backend; least recently used keys are evicted first
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', '100000'))
+
+
+def sliding_window_estimate(curr: int, prev: int, elapsed: float, window: float) -> float:
+    """Weighted count: the previous window's hits decay linearly as the current window advances."""
+    return prev * (1 - elapsed / window) + curr
+
+
+def retry_after_seconds(curr: int, prev: int, elapsed: float, window: float, limit: int) -> float:
+    """Seconds until the sliding-window estimate drops below limit."""
+    if curr < limit:
+        if not prev:
+            return 0.0
+        return max(0.0, window * (1 - (limit - curr) / prev) - elapsed)
+    # Wait for the next window, then for this window's hits to decay enough
+    return (window - elapsed) + window * (1 - limit / curr)
+
+
+class RateLimitBackend(ABC):
+    """Storage for (current, previous) window counters keyed by limiter name and identifier."""
+
+    @abstractmethod
+    def counts(self, key: str, window: float, now: float) -> Tuple[int, int, float]:
+        """Return (current, previous, elapsed-in-current-window) for key."""
+
+    @abstractmethod
+    def incr(self, key: str, window: float, now: float) -> None:
+        ...
+
+    @abstractmethod
+    def reset(self, key: str) -> None:
+        ...
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Process-local counters with LRU bounding and eviction of idle keys."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        # key -> [window_index, current, previous, expires_at]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _roll(self, key: str, window: float, now: float):
+        index = int(now // window)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, index
+        if entry[0] != index:
+            # Previous window only counts if it is the immediately preceding one
+            entry[2] = entry[1] if entry[0] == index - 1 else 0
+            entry[1] = 0
+            entry[0] = index
+        return entry, index
+
+    def _evict(self, now: float) -> None:
+        # Oldest-touched keys sit at the front; drop expired ones and anything beyond max_keys
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[3] > now and len(self._entries) <= self.max_keys:
+                break
+            del self._entries[key]
+
+    def counts(self, key: str, window: float, now: float) -> Tuple[int, int, float]:
+        with self._lock:
+            entry, index = self._roll(key, window, now)
+            if entry is None:
+                return 0, 0, now - index * window
+            return entry[1], entry[2], now - index * window
+
+    def incr(self, key: str, window: float, now: float) -> None:
+        with self._lock:
+            entry, index = self._roll(key, window, now)
+            if entry is None:
+                entry = self._entries[key] = [index, 0, 0, 0.0]
+            entry[1] += 1
+            # Idle keys expire once both windows they could count toward have passed
+            entry[3] = (index + 2) * window
+            self._entries.move_to_end(key)
+            self._evict(now)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Counters in a local SQLite file shared by every worker process on the host.
+    Each operation is a single short IMMEDIATE transaction.
+    """
+
+    PURGE_INTERVAL_SECONDS = 60
+
+    def __init__(self, path: str = RATE_LIMIT_SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                " key TEXT PRIMARY KEY, window_index INTEGER NOT NULL,"
+                " current INTEGER NOT NULL, previous INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _rolled(row, index: int) -> Tuple[int, int]:
+        if row is None:
+            return 0, 0
+        window_index, current, previous = row
+        if window_index == index:
+            return current, previous
+        return 0, (current if window_index == index - 1 else 0)
+
+    def counts(self, key: str, window: float, now: float) -> Tuple[int, int, float]:
+        index = int(now // window)
+        row = self._connect().execute(
+            "SELECT window_index, current, previous FROM rate_limits WHERE key = ?", (key,)
+        ).fetchone()
+        current, previous = self._rolled(row, index)
+        return current, previous, now - index * window
+
+    def incr(self, key: str, window: float, now: float) -> None:
+        index = int(now // window)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_index, current, previous FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            current, previous = self._rolled(row, index)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, window_index, current, previous, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, index, current + 1, previous, (index + 2) * window)
+            )
+            if now - self._last_purge > self.PURGE_INTERVAL_SECONDS:
+                self._last_purge = now
+                conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reset(self, key: str) -> None:
+        self._connect().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+
+class RateLimiter:
+    """A named limit of `limit` hits per sliding `window_seconds`."""
+
+    def __init__(self, backend: RateLimitBackend, name: str, limit: int, window_seconds: float):
+        self.backend = backend
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    def _key(self, identifier: str) -> str:
+        return f"{self.name}:{identifier}"
+
+    def check(self, identifier: str) -> int:
+        """Return 0 if another hit is allowed, otherwise the whole seconds to wait."""
+        curr, prev, elapsed = self.backend.counts(self._key(identifier), self.window_seconds, time.time())
+        if sliding_window_estimate(curr, prev, elapsed, self.window_seconds) < self.limit:
+            return 0
+        return max(1, math.ceil(retry_after_seconds(curr, prev, elapsed, self.window_seconds, self.limit)))
+
+    def hit(self, identifier: str) -> None:
+        self.backend.incr(self._key(identifier), self.window_seconds, time.time())
+
+    def reset(self, identifier: str) -> None:
+        self.backend.reset(self._key(identifier))
+
+
+def create_backend() -> RateLimitBackend:
+    """Build the backend selected by RATE_LIMIT_BACKEND (memory or sqlite)."""
+    if RATE_LIMIT_BACKEND == 'sqlite':
+        return SQLiteRateLimitBackend()
+    return MemoryRateLimitBackend()
+
+
+rate_limit_backend = create_backend()
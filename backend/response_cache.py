@@ -0,0 +1,110 @@
+"""
+Versioned response cache for read-heavy endpoints
+Each resource has a version counter bumped by its write handlers. ETags are derived from the versions
+a response depends on, so conditional requests can be answered with 304 before any database work.
+
+Versions live in each worker. Bumps reach other workers only through a shared ALERT_BROKER_URL, so
+ETags also roll over every RESPONSE_CACHE_TTL_SECONDS: a worker that missed a bump serves a stale
+body (or 304) for at most that long.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Serialized bodies kept in memory; 0 disables the body cache (ETags/304s still work)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+# 0 disables expiry, which is only safe with a single worker
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '5'))
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Distinguishes this process's version counters from those of a previous run
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: Dict[str, int] = {}
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0}
+
+    def bump(self, *resources: str) -> None:
+        """Invalidate every cached response that depends on any of the resources."""
+        with self._lock:
+            for resource in resources:
+                self._versions[resource] = self._versions.get(resource, 0) + 1
+            self._stats["invalidations"] += 1
+
+    def etag(self, resources: Iterable[str], variant: str = "") -> str:
+        with self._lock:
+            key = ",".join(f"{r}:{self._versions.get(r, 0)}" for r in sorted(resources))
+        # Tags (and the bodies stored under them) expire when the TTL window changes
+        window = int(time.time() // self.ttl_seconds) if self.ttl_seconds > 0 else 0
+        digest = hashlib.sha1(f"{self.epoch}|{window}|{key}|{variant}".encode("utf-8")).hexdigest()[:20]
+        return f'W/"{digest}"'
+
+    def lookup(self, request: Request, resources: Iterable[str], variant: str = "") -> Tuple[str, Optional[Response]]:
+        """
+        Return (etag, response). The response is a 304 if the client already has this
+        version, a cached body if one is held, or None when the caller must build it.
+        Read the ETag before querying so a concurrent write can only make the body newer than its tag.
+        """
+        etag = self.etag(resources, variant)
+        if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+            self._count("not_modified")
+            return etag, Response(status_code=304, headers=self._headers(etag))
+        with self._lock:
+            body = self._bodies.get(etag)
+            if body is not None:
+                self._bodies.move_to_end(etag)
+                self._stats["hits"] += 1
+        if body is not None:
+            return etag, self._json(etag, body)
+        self._count("misses")
+        return etag, None
+
+    def store(self, etag: str, body: bytes) -> Response:
+        """Cache a freshly serialized JSON body under its ETag and return it as a response."""
+        if self.max_entries > 0:
+            with self._lock:
+                self._bodies[etag] = body
+                self._bodies.move_to_end(etag)
+                while len(self._bodies) > self.max_entries:
+                    self._bodies.popitem(last=False)
+        return self._json(etag, body)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._bodies)
+            stats["versions"] = dict(self._versions)
+        lookups = stats["hits"] + stats["misses"] + stats["not_modified"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["not_modified"]) / lookups, 4) if lookups else None
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    @staticmethod
+    def _headers(etag: str) -> dict:
+        # Browsers must revalidate, but may reuse the body on 304
+        return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    def _json(self, etag: str, body: bytes) -> Response:
+        return Response(content=body, media_type="application/json", headers=self._headers(etag))
+
+
+def _parse_if_none_match(header: Optional[str]) -> set:
+    if not header:
+        return set()
+    return {tag.strip() for tag in header.split(",")}
+
+
+response_cache = ResponseCache()
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
-from typing import Optional, List
+from typing import Optional, List, Dict
+from typing_extensions import TypedDict
 from datetime import datetime
 import re
 from models import UserRole, AlertType, AlertPriority, AlertStatus, ReportType, ReportStatus
@@ -51,6 +52,11 @@ class TokenResponse(BaseModel):
     token: str
     user: UserResponse
 
+class StreamTokenResponse(BaseModel):
+    """Short-lived token for GET /api/alerts/stream; seconds until it expires."""
+    token: str
+    expires_in: int
+
 # Alert Schemas
 class AlertBase(BaseModel):
     type: str = Field(..., max_length=50)
@@ -129,10 +135,106 @@ class ReportResponse(ReportBase):
     class Config:
         from_attributes = True
 
+class ReportPage(BaseModel):
+    items: List[ReportResponse]
+    next_cursor: Optional[str] = None
+
+# Row shapes for list endpoints that serialize column projections directly (no per-row model
+# validation); keys and order match AlertResponse / ReportResponse / ReportPage / SystemLogPage
+class AlertRow(TypedDict):
+    type: AlertType
+    title: str
+    message: str
+    priority: AlertPriority
+    id: int
+    status: AlertStatus
+    created_by: int
+    created_by_name: Optional[str]
+    created_at: datetime
+
+class ReportRow(TypedDict):
+    type: ReportType
+    title: str
+    description: str
+    location: Optional[str]
+    id: int
+    status: ReportStatus
+    official_response: Optional[str]
+    created_by: int
+    created_by_name: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    resolved_at: Optional[datetime]
+
+class ReportRowPage(TypedDict):
+    items: List[ReportRow]
+    next_cursor: Optional[str]
+
+class LogRow(TypedDict):
+    id: int
+    action: str
+    user: Optional[str]
+    details: Optional[str]
+    timestamp: datetime
+
+class LogRowPage(TypedDict):
+    items: List[LogRow]
+    next_cursor: Optional[str]
+
+# Sync Schemas
+class SyncDeleted(TypedDict):
+    alerts: List[int]
+    reports: List[int]
+
+class SyncPage(TypedDict):
+    token: str
+    # True when the client must discard what it holds (no token, or one older than tombstone retention)
+    reset: bool
+    has_more: bool
+    alerts: List[AlertRow]
+    reports: List[ReportRow]
+    deleted: SyncDeleted
+
+# Search Schemas
+class SearchHit(BaseModel):
+    kind: str
+    id: int
+    score: float
+    report: Optional[ReportResponse] = None
+    alert: Optional[AlertResponse] = None
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_offset: Optional[int] = None
+
 class ReportStatusUpdate(BaseModel):
     status: ReportStatus
     official_response: Optional[str] = Field(None, max_length=5000)
 
+MAX_BULK_REPORT_IDS = 500
+
+class ReportBulkRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_REPORT_IDS)
+    action: str = Field("update_status", pattern="^(update_status|delete)$")
+    status: Optional[ReportStatus] = None
+    official_response: Optional[str] = Field(None, max_length=5000)
+    
+    @model_validator(mode='after')
+    def require_status(self):
+        """A status update needs the new status."""
+        if self.action == "update_status" and self.status is None:
+            raise ValueError('status is required for update_status')
+        return self
+
+class ReportBulkOutcome(BaseModel):
+    id: int
+    outcome: str  # updated, deleted or not_found
+
+class ReportBulkResponse(BaseModel):
+    action: str
+    processed: int
+    results: List[ReportBulkOutcome]
+
 # User Management Schemas
 class UserRoleUpdate(BaseModel):
     role: UserRole
@@ -172,6 +274,38 @@ class DashboardStats(BaseModel):
     residents: int
     officials: int
 
+# Analytics Schemas
+class TimeBucketCount(BaseModel):
+    period: str
+    key: str
+    count: int
+
+class CountSeries(BaseModel):
+    totals: Dict[str, int]
+    buckets: List[TimeBucketCount]
+
+class ReportAnalytics(BaseModel):
+    bucket: str
+    by_type: CountSeries
+    by_status: CountSeries
+
+class AlertAnalytics(BaseModel):
+    bucket: str
+    by_type: CountSeries
+    by_priority: CountSeries
+
+class UserAnalytics(BaseModel):
+    bucket: str
+    registrations_by_role: CountSeries
+
+class ResolutionTimeStats(BaseModel):
+    resolved_count: int
+    average_hours: Optional[float] = None
+    p50_hours: Optional[float] = None
+    p90_hours: Optional[float] = None
+    p95_hours: Optional[float] = None
+    p99_hours: Optional[float] = None
+
 # System Log Schemas
 class SystemLogResponse(BaseModel):
     id: int
@@ -183,5 +317,9 @@ class SystemLogResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SystemLogPage(BaseModel):
+    items: List[SystemLogResponse]
+    next_cursor: Optional[str] = None
+
 
 
@@ -0,0 +1,221 @@
+"""
+Full-text search over reports and alerts
+On MySQL the FULLTEXT indexes ft_reports_text / ft_alerts_text do the work (MATCH ... AGAINST).
+Elsewhere (SQLite test deployments) an in-process inverted index with BM25 ranking is built at
+startup and kept current by the write handlers.
+"""
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from database import engine
+from models import Report, Alert
+
+# auto (FULLTEXT on MySQL, in-process index otherwise), fulltext or memory
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+
+KINDS = ("report", "alert")
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+ENGLISH_STOPWORDS = frozenset("""
+a about an and are as at be by can do does for from has have how i in is it its me my no not of on or
+our please so that the their there they this to was we were what when where which who will with you your
+""".split())
+
+TAGALOG_STOPWORDS = frozenset("""
+ako ang amin aming ano at ay ba dito doon din rin hindi ito iyan iyon ka kami kanila kanilang kay kayo
+ko kung lang mga may mo na namin nang ng ngayon ni nila nito niya po sa sila siya tayo tungkol ukol
+""".split())
+
+STOPWORDS = ENGLISH_STOPWORDS | TAGALOG_STOPWORDS
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text_value: Optional[str]) -> List[str]:
+    """Lowercased word tokens without stopwords or single characters."""
+    if not text_value:
+        return []
+    return [t for t in _TOKEN_RE.findall(text_value.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def report_text(report) -> str:
+    return " ".join(filter(None, (report.title, report.description, report.location)))
+
+
+def alert_text(alert) -> str:
+    return " ".join(filter(None, (alert.title, alert.message)))
+
+
+class InvertedIndex:
+    """
+    Term -> {document key: term frequency} postings with BM25 scoring.
+    Document keys are (kind, id); each document also carries an owner id so residents
+    can be restricted to their own reports before ranking and pagination.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[Tuple[str, int], int]] = {}
+        self._lengths: Dict[Tuple[str, int], int] = {}
+        self._terms: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+        self._owners: Dict[Tuple[str, int], Optional[int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def upsert(self, kind: str, doc_id: int, text_value: str, owner: Optional[int] = None) -> None:
+        key = (kind, doc_id)
+        frequencies = Counter(tokenize(text_value))
+        with self._lock:
+            self._remove_locked(key)
+            for term, count in frequencies.items():
+                self._postings.setdefault(term, {})[key] = count
+            length = sum(frequencies.values())
+            self._lengths[key] = length
+            self._terms[key] = tuple(frequencies)
+            self._owners[key] = owner
+            self._total_length += length
+
+    def remove(self, kind: str, doc_id: int) -> None:
+        with self._lock:
+            self._remove_locked((kind, doc_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._terms.clear()
+            self._owners.clear()
+            self._total_length = 0
+
+    def _remove_locked(self, key: Tuple[str, int]) -> None:
+        if key not in self._lengths:
+            return
+        for term in self._terms.pop(key):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
+        self._owners.pop(key, None)
+
+    def search(self, query: str, kinds: Sequence[str] = KINDS,
+               owner: Optional[int] = None) -> List[Tuple[float, Tuple[str, int]]]:
+        """(score, key) pairs, best first; ties broken by newest id."""
+        terms = set(tokenize(query))
+        scores: Dict[Tuple[str, int], float] = {}
+        with self._lock:
+            doc_count = len(self._lengths)
+            if not doc_count or not terms:
+                return []
+            average_length = self._total_length / doc_count or 1.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    if key[0] not in kinds:
+                        continue
+                    if owner is not None and key[0] == "report" and self._owners.get(key) != owner:
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[key] / average_length)
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return sorted(((score, key) for key, score in scores.items()), key=lambda hit: (-hit[0], -hit[1][1]))
+
+
+class SearchIndex:
+    """Chooses between MySQL FULLTEXT and the in-process index and runs ranked searches."""
+
+    def __init__(self, backend: str = SEARCH_BACKEND, bind=engine):
+        if backend == 'auto':
+            backend = 'fulltext' if bind.dialect.name == 'mysql' else 'memory'
+        self.backend = backend
+        self.memory = InvertedIndex()
+
+    @property
+    def incremental(self) -> bool:
+        """True when write handlers must keep the index current."""
+        return self.backend == 'memory'
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """Load every report and alert into the in-process index (no-op on FULLTEXT)."""
+        if not self.incremental:
+            return 0
+        self.memory.clear()
+        report_rows = db.execute(
+            select(Report.id, Report.title, Report.description, Report.location, Report.created_by)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in report_rows:
+            self.memory.upsert("report", row.id, report_text(row), row.created_by)
+        alert_rows = db.execute(
+            select(Alert.id, Alert.title, Alert.message).execution_options(yield_per=batch_size)
+        )
+        for row in alert_rows:
+            self.memory.upsert("alert", row.id, alert_text(row))
+        return len(self.memory)
+
+    def apply(self, change: dict) -> None:
+        """Apply an index change published by a write handler (see server.index_search_document)."""
+        if not self.incremental:
+            return
+        if change.get("ids") is not None:
+            # Bulk removal (see server.remove_search_documents)
+            for doc_id in change["ids"]:
+                self.memory.remove(change["kind"], doc_id)
+        elif change.get("text") is None:
+            self.memory.remove(change["kind"], change["id"])
+        else:
+            self.memory.upsert(change["kind"], change["id"], change["text"], change.get("owner"))
+
+    def search(self, db: Session, query: str, kinds: Sequence[str] = KINDS, owner: Optional[int] = None,
+               limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[float, str, int]], bool]:
+        """
+        One page of (score, kind, id) hits, best first, and whether more hits exist.
+        `owner` restricts report hits to that user's reports.
+        """
+        if self.backend == 'fulltext':
+            hits = self._fulltext(db, query, kinds, owner, offset + limit + 1)
+        else:
+            hits = [(score, kind, doc_id) for score, (kind, doc_id) in self.memory.search(query, kinds, owner)]
+        page = hits[offset:offset + limit + 1]
+        return page[:limit], len(page) > limit
+
+    def _fulltext(self, db: Session, query: str, kinds: Sequence[str], owner: Optional[int],
+                  limit: int) -> List[Tuple[float, str, int]]:
+        # Each kind returns its own top `limit`; merging them gives the global top `limit`
+        hits: List[Tuple[float, str, int]] = []
+        if "report" in kinds:
+            score = match(Report.title, Report.description, Report.location, against=query).in_natural_language_mode()
+            stmt = select(Report.id, score).where(score > 0)
+            if owner is not None:
+                stmt = stmt.where(Report.created_by == owner)
+            hits.extend(("report", doc_id, score_value) for doc_id, score_value in self._ranked(db, stmt, score, limit))
+        if "alert" in kinds:
+            score = match(Alert.title, Alert.message, against=query).in_natural_language_mode()
+            stmt = select(Alert.id, score).where(score > 0)
+            hits.extend(("alert", doc_id, score_value) for doc_id, score_value in self._ranked(db, stmt, score, limit))
+        ranked = [(float(score_value), kind, doc_id) for kind, doc_id, score_value in hits]
+        ranked.sort(key=lambda hit: (-hit[0], -hit[2]))
+        return ranked
+
+    @staticmethod
+    def _ranked(db: Session, stmt, score, limit: int):
+        return db.execute(stmt.order_by(score.desc()).limit(limit)).all()
+
+
+search_index = SearchIndex()
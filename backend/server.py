@@ -1,29 +1,61 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, Query, Request
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, Request, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, case
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse, FileResponse, Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from sqlalchemy import func, desc, select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
 from dotenv import load_dotenv
 import os
 import jwt
-import bcrypt
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
-import random
 import html
-from collections import defaultdict
+import hmac
+import asyncio
+import csv
+import enum
+import io
+import zlib
 
-from database import get_db, engine, Base
-from models import User, Alert, Report, SystemLog, UserRole, AlertStatus, ReportStatus, AlertType, AlertPriority
+from database import get_db, get_async_db, engine, async_engine, Base, SessionLocal, ASYNC_DB
+from models import User, Alert, Report, SystemLog, UserRole, AlertStatus, ReportStatus, ReportType, AlertType, AlertPriority
+from pagination import keyset_before, encode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from sync import (
+    STREAMS as SYNC_STREAMS, SYNC_PAGE_SIZE, MAX_SYNC_PAGE_SIZE, changed_at, after, encode_token, decode_token,
+    is_expired, next_position, latest_tombstone_position, tombstones_statement, record_tombstones
+)
+from alert_hub import alert_hub, format_sse
+from user_cache import Principal, user_cache
+from password_hashing import password_hasher, needs_rehash, PasswordHasherBusy
+from rate_limit import RateLimiter, MemoryRateLimitBackend, rate_limit_backend
+from audit_log import audit_log
+from log_retention import log_retention
+from analytics import bucketed_counts, duration_percentiles
+from stats_counters import (
+    bump_counters, combine_deltas, read_counters, read_counters_async, counter_reconciler,
+    report_deltas, report_status_deltas, alert_deltas, user_deltas, user_role_deltas
+)
+from response_cache import response_cache
+import db_metrics
+from metrics import MetricsMiddleware, metrics_registry, instrument_queries, METRICS_TOKEN
+from profiling import ProfiledRoute, request_profiler, trace_queries
+from chatbot import get_chatbot_response
+from search import search_index, report_text, alert_text, KINDS as SEARCH_KINDS
 from schemas import (
-    UserCreate, UserLogin, UserResponse, TokenResponse,
+    UserCreate, UserLogin, UserResponse, TokenResponse, StreamTokenResponse,
     AlertCreate, AlertResponse,
-    ReportCreate, ReportResponse, ReportStatusUpdate,
+    ReportCreate, ReportResponse, ReportPage, ReportStatusUpdate,
+    ReportBulkRequest, ReportBulkResponse,
     UserRoleUpdate, UserPasswordReset, ChatbotQuery, ChatbotResponse,
-    DashboardStats, SystemLogResponse
+    DashboardStats, SystemLogPage,
+    ReportAnalytics, AlertAnalytics, UserAnalytics, ResolutionTimeStats,
+    SearchHit, SearchPage, AlertRow, ReportRow, ReportRowPage, LogRow, LogRowPage, SyncPage
 )
 
 # Load environment variables
@@ -31,11 +63,17 @@ load_dotenv()
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# create_all does not alter existing tables; add system_logs.expires_at if it predates retention
+log_retention.ensure_schema()
 
 # JWT Configuration
 JWT_SECRET = os.getenv('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+# Alert stream tokens go in the URL (EventSource cannot send headers), so they only open the stream
+# and expire quickly; the login token is never accepted there
+ALERT_STREAM_TOKEN_TYPE = "alert_stream"
+ALERT_STREAM_TOKEN_SECONDS = int(os.getenv('ALERT_STREAM_TOKEN_SECONDS', '60'))
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -45,6 +83,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc"
 )
+# Every route traces its SQL and can be profiled on demand (see profiling.py)
+app.router.route_class = ProfiledRoute
 
 # Request size limit (10MB)
 MAX_REQUEST_SIZE = 10 * 1024 * 1024
@@ -60,11 +100,56 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
-    expose_headers=["Content-Type"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match", "X-Profile"],
+    expose_headers=["Content-Type", "ETag", "X-Profile-Id"],
     max_age=3600,
 )
 
+# Request metrics (added last so it is outermost and times CORS and error handling too)
+app.add_middleware(MetricsMiddleware)
+instrument_queries(engine)
+trace_queries(engine)
+if async_engine is not None:
+    instrument_queries(async_engine)
+    trace_queries(async_engine)
+
+def collect_backend_metrics():
+    """Pool, audit writer and response cache counters for GET /metrics."""
+    pools = db_metrics.snapshot()
+    for gauge in ("size", "checkedout", "overflow", "peak_checked_out"):
+        yield (f"db_pool_{gauge}", "gauge", f"Connection pool {gauge.replace('_', ' ')}.",
+               [({"engine": name}, snap["pool"].get(gauge)) for name, snap in pools.items()
+                if isinstance(snap["pool"].get(gauge), int)])
+    counter_names = sorted({counter for snap in pools.values() for counter in snap["counters"]})
+    for counter in counter_names:
+        yield (f"db_pool_{counter}_total", "counter", f"Connection pool {counter.replace('_', ' ')}.",
+               [({"engine": name}, snap["counters"][counter]) for name, snap in pools.items()])
+    for timing in ("checkout", "pre_ping"):
+        samples = []
+        for name, snap in pools.items():
+            stats = snap[timing]
+            labels = {"engine": name}
+            for bound, count in stats["buckets_ms"].items():
+                le = bound if bound == "+Inf" else repr(float(bound) / 1000)
+                samples.append(("_bucket", dict(labels, le=le), count))
+            samples.append(("_sum", labels, stats["sum_ms"] / 1000))
+            samples.append(("_count", labels, stats["count"]))
+        yield (f"db_pool_{timing}_seconds", "histogram",
+               f"Connection pool {timing.replace('_', '-')} latency.", samples)
+
+    audit = audit_log.stats()
+    for counter in ("queued", "flushed", "dropped", "failed", "batches"):
+        yield (f"audit_log_{counter}_total", "counter", f"Audit log records {counter}.", [({}, audit[counter])])
+    yield ("audit_log_pending", "gauge", "Audit log records waiting to be written.", [({}, audit["pending"])])
+
+    cache = response_cache.stats()
+    for counter in ("hits", "misses", "not_modified", "invalidations"):
+        yield (f"response_cache_{counter}_total", "counter", f"Response cache {counter.replace('_', ' ')}.",
+               [({}, cache[counter])])
+    yield ("response_cache_entries", "gauge", "Cached response bodies.", [({}, cache["entries"])])
+
+metrics_registry.add_collector(collect_backend_metrics)
+
 # Helper function to get CORS headers
 def get_cors_headers(request: Request) -> dict:
     """Get CORS headers for the request origin."""
@@ -92,7 +177,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     headers = get_cors_headers(request)
     return JSONResponse(
         status_code=422,
-        content={"detail": exc.errors()},
+        # jsonable_encoder, as FastAPI's default handler does: model validator errors carry the exception in ctx
+        content={"detail": jsonable_encoder(exc.errors())},
         headers=headers
     )
 
@@ -101,6 +187,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions and ensure CORS headers are included."""
     headers = get_cors_headers(request)
+    if exc.headers:
+        headers.update(exc.headers)
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
@@ -121,20 +209,40 @@ async def general_exception_handler(request: Request, exc: Exception):
         headers=headers
     )
 
-# Rate limiting storage (in production, use Redis)
-login_attempts = defaultdict(list)
+# Rate limiting (set RATE_LIMIT_BACKEND=sqlite to share counters between workers)
 MAX_LOGIN_ATTEMPTS = 5
 LOGIN_WINDOW_SECONDS = 300  # 5 minutes
+login_account_limiter = RateLimiter(rate_limit_backend, "login_account", MAX_LOGIN_ATTEMPTS, LOGIN_WINDOW_SECONDS)
+login_ip_limiter = RateLimiter(rate_limit_backend, "login_ip", 20, LOGIN_WINDOW_SECONDS)
+register_account_limiter = RateLimiter(rate_limit_backend, "register_account", 5, LOGIN_WINDOW_SECONDS)
+register_ip_limiter = RateLimiter(rate_limit_backend, "register_ip", 10, 3600)
+chatbot_account_limiter = RateLimiter(rate_limit_backend, "chatbot_account", 30, 60)
+chatbot_ip_limiter = RateLimiter(rate_limit_backend, "chatbot_ip", 60, 60)
 
 # Security
 security = HTTPBearer()
 
 # Helper Functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    """Hash in the password worker pool; 503 when the pool is saturated."""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise password_pool_busy()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify in the password worker pool; 503 when the pool is saturated."""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise password_pool_busy()
+
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy. Please try again shortly.",
+        headers={"Retry-After": "1"}
+    )
 
 def create_access_token(user_id: int, email: str, role: str) -> str:
     payload = {
@@ -145,19 +253,35 @@ def create_access_token(user_id: int, email: str, role: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+def create_stream_token(user_id: int) -> str:
+    payload = {
+        "sub": str(user_id),
+        "typ": ALERT_STREAM_TOKEN_TYPE,
+        "exp": datetime.now(timezone.utc) + timedelta(seconds=ALERT_STREAM_TOKEN_SECONDS)
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+def decode_access_token(token: str, token_type: Optional[str] = None) -> int:
+    """
+    Verify a JWT and return the user id it was issued for.
+    token_type must match the token's "typ" claim; login tokens have none.
+    """
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id: int = int(payload.get("sub"))
-    except (jwt.PyJWTError, ValueError):
+        if payload.get("typ") != token_type:
+            raise ValueError("wrong token type")
+        return int(payload.get("sub"))
+    except (jwt.PyJWTError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    user_id = decode_access_token(credentials.credentials)
     
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
@@ -167,8 +291,62 @@ def get_current_user(
         )
     return user
 
+def load_principal(user_id: int) -> Optional[Principal]:
+    """
+    Resolve a verified user id to a Principal, serving from the user cache.
+    A database session is only opened on a cache miss.
+    """
+    principal = user_cache.get(user_id)
+    if principal is not None:
+        return principal
+    return load_principal_from_db(user_id)
+
+def load_principal_from_db(user_id: int) -> Optional[Principal]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+    finally:
+        db.close()
+    user_cache.put(principal)
+    return principal
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """Stateless auth: verify the JWT and resolve the caller without a per-request user query."""
+    user_id = decode_access_token(credentials.credentials)
+    # Cache hits stay on the event loop; only a miss needs a thread for the blocking lookup
+    principal = user_cache.get(user_id)
+    if principal is None:
+        principal = await run_in_threadpool(load_principal_from_db, user_id)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return principal
+
+async def is_admin_request(request: Request) -> bool:
+    """Whether the request carries a valid admin token (gates X-Profile)."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user_id = decode_access_token(token)
+    except HTTPException:
+        return False
+    principal = user_cache.get(user_id)
+    if principal is None:
+        principal = await run_in_threadpool(load_principal_from_db, user_id)
+    return principal is not None and principal.role == UserRole.ADMIN
+
+request_profiler.authorize = is_admin_request
+
 def require_role(allowed_roles: List[UserRole]):
-    def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: Principal = Depends(get_current_principal)):
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -177,11 +355,75 @@ def require_role(allowed_roles: List[UserRole]):
         return current_user
     return role_checker
 
-def create_system_log(db: Session, action: str, user_id: Optional[int], details: str):
-    """Helper function to create system log entries."""
-    log = SystemLog(action=action, user_id=user_id, details=details)
-    db.add(log)
-    return log
+def create_system_log(action: str, user_id: Optional[int], details: str):
+    """Queue a system log entry; the audit writer batches it into system_logs off the request path."""
+    return audit_log.record(action, user_id, details)
+
+# Response cache: resource versions are bumped after writes on every worker via the alert broker
+CACHE_INVALIDATE_EVENT = "cache_invalidate"
+DASHBOARD_CACHE_RESOURCES = ("reports", "alerts", "users", "stats")
+# List endpoints dump column-projection rows straight to JSON (see AlertRow / ReportRow)
+ALERT_ROWS_ADAPTER = TypeAdapter(List[AlertRow])
+REPORT_PAGE_ADAPTER = TypeAdapter(ReportRowPage)
+REPORT_ROW_ADAPTER = TypeAdapter(ReportRow)
+LOG_PAGE_ADAPTER = TypeAdapter(LogRowPage)
+LOG_ROW_ADAPTER = TypeAdapter(LogRow)
+# Rows fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = 1000
+EXPORT_GZIP_LEVEL = 6
+REPORT_CSV_FIELDS = (
+    "id", "type", "status", "title", "description", "location", "created_by", "created_by_name",
+    "created_at", "updated_at", "resolved_at", "official_response"
+)
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# Rows carry an extra changed_at column; TypedDict serialization leaves it out
+SYNC_PAGE_ADAPTER = TypeAdapter(SyncPage)
+
+def invalidate_cache(*resources: str):
+    """Invalidate cached responses depending on the given resources, here at once and on other workers via the broker."""
+    response_cache.bump(*resources)
+    alert_hub.publish(CACHE_INVALIDATE_EVENT, {"resources": list(resources), "origin": response_cache.epoch}, internal=True)
+
+def apply_cache_invalidation(event: dict):
+    # The publishing worker has already bumped its own versions
+    if event.get("type") == CACHE_INVALIDATE_EVENT and event["data"].get("origin") != response_cache.epoch:
+        response_cache.bump(*event["data"]["resources"])
+
+alert_hub.add_listener(apply_cache_invalidation)
+audit_log.on_flush = lambda count: invalidate_cache("logs")
+
+# Cached principals: role and password changes evict the user on every worker, not just this one
+USER_INVALIDATE_EVENT = "user_invalidate"
+
+def invalidate_user(user_id: int):
+    """Evict a user's cached principal here at once and on other workers via the broker."""
+    user_cache.invalidate(user_id)
+    alert_hub.publish(USER_INVALIDATE_EVENT, {"id": user_id}, internal=True)
+
+def apply_user_invalidation(event: dict):
+    if event.get("type") == USER_INVALIDATE_EVENT:
+        user_cache.invalidate(event["data"]["id"])
+
+alert_hub.add_listener(apply_user_invalidation)
+
+# In-process search index (non-MySQL): changes travel over the broker so every worker applies them
+SEARCH_INDEX_EVENT = "search_index"
+
+def index_search_document(kind: str, doc_id: int, text: Optional[str] = None, owner: Optional[int] = None):
+    """Add or replace a document in the search index; text=None removes it."""
+    if search_index.incremental:
+        alert_hub.publish(SEARCH_INDEX_EVENT, {"kind": kind, "id": doc_id, "text": text, "owner": owner}, internal=True)
+
+def remove_search_documents(kind: str, doc_ids: List[int]):
+    """Remove many documents from the search index with a single event."""
+    if search_index.incremental and doc_ids:
+        alert_hub.publish(SEARCH_INDEX_EVENT, {"kind": kind, "ids": list(doc_ids)}, internal=True)
+
+def apply_search_index_change(event: dict):
+    if event.get("type") == SEARCH_INDEX_EVENT:
+        search_index.apply(event["data"])
+
+alert_hub.add_listener(apply_search_index_change)
 
 def add_creator_name(response_dict: dict, creator_name: str):
     """Helper function to add creator name to response dict."""
@@ -201,37 +443,335 @@ def sanitize_input(text: str, max_length: Optional[int] = None) -> str:
         sanitized = sanitized[:max_length]
     return sanitized
 
-def check_rate_limit(identifier: str) -> bool:
-    """Check if rate limit is exceeded for login attempts."""
-    now = datetime.now(timezone.utc)
-    # Clean old attempts
-    login_attempts[identifier] = [
-        attempt for attempt in login_attempts[identifier]
-        if (now - attempt).total_seconds() < LOGIN_WINDOW_SECONDS
-    ]
-    # Check if limit exceeded
-    if len(login_attempts[identifier]) >= MAX_LOGIN_ATTEMPTS:
-        return False
-    return True
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def enforce_rate_limit(limiters: List[tuple], detail: str):
+    """Raise 429 with Retry-After if any (limiter, identifier) pair is over its limit."""
+    retry_after = max(limiter.check(identifier) for limiter, identifier in limiters)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
+def record_rate_limit_hit(limiters: List[tuple]):
+    for limiter, identifier in limiters:
+        limiter.hit(identifier)
+
+# Query and response helpers shared by the sync handlers and their ASYNC_DB counterparts
+# Response columns plus the creator's name: no entities, identity map or per-row model validation
+ALERT_LIST_COLUMNS = (
+    Alert.type, Alert.title, Alert.message,
+    # AlertResponse turns a missing priority into medium
+    func.coalesce(Alert.priority, AlertPriority.MEDIUM).label("priority"),
+    Alert.id, Alert.status, Alert.created_by,
+    User.name.label("created_by_name"), Alert.created_at
+)
+REPORT_LIST_COLUMNS = (
+    Report.type, Report.title, Report.description, Report.location, Report.id, Report.status,
+    Report.official_response, Report.created_by, User.name.label("created_by_name"),
+    Report.created_at, Report.updated_at, Report.resolved_at
+)
+USER_LIST_COLUMNS = (User.id, User.email, User.name, User.phone, User.address, User.role, User.created_at)
+LOG_LIST_COLUMNS = (
+    SystemLog.id, SystemLog.action, func.coalesce(User.name, "System").label("user"),
+    SystemLog.details, SystemLog.timestamp
+)
+
+def json_response(body: bytes) -> Response:
+    """Already-serialized JSON; FastAPI does not re-validate a returned Response against response_model."""
+    return Response(content=body, media_type="application/json")
+
+def alert_rows_json(rows) -> bytes:
+    return ALERT_ROWS_ADAPTER.dump_json([row._asdict() for row in rows])
+
+def alerts_statement(since: Optional[datetime] = None):
+    stmt = select(*ALERT_LIST_COLUMNS).select_from(Alert).outerjoin(User, Alert.creator)
+    
+    # If since parameter is provided, only return alerts created after that time
+    if since:
+        stmt = stmt.where(Alert.created_at > since)
+    
+    return stmt.order_by(desc(Alert.created_at))
+
+def new_alerts_statement(since: Optional[str]):
+    stmt = (
+        select(*ALERT_LIST_COLUMNS).select_from(Alert).outerjoin(User, Alert.creator)
+        .where(Alert.status == AlertStatus.ACTIVE)
+    )
+    
+    if since:
+        try:
+            # Handle both with and without timezone
+            since_str = since.replace('Z', '+00:00') if since.endswith('Z') else since
+            since_dt = datetime.fromisoformat(since_str)
+            # Ensure timezone aware
+            if since_dt.tzinfo is None:
+                since_dt = since_dt.replace(tzinfo=timezone.utc)
+            stmt = stmt.where(Alert.created_at > since_dt)
+        except (ValueError, AttributeError):
+            # If invalid timestamp, return all active alerts
+            pass
+    
+    return stmt.order_by(desc(Alert.created_at)).limit(10)
+
+def reports_statement(
+    current_user: Principal,
+    cursor: Optional[str],
+    limit: int,
+    status_filter: Optional[ReportStatus],
+    type_filter: Optional[ReportType],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    created_by: Optional[int]
+):
+    """One keyset page of reports, plus one extra row to detect a next page."""
+    stmt = select(*REPORT_LIST_COLUMNS).select_from(Report).outerjoin(User, Report.creator)
+    stmt = filter_reports(stmt, current_user, status_filter, type_filter, date_from, date_to, created_by)
+    
+    if cursor:
+        try:
+            stmt = stmt.where(keyset_before(Report.created_at, Report.id, cursor))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    return stmt.order_by(desc(Report.created_at), desc(Report.id)).limit(limit + 1)
+
+def filter_reports(
+    stmt,
+    current_user: Principal,
+    status_filter: Optional[ReportStatus],
+    type_filter: Optional[ReportType],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    created_by: Optional[int]
+):
+    """Apply the report list filters, and the residents-see-their-own rule, to a statement."""
+    # Residents can only see their own reports
+    if current_user.role == UserRole.RESIDENT:
+        stmt = stmt.where(Report.created_by == current_user.id)
+    elif created_by is not None:
+        stmt = stmt.where(Report.created_by == created_by)
+    
+    if status_filter is not None:
+        stmt = stmt.where(Report.status == status_filter)
+    if type_filter is not None:
+        stmt = stmt.where(Report.type == type_filter)
+    if date_from is not None:
+        stmt = stmt.where(Report.created_at >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(Report.created_at < date_to)
+    return stmt
+
+def alert_changes_statement(position):
+    """Alerts changed after a sync position, oldest change first."""
+    changed = changed_at(Alert)
+    return (
+        select(changed.label("changed_at"), *ALERT_LIST_COLUMNS).select_from(Alert).outerjoin(User, Alert.creator)
+        .where(after(changed, Alert.id, position)).order_by(changed, Alert.id)
+    )
+
+def report_changes_statement(position, owner: Optional[int]):
+    """Reports changed after a sync position, oldest change first; owner limits them to one creator."""
+    changed = changed_at(Report)
+    stmt = (
+        select(changed.label("changed_at"), *REPORT_LIST_COLUMNS).select_from(Report).outerjoin(User, Report.creator)
+        .where(after(changed, Report.id, position))
+    )
+    if owner is not None:
+        stmt = stmt.where(Report.created_by == owner)
+    return stmt.order_by(changed, Report.id)
+
+def report_page_json(rows, limit: int) -> bytes:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    return REPORT_PAGE_ADAPTER.dump_json({"items": [row._asdict() for row in rows], "next_cursor": next_cursor})
+
+def logs_statement(
+    cursor: Optional[str],
+    action: Optional[str],
+    user_id: Optional[int],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+):
+    """System logs newest first with the acting user's name joined in; entries without a user are "System"."""
+    stmt = select(*LOG_LIST_COLUMNS).select_from(SystemLog).outerjoin(User, SystemLog.user)
+    
+    if action is not None:
+        stmt = stmt.where(SystemLog.action == action)
+    if user_id is not None:
+        stmt = stmt.where(SystemLog.user_id == user_id)
+    if date_from is not None:
+        stmt = stmt.where(SystemLog.timestamp >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(SystemLog.timestamp < date_to)
+    
+    if cursor:
+        try:
+            stmt = stmt.where(keyset_before(SystemLog.timestamp, SystemLog.id, cursor))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    return stmt.order_by(desc(SystemLog.timestamp), desc(SystemLog.id))
+
+def log_page_json(rows, limit: int) -> bytes:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    
+    return LOG_PAGE_ADAPTER.dump_json({"items": [row._asdict() for row in rows], "next_cursor": next_cursor})
+
+def export_rows(stmt, encode_batch, header: bytes = b""):
+    """
+    Stream a statement's rows, encoded EXPORT_BATCH_SIZE rows at a time, on a connection of its
+    own (the request's session is closed before the body is sent). Nothing beyond one batch is
+    held in memory; MySQL sends rows through a server-side cursor.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+        if header:
+            yield header
+        for batch in result.partitions():
+            yield encode_batch(batch)
+
+def ndjson_rows(stmt, adapter: TypeAdapter):
+    return export_rows(stmt, lambda rows: b"".join(adapter.dump_json(row._asdict()) + b"\n" for row in rows))
+
+def csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Text starting with these is run as a formula by spreadsheet apps
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def report_csv_rows(stmt):
+    def encode(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([csv_cell(getattr(row, field)) for field in REPORT_CSV_FIELDS] for row in rows)
+        return buffer.getvalue().encode("utf-8")
+    # The byte order mark makes Excel read the file as UTF-8
+    header = io.StringIO()
+    csv.writer(header).writerow(REPORT_CSV_FIELDS)
+    return export_rows(stmt, encode, header=("\ufeff" + header.getvalue()).encode("utf-8"))
+
+def gzip_chunks(chunks):
+    """gzip a byte stream on the fly, flushed per chunk so the client receives each batch as it is read."""
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def export_response(request: Request, chunks, media_type: str, filename: str) -> StreamingResponse:
+    """Streamed download, gzip-encoded when the client accepts it."""
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Vary": "Accept-Encoding"}
+    accepted = {part.split(";")[0].strip().lower() for part in request.headers.get("accept-encoding", "").split(",")}
+    if "gzip" in accepted:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+def answer_chatbot_query(query: ChatbotQuery, request: Request, current_user: Principal) -> ChatbotResponse:
+    limits = [(chatbot_account_limiter, str(current_user.id)), (chatbot_ip_limiter, client_ip(request))]
+    enforce_rate_limit(limits, "Too many chatbot queries. Please slow down.")
+    record_rate_limit_hit(limits)
+    
+    # Sanitize input
+    sanitized_message = sanitize_input(query.message, max_length=1000)
+    
+    # Get rule-based response
+    response_text = get_chatbot_response(sanitized_message)
+    
+    # Log action (queued; no database work on the request path)
+    create_system_log("chatbot_query", current_user.id, f"Chatbot query: {sanitized_message[:50]}")
+    
+    return ChatbotResponse(
+        response=response_text,
+        session_id=query.session_id or f"session_{datetime.now(timezone.utc).timestamp()}"
+    )
 
-def record_login_attempt(identifier: str):
-    """Record a login attempt."""
-    login_attempts[identifier].append(datetime.now(timezone.utc))
 
 # Auth Routes
+@app.on_event("startup")
+def start_password_pool():
+    # Keep this the first startup hook: bcrypt workers are forked before the other hooks start threads
+    password_hasher.start()
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    password_hasher.shutdown()
+
+@app.on_event("startup")
+def start_stats_counters():
+    # Warm the counters from the source tables, then reconcile periodically
+    counter_reconciler.start()
+
+@app.on_event("shutdown")
+def stop_stats_counters():
+    counter_reconciler.stop()
+
+@app.on_event("startup")
+def start_log_retention():
+    # Archive and drop expired system_logs months every LOG_RETENTION_INTERVAL_SECONDS
+    log_retention.start()
+
+@app.on_event("shutdown")
+def stop_log_retention():
+    log_retention.stop()
+
+@app.on_event("startup")
+def start_audit_log():
+    audit_log.start()
+
+@app.on_event("shutdown")
+def drain_audit_log():
+    # Flush queued audit records before the process exits
+    audit_log.stop()
+
+@app.on_event("startup")
+def build_search_index():
+    # No-op on MySQL, where the FULLTEXT indexes are maintained by the database
+    db = SessionLocal()
+    try:
+        count = search_index.rebuild(db)
+        if search_index.incremental:
+            print(f"Search index built with {count} documents")
+    finally:
+        db.close()
+
 @app.post("/api/auth/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    # Rate limiting check
+async def register(user_data: UserCreate, request: Request, db: Session = Depends(get_db)):
+    # Rate limiting check (every attempt counts, per account and per IP)
     email_lower = user_data.email.lower()
-    if not check_rate_limit(f"register_{email_lower}"):
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many registration attempts. Please try again later."
-        )
+    limits = [(register_account_limiter, email_lower), (register_ip_limiter, client_ip(request))]
+    enforce_rate_limit(limits, "Too many registration attempts. Please try again later.")
+    record_rate_limit_hit(limits)
     
     # Check if email already exists (case-insensitive)
     # MySQL is case-insensitive by default, but we normalize to lowercase
-    existing_user = db.query(User).filter(User.email == email_lower).first()
+    existing_user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email_lower).first())
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -244,7 +784,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     sanitized_address = sanitize_input(user_data.address, max_length=500) if user_data.address else None
     
     # Create new user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     new_user = User(
         email=email_lower,
         password_hash=hashed_password,
@@ -254,16 +794,20 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         address=sanitized_address
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    def save_user():
+        db.add(new_user)
+        bump_counters(db, user_deltas(new_user.role or UserRole.RESIDENT))
+        db.commit()
+        db.refresh(new_user)
     
-    # Create token
-    token = create_access_token(new_user.id, new_user.email, new_user.role.value)
+    await run_in_threadpool(save_user)
+    invalidate_cache("users")
     
     # Log action
-    create_system_log(db, "user_register", new_user.id, f"User {new_user.email} registered")
-    db.commit()
+    create_system_log("user_register", new_user.id, f"User {new_user.email} registered")
+    
+    # Create token
+    token = create_access_token(new_user.id, new_user.email, new_user.role.value)
     
     return TokenResponse(
         token=token,
@@ -271,50 +815,60 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
 @app.post("/api/auth/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    # Rate limiting check
+async def login(credentials: UserLogin, request: Request, db: Session = Depends(get_db)):
+    # Rate limiting check (failed attempts count, per account and per IP)
     email_lower = credentials.email.lower()
-    if not check_rate_limit(email_lower):
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many login attempts. Please try again later."
-        )
+    limits = [(login_account_limiter, email_lower), (login_ip_limiter, client_ip(request))]
+    enforce_rate_limit(limits, "Too many login attempts. Please try again later.")
     
     # Case-insensitive email lookup (MySQL is case-insensitive by default)
     # We normalize to lowercase for consistency
-    user = db.query(User).filter(func.lower(User.email) == email_lower).first()
+    user = await run_in_threadpool(lambda: db.query(User).filter(func.lower(User.email) == email_lower).first())
     
     if not user:
-        record_login_attempt(email_lower)
+        record_rate_limit_hit(limits)
         print(f"Login attempt failed: User not found for email: {email_lower}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
     
-    if not verify_password(credentials.password, user.password_hash):
-        record_login_attempt(email_lower)
+    if not await verify_password(credentials.password, user.password_hash):
+        record_rate_limit_hit(limits)
         print(f"Login attempt failed: Invalid password for email: {email_lower}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
     
-    # Clear attempts on successful login
-    if email_lower in login_attempts:
-        del login_attempts[email_lower]
+    # Clear account attempts on successful login
+    login_account_limiter.reset(email_lower)
+    
+    # Upgrade hashes created with a different BCRYPT_ROUNDS while we have the plaintext
+    new_hash = None
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await password_hasher.hash(credentials.password)
+        except PasswordHasherBusy:
+            # Not worth failing the login over; retry on a later login
+            pass
     
     # Create token
     token = create_access_token(user.id, user.email, user.role.value)
     
-    # Log action (async logging - don't block login response)
-    try:
-        create_system_log(db, "user_login", user.id, f"User {user.email} logged in")
-        db.commit()
-    except Exception:
-        # Don't fail login if logging fails
-        db.rollback()
-        pass
+    if new_hash:
+        def save_hash():
+            try:
+                user.password_hash = new_hash
+                db.commit()
+            except Exception:
+                # Don't fail login if the upgrade fails
+                db.rollback()
+        
+        await run_in_threadpool(save_hash)
+    
+    # Log action (queued - doesn't block login response)
+    create_system_log("user_login", user.id, f"User {user.email} logged in")
     
     return TokenResponse(
         token=token,
@@ -325,79 +879,159 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 def get_current_user_info(current_user: User = Depends(get_current_user)):
     return UserResponse.model_validate(current_user)
 
+# Async hot routes (ASYNC_DB=true). Registered ahead of the sync routes below so they take
+# precedence; they read through the async engine and never occupy a threadpool worker.
+async_router = APIRouter(route_class=ProfiledRoute)
+
+@async_router.get("/api/alerts", response_model=List[AlertResponse])
+async def get_alerts_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    since: Optional[datetime] = None
+):
+    etag = None
+    if since is None:
+        etag, cached = response_cache.lookup(request, ("alerts",))
+        if cached is not None:
+            return cached
+    
+    body = alert_rows_json((await db.execute(alerts_statement(since))).all())
+    if etag is not None:
+        return response_cache.store(etag, body)
+    return json_response(body)
+
+@async_router.get("/api/alerts/new", response_model=List[AlertResponse])
+async def get_new_alerts_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    since: Optional[str] = Query(None, description="ISO timestamp to get alerts after")
+):
+    return json_response(alert_rows_json((await db.execute(new_alerts_statement(since))).all()))
+
+@async_router.get("/api/reports", response_model=ReportPage)
+async def get_reports_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_filter: Optional[ReportStatus] = Query(None, alias="status"),
+    type_filter: Optional[ReportType] = Query(None, alias="type"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    created_by: Optional[int] = None
+):
+    stmt = reports_statement(current_user, cursor, limit, status_filter, type_filter, date_from, date_to, created_by)
+    return json_response(report_page_json((await db.execute(stmt)).all(), limit))
+
+@async_router.post("/api/chatbot/query", response_model=ChatbotResponse)
+async def chatbot_query_async(
+    query: ChatbotQuery,
+    request: Request,
+    current_user: Principal = Depends(get_current_principal)
+):
+    if isinstance(rate_limit_backend, MemoryRateLimitBackend):
+        return answer_chatbot_query(query, request, current_user)
+    # The SQLite rate limit backend does blocking file I/O
+    return await run_in_threadpool(answer_chatbot_query, query, request, current_user)
+
+@async_router.get("/api/stats/dashboard", response_model=DashboardStats)
+async def get_dashboard_stats_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    etag, cached = response_cache.lookup(request, DASHBOARD_CACHE_RESOURCES)
+    if cached is not None:
+        return cached
+    stats = DashboardStats(**await read_counters_async(db))
+    return response_cache.store(etag, stats.model_dump_json().encode("utf-8"))
+
+if ASYNC_DB:
+    app.include_router(async_router)
+
 # Alert Routes
 @app.get("/api/alerts", response_model=List[AlertResponse])
 def get_alerts(
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     since: Optional[datetime] = None
 ):
-    # Use eager loading to avoid N+1 queries
-    query = db.query(Alert).options(joinedload(Alert.creator))
-    
-    # If since parameter is provided, only return alerts created after that time
-    if since:
-        query = query.filter(Alert.created_at > since)
-    
-    alerts = query.order_by(desc(Alert.created_at)).all()
-    result = []
-    for alert in alerts:
-        alert_dict = {
-            "id": alert.id,
-            "type": str(alert.type.value) if hasattr(alert.type, 'value') else str(alert.type),
-            "title": alert.title,
-            "message": alert.message,
-            "priority": alert.priority,
-            "status": alert.status,
-            "created_by": alert.created_by,
-            "created_at": alert.created_at
-        }
-        result.append(add_creator_name(AlertResponse.model_validate(alert_dict).model_dump(), alert.creator.name))
-    return result
+    # The full list is cached per alerts version; 304 / cached body skip the database entirely
+    etag = None
+    if since is None:
+        etag, cached = response_cache.lookup(request, ("alerts",))
+        if cached is not None:
+            return cached
+    
+    body = alert_rows_json(db.execute(alerts_statement(since)).all())
+    if etag is not None:
+        return response_cache.store(etag, body)
+    return json_response(body)
 
 @app.get("/api/alerts/new", response_model=List[AlertResponse])
 def get_new_alerts(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     since: Optional[str] = Query(None, description="ISO timestamp to get alerts after")
 ):
-    """Get alerts created after a specific timestamp (for polling)."""
-    query = db.query(Alert).options(joinedload(Alert.creator)).filter(Alert.status == AlertStatus.ACTIVE)
+    """Get alerts created after a specific timestamp (polling fallback for clients without /api/alerts/stream)."""
+    return json_response(alert_rows_json(db.execute(new_alerts_statement(since)).all()))
+
+# Server-Sent Events stream replacing /api/alerts/new polling
+ALERT_STREAM_KEEPALIVE_SECONDS = 15
+ALERT_STREAM_RETRY_MS = 5000
+
+@app.post("/api/alerts/stream-token", response_model=StreamTokenResponse)
+async def issue_stream_token(current_user: Principal = Depends(get_current_principal)):
+    """Issue a short-lived token that only opens /api/alerts/stream."""
+    return StreamTokenResponse(token=create_stream_token(current_user.id), expires_in=ALERT_STREAM_TOKEN_SECONDS)
+
+@app.get("/api/alerts/stream")
+async def stream_alerts(
+    request: Request,
+    token: str = Query(..., description="Stream token from POST /api/alerts/stream-token (EventSource cannot send an Authorization header)")
+):
+    """Push alert_created / alert_updated events to the browser as they happen."""
+    user_id = decode_access_token(token, ALERT_STREAM_TOKEN_TYPE)
+    # Resolved through the user cache, so the stream never holds a pooled connection while open
+    if await run_in_threadpool(load_principal, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
     
-    if since:
+    async def event_stream():
+        subscriber = alert_hub.subscribe()
+        _, queue = subscriber
         try:
-            # Handle both with and without timezone
-            since_str = since.replace('Z', '+00:00') if since.endswith('Z') else since
-            since_dt = datetime.fromisoformat(since_str)
-            # Ensure timezone aware
-            if since_dt.tzinfo is None:
-                since_dt = since_dt.replace(tzinfo=timezone.utc)
-            query = query.filter(Alert.created_at > since_dt)
-        except (ValueError, AttributeError) as e:
-            # If invalid timestamp, return all active alerts
-            pass
-    
-    alerts = query.order_by(desc(Alert.created_at)).limit(10).all()
-    result = []
-    for alert in alerts:
-        alert_dict = {
-            "id": alert.id,
-            "type": str(alert.type.value) if hasattr(alert.type, 'value') else str(alert.type),
-            "title": alert.title,
-            "message": alert.message,
-            "priority": alert.priority,
-            "status": alert.status,
-            "created_by": alert.created_by,
-            "created_at": alert.created_at
-        }
-        result.append(add_creator_name(AlertResponse.model_validate(alert_dict).model_dump(), alert.creator.name))
-    return result
+            yield f"retry: {ALERT_STREAM_RETRY_MS}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=ALERT_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment frame keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    # Subscriber fell too far behind; the client will reconnect
+                    break
+                yield format_sse(event)
+        finally:
+            alert_hub.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.post("/api/alerts", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
 def create_alert(
     alert_data: AlertCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
 ):
     # Sanitize input
     sanitized_title = sanitize_input(alert_data.title, max_length=255)
@@ -425,12 +1059,12 @@ def create_alert(
     )
     
     db.add(new_alert)
-    
-    # Log action (batch with alert creation)
-    create_system_log(db, "alert_create", current_user.id, f"Created alert: {new_alert.title}")
-    db.commit()  # Single commit for both operations
+    bump_counters(db, alert_deltas(AlertStatus.ACTIVE))
+    db.commit()
     db.refresh(new_alert)
     
+    create_system_log("alert_create", current_user.id, f"Created alert: {new_alert.title}")
+    
     # Convert alert to dict and ensure type is a string
     alert_dict = {
         "id": new_alert.id,
@@ -443,21 +1077,27 @@ def create_alert(
         "created_at": new_alert.created_at
     }
     
-    return add_creator_name(AlertResponse.model_validate(alert_dict).model_dump(), current_user.name)
+    response = add_creator_name(AlertResponse.model_validate(alert_dict).model_dump(), current_user.name)
+    invalidate_cache("alerts")
+    index_search_document("alert", new_alert.id, alert_text(new_alert))
+    alert_hub.publish("alert_created", jsonable_encoder(response))
+    return response
 
 @app.put("/api/alerts/{alert_id}", response_model=AlertResponse)
 def update_alert(
     alert_id: int,
     alert_data: AlertCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
 ):
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
-    if not alert:
+    # The creator's name comes along as a column; the relationship is never loaded
+    row = db.query(Alert, User.name).outerjoin(User, Alert.creator).filter(Alert.id == alert_id).first()
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found"
         )
+    alert, creator_name = row
     
     # Sanitize input
     alert.title = sanitize_input(alert_data.title, max_length=255)
@@ -477,9 +1117,9 @@ def update_alert(
     alert.type = type_mapping.get(alert_type_lower, AlertType.INFO)
     alert.priority = alert_data.priority
     
-    create_system_log(db, "alert_update", current_user.id, f"Updated alert {alert_id}")
     db.commit()
     db.refresh(alert)
+    create_system_log("alert_update", current_user.id, f"Updated alert {alert_id}")
     
     # Convert alert to dict and ensure type is a string
     alert_dict = {
@@ -493,49 +1133,87 @@ def update_alert(
         "created_at": alert.created_at
     }
     
-    return add_creator_name(AlertResponse.model_validate(alert_dict).model_dump(), alert.creator.name)
+    response = add_creator_name(AlertResponse.model_validate(alert_dict).model_dump(), creator_name)
+    invalidate_cache("alerts")
+    index_search_document("alert", alert.id, alert_text(alert))
+    alert_hub.publish("alert_updated", jsonable_encoder(response))
+    return response
 
 @app.delete("/api/alerts/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_alert(
     alert_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
 ):
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    # Locked so a concurrent delete or status change cannot be counted twice
+    alert = db.query(Alert).filter(Alert.id == alert_id).with_for_update().first()
     if not alert:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Alert not found"
         )
     
-    create_system_log(db, "alert_delete", current_user.id, f"Deleted alert {alert_id}")
     db.delete(alert)
+    bump_counters(db, alert_deltas(alert.status, -1))
+    record_tombstones(db, "alert", [(alert_id, None)])
     db.commit()
+    invalidate_cache("alerts")
+    index_search_document("alert", alert_id)
+    create_system_log("alert_delete", current_user.id, f"Deleted alert {alert_id}")
     return None
 
 # Report Routes
-@app.get("/api/reports", response_model=List[ReportResponse])
+@app.get("/api/reports", response_model=ReportPage)
 def get_reports(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_filter: Optional[ReportStatus] = Query(None, alias="status"),
+    type_filter: Optional[ReportType] = Query(None, alias="type"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    created_by: Optional[int] = None
+):
+    """
+    List reports newest first using keyset pagination on (created_at, id).
+    Filtering by status or creator lets MySQL walk idx_report_status_created /
+    idx_report_user_created, so each page costs the same regardless of table size.
+    """
+    stmt = reports_statement(current_user, cursor, limit, status_filter, type_filter, date_from, date_to, created_by)
+    return json_response(report_page_json(db.execute(stmt).all(), limit))
+
+@app.get("/api/reports/export")
+def export_reports(
+    request: Request,
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL])),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    status_filter: Optional[ReportStatus] = Query(None, alias="status"),
+    type_filter: Optional[ReportType] = Query(None, alias="type"),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    created_by: Optional[int] = None
 ):
-    # Use eager loading to avoid N+1 queries
-    query = db.query(Report).options(joinedload(Report.creator))
+    """
+    Every matching report, oldest first, as CSV or NDJSON. Rows are streamed from a server-side
+    cursor in batches (gzip-encoded if accepted), so memory use does not grow with the export.
+    """
+    stmt = select(*REPORT_LIST_COLUMNS).select_from(Report).outerjoin(User, Report.creator)
+    stmt = filter_reports(stmt, current_user, status_filter, type_filter, date_from, date_to, created_by)
+    stmt = stmt.order_by(Report.created_at, Report.id)
     
-    # Residents can only see their own reports
-    if current_user.role == UserRole.RESIDENT:
-        reports = query.filter(Report.created_by == current_user.id).order_by(desc(Report.created_at)).all()
-    else:
-        reports = query.order_by(desc(Report.created_at)).all()
+    create_system_log("report_export", current_user.id, f"Exported reports as {export_format}")
     
-    return [add_creator_name(ReportResponse.model_validate(report).model_dump(), report.creator.name) 
-            for report in reports]
+    filename = f"reports-{datetime.now(timezone.utc):%Y%m%d}.{export_format}"
+    if export_format == "ndjson":
+        return export_response(request, ndjson_rows(stmt, REPORT_ROW_ADAPTER), "application/x-ndjson", filename)
+    return export_response(request, report_csv_rows(stmt), "text/csv; charset=utf-8", filename)
 
 @app.post("/api/reports", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
 def create_report(
     report_data: ReportCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     # Sanitize input
     sanitized_title = sanitize_input(report_data.title, max_length=255)
@@ -551,11 +1229,13 @@ def create_report(
     )
     
     db.add(new_report)
-    
-    # Log action (batch with report creation)
-    create_system_log(db, "report_create", current_user.id, f"Created report: {new_report.title}")
-    db.commit()  # Single commit for both operations
+    bump_counters(db, report_deltas(ReportStatus.PENDING))
+    db.commit()
     db.refresh(new_report)
+    invalidate_cache("reports")
+    index_search_document("report", new_report.id, report_text(new_report), new_report.created_by)
+    
+    create_system_log("report_create", current_user.id, f"Created report: {new_report.title}")
     
     return add_creator_name(ReportResponse.model_validate(new_report).model_dump(), current_user.name)
 
@@ -564,15 +1244,21 @@ def update_report_status(
     report_id: int,
     status_data: ReportStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
-    if not report:
+    # Locked so concurrent status changes compute their counter deltas from the committed status
+    row = (
+        db.query(Report, User.name).outerjoin(User, Report.creator).filter(Report.id == report_id)
+        .with_for_update(of=Report).first()
+    )
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found"
         )
+    report, creator_name = row
     
+    bump_counters(db, report_status_deltas(report.status, status_data.status))
     report.status = status_data.status
     if status_data.status == ReportStatus.RESOLVED:
         report.resolved_at = datetime.now(timezone.utc)
@@ -582,23 +1268,25 @@ def update_report_status(
         sanitized_response = sanitize_input(status_data.official_response, max_length=5000)
         report.official_response = sanitized_response
     
-    # Log action (batch with status update)
+    db.commit()
+    db.refresh(report)
+    invalidate_cache("reports")
+    
     log_details = f"Updated report {report_id} status to {status_data.status.value}"
     if status_data.official_response:
         log_details += " with response"
-    create_system_log(db, "report_status_update", current_user.id, log_details)
-    db.commit()  # Single commit for both operations
-    db.refresh(report)
+    create_system_log("report_status_update", current_user.id, log_details)
     
-    return add_creator_name(ReportResponse.model_validate(report).model_dump(), report.creator.name)
+    return add_creator_name(ReportResponse.model_validate(report).model_dump(), creator_name)
 
 @app.delete("/api/reports/{report_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_report(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    # Locked so a concurrent delete or status change cannot be counted twice
+    report = db.query(Report).filter(Report.id == report_id).with_for_update().first()
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -612,18 +1300,84 @@ def delete_report(
             detail="You can only delete your own reports"
         )
     
-    create_system_log(db, "report_delete", current_user.id, f"Deleted report {report_id}")
     db.delete(report)
+    bump_counters(db, report_deltas(report.status, -1))
+    record_tombstones(db, "report", [(report_id, report.created_by)])
     db.commit()
+    invalidate_cache("reports")
+    index_search_document("report", report_id)
+    create_system_log("report_delete", current_user.id, f"Deleted report {report_id}")
     return None
 
+@app.post("/api/reports/bulk", response_model=ReportBulkResponse)
+def bulk_update_reports(
+    bulk: ReportBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    """
+    Update the status of, or delete, up to MAX_BULK_REPORT_IDS reports in one transaction:
+    one set-based UPDATE/DELETE, one counter update and one commit. Unknown ids come back as not_found.
+    """
+    report_ids = list(dict.fromkeys(bulk.ids))
+    # Lock the rows so the counter deltas match what the statement changes
+    rows = db.execute(
+        select(Report.id, Report.status, Report.created_by).where(Report.id.in_(report_ids)).with_for_update()
+    ).all()
+    statuses = {row.id: row.status for row in rows}
+    found = [report_id for report_id in report_ids if report_id in statuses]
+    
+    if bulk.action == "delete":
+        outcome = "deleted"
+        deltas = combine_deltas(report_deltas(statuses[report_id], -1) for report_id in found)
+        if found:
+            db.execute(delete(Report).where(Report.id.in_(found)))
+            record_tombstones(db, "report", [(row.id, row.created_by) for row in rows])
+    else:
+        outcome = "updated"
+        values = {"status": bulk.status}
+        if bulk.status == ReportStatus.RESOLVED:
+            values["resolved_at"] = datetime.now(timezone.utc)
+        if bulk.official_response is not None:
+            values["official_response"] = sanitize_input(bulk.official_response, max_length=5000)
+        deltas = combine_deltas(report_status_deltas(statuses[report_id], bulk.status) for report_id in found)
+        if found:
+            db.execute(update(Report).where(Report.id.in_(found)).values(**values))
+    
+    bump_counters(db, deltas)
+    db.commit()
+    
+    if found:
+        invalidate_cache("reports")
+        if bulk.action == "delete":
+            remove_search_documents("report", found)
+        # One audit record per report, written by the audit writer in a single batch
+        for report_id in found:
+            if bulk.action == "delete":
+                create_system_log("report_delete", current_user.id, f"Deleted report {report_id} (bulk)")
+            else:
+                details = f"Updated report {report_id} status to {bulk.status.value} (bulk)"
+                if bulk.official_response:
+                    details += " with response"
+                create_system_log("report_status_update", current_user.id, details)
+    
+    return ReportBulkResponse(
+        action=bulk.action,
+        processed=len(found),
+        results=[
+            {"id": report_id, "outcome": outcome if report_id in statuses else "not_found"}
+            for report_id in report_ids
+        ]
+    )
+
 # User Management Routes (Admin only)
 @app.get("/api/users", response_model=List[UserResponse])
 def get_users(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
 ):
-    users = db.query(User).all()
+    # Only the response columns; password hashes never leave the database
+    users = db.execute(select(*USER_LIST_COLUMNS)).all()
     return [UserResponse.model_validate(user) for user in users]
 
 @app.put("/api/users/{user_id}/role", response_model=UserResponse)
@@ -631,36 +1385,39 @@ def update_user_role(
     user_id: int,
     role_data: UserRoleUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    # Locked so concurrent role changes compute their counter deltas from the committed role
+    user = db.query(User).filter(User.id == user_id).with_for_update().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
+    bump_counters(db, user_role_deltas(user.role, role_data.role))
     user.role = role_data.role
+    db.commit()
+    db.refresh(user)
+    invalidate_user(user_id)
+    invalidate_cache("users")
     
-    # Log action (batch with role update)
-    create_system_log(db, "user_role_update", current_user.id, 
+    create_system_log("user_role_update", current_user.id, 
                      f"Updated user {user_id} role to {role_data.role.value}")
-    db.commit()  # Single commit for both operations
-    db.refresh(user)
     
     return UserResponse.model_validate(user)
 
 @app.put("/api/users/{user_id}/password", response_model=UserResponse)
-def reset_user_password(
+async def reset_user_password(
     user_id: int,
     password_data: UserPasswordReset,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
 ):
     """
     Reset password for a user. Admin only.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.id == user_id).first())
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -668,237 +1425,321 @@ def reset_user_password(
         )
     
     # Hash the new password
-    hashed_password = hash_password(password_data.new_password)
-    user.password_hash = hashed_password
+    hashed_password = await hash_password(password_data.new_password)
+    
+    def save_password():
+        user.password_hash = hashed_password
+        db.commit()
+        db.refresh(user)
     
-    # Log action (batch with password update)
-    create_system_log(db, "user_password_reset", current_user.id, 
+    await run_in_threadpool(save_password)
+    invalidate_user(user_id)
+    
+    create_system_log("user_password_reset", current_user.id, 
                      f"Reset password for user {user_id} ({user.email})")
-    db.commit()  # Single commit for both operations
-    db.refresh(user)
     
     return UserResponse.model_validate(user)
 
-# Chatbot Rule Engine
-def get_chatbot_response(message: str) -> str:
-    """Rule-based chatbot that matches keywords and patterns to provide responses."""
-    message_lower = message.lower().strip()
-    
-    # Rule definitions: (keywords, response)
-    rules = [
-        # Office hours
-        (['oras', 'hours', 'open', 'close', 'bukas', 'sara', 'office time', 'orasan'], 
-         "Ang barangay office ay bukas mula Lunes hanggang Biyernes, 8:00 AM - 5:00 PM. "
-         "Para sa emergency, maaari kayong tumawag sa hotline: (02) 123-4567."),
-        
-        # How to report
-        (['report', 'mag-report', 'paano mag-report', 'how to report', 'submit report', 'ireport', 'i-report'],
-         "Para mag-submit ng report:\n"
-         "1. Pumunta sa 'Report' sa menu\n"
-         "2. Piliin ang uri ng problema (Emergency, Crime, Infrastructure, etc.)\n"
-         "3. Ilagay ang detalye ng problema\n"
-         "4. Maglagay ng lokasyon kung saan nangyari\n"
-         "5. I-click ang 'Send Report'\n\n"
-         "Para sa emergency, maaari din kayong tumawag sa barangay hotline."),
-        
-        # Alert types
-        (['alert', 'alerts', 'uri ng alert', 'types of alert', 'anong alert', 'what alerts'],
-         "May apat na uri ng alerts:\n"
-         "• Emergency - Para sa mga emergency na sitwasyon\n"
-         "• Announcement - Mga anunsyo mula sa barangay\n"
-         "• Warning - Mga babala at paalala\n"
-         "• Info - Pangkalahatang impormasyon\n\n"
-         "Makikita ninyo ang lahat ng alerts sa 'Alerts' page."),
-        
-        # Emergency
-        (['emergency', 'emergency report', 'sakuna', 'sunog', 'baha', 'aksidente', 'urgent'],
-         "Para sa emergency:\n"
-         "1. Tumawag agad sa barangay hotline: (02) 123-4567\n"
-         "2. O mag-submit ng emergency report sa app\n"
-         "3. Para sa life-threatening emergencies, tumawag sa 911\n\n"
-         "Ang emergency reports ay inuuna namin at may mabilis na response."),
-        
-        # Services
-        (['service', 'services', 'serbisyo', 'ano ang serbisyo', 'what services', 'available services'],
-         "Mga serbisyo ng barangay:\n"
-         "• Emergency Response\n"
-         "• Report Management\n"
-         "• Community Alerts\n"
-         "• Public Information\n"
-         "• Complaint Handling\n"
-         "• Infrastructure Requests\n\n"
-         "Para sa karagdagang impormasyon, bisitahin ang barangay hall."),
-        
-        # Status check
-        (['status', 'check status', 'report status', 'ano na ang report', 'update', 'update ng report'],
-         "Para makita ang status ng inyong report:\n"
-         "1. Pumunta sa 'My Reports' sa menu\n"
-         "2. Makikita ninyo ang lahat ng inyong reports\n"
-         "3. Ang status ay maaaring: Pending, In Progress, Resolved, o Rejected\n"
-         "4. Makikita din ninyo ang response mula sa barangay officials kung mayroon."),
-        
-        # Contact
-        (['contact', 'tawag', 'phone', 'number', 'telepono', 'paano makipag-ugnayan', 'how to contact'],
-         "Para makipag-ugnayan sa barangay:\n"
-         "• Hotline: (02) 123-4567\n"
-         "• Email: info@brgykorokan.gov.ph\n"
-         "• Address: Barangay Hall, Zone 1, Barangay Korokan\n"
-         "• Office Hours: Lunes-Biyernes, 8:00 AM - 5:00 PM"),
-        
-        # Registration
-        (['register', 'sign up', 'mag-register', 'paano mag-register', 'account', 'gumawa ng account'],
-         "Para mag-register:\n"
-         "1. Pumunta sa 'Register' page\n"
-         "2. Ilagay ang inyong email, pangalan, at password\n"
-         "3. Piliin ang inyong role (Resident, Official, o Admin)\n"
-         "4. I-click ang 'Register'\n\n"
-         "Kailangan ng password na may hindi bababa sa 8 characters, may uppercase, lowercase, at number."),
-        
-        # Greeting
-        (['hello', 'hi', 'kamusta', 'kumusta', 'magandang araw', 'good morning', 'good afternoon', 'good evening'],
-         "Magandang araw! Ako si BarangayBot, ang inyong AI assistant. Paano ko kayo matutulungan ngayon?"),
-        
-        # Help
-        (['help', 'tulong', 'paano', 'how', 'help me', 'tulungan'],
-         "Ako ay nandito para tumulong! Maaari ninyo akong tanungin tungkol sa:\n"
-         "• Oras ng barangay office\n"
-         "• Paano mag-submit ng report\n"
-         "• Mga uri ng alerts\n"
-         "• Status ng inyong reports\n"
-         "• Mga serbisyo ng barangay\n"
-         "• Emergency procedures\n\n"
-         "Ano ang gusto ninyong malaman?"),
-    ]
-    
-    # Check each rule
-    for keywords, response in rules:
-        if any(keyword in message_lower for keyword in keywords):
-            return response
-    
-    # Default response if no rule matches
-    default_responses = [
-        "Pasensya, hindi ko lubos na naintindihan ang inyong tanong. Maaari ba ninyong magtanong tungkol sa:\n"
-        "• Oras ng barangay office\n"
-        "• Paano mag-report\n"
-        "• Mga uri ng alerts\n"
-        "• Status ng reports\n\n"
-        "O subukan ninyong magtanong sa ibang paraan.",
-        
-        "Ako ay nandito para tumulong sa inyong mga katanungan tungkol sa barangay. "
-        "Maaari ba ninyong magtanong tungkol sa office hours, reports, alerts, o serbisyo?",
-        
-        "Para sa mas tiyak na impormasyon, maaari ninyong:\n"
-        "• Bisitahin ang 'Alerts' page para sa mga anunsyo\n"
-        "• Gumawa ng report sa 'Report' page\n"
-        "• Tumawag sa barangay hotline: (02) 123-4567",
-    ]
-    
-    return random.choice(default_responses)
+# Search Route
+@app.get("/api/search", response_model=SearchPage)
+def search_documents(
+    q: str = Query(..., min_length=2, max_length=200),
+    kind: Optional[str] = Query(None, pattern="^(report|alert)$"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Relevance-ranked search over report title/description/location and alert title/message.
+    Residents only see their own reports, as in GET /api/reports.
+    """
+    owner = current_user.id if current_user.role == UserRole.RESIDENT else None
+    kinds = (kind,) if kind else SEARCH_KINDS
+    hits, has_more = search_index.search(db, q, kinds, owner, limit, offset)
+    
+    # Load the page's rows in one query per kind
+    report_ids = [doc_id for _, hit_kind, doc_id in hits if hit_kind == "report"]
+    alert_ids = [doc_id for _, hit_kind, doc_id in hits if hit_kind == "alert"]
+    reports = {}
+    if report_ids:
+        stmt = select(*REPORT_LIST_COLUMNS).select_from(Report).outerjoin(User, Report.creator)
+        for row in db.execute(stmt.where(Report.id.in_(report_ids))):
+            reports[row.id] = row._asdict()
+    alerts = {}
+    if alert_ids:
+        stmt = select(*ALERT_LIST_COLUMNS).select_from(Alert).outerjoin(User, Alert.creator)
+        for row in db.execute(stmt.where(Alert.id.in_(alert_ids))):
+            alerts[row.id] = row._asdict()
+    
+    items = []
+    for score, hit_kind, doc_id in hits:
+        document = reports.get(doc_id) if hit_kind == "report" else alerts.get(doc_id)
+        # Skip rows deleted between ranking and loading
+        if document is not None:
+            items.append(SearchHit(kind=hit_kind, id=doc_id, score=round(score, 4), **{hit_kind: document}))
+    
+    return SearchPage(items=items, next_offset=offset + limit if has_more else None)
+
+# Sync Route
+@app.get("/api/sync", response_model=SyncPage)
+def sync_changes(
+    token: Optional[str] = None,
+    kind: Optional[str] = Query(None, pattern="^(report|alert)$"),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=MAX_SYNC_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Reports and alerts created, updated or deleted since `token` (omit it the first time).
+    Call again with the returned token while has_more is true. reset=true means the client must
+    drop its local copy before applying the page. Residents only receive their own reports.
+    """
+    now = datetime.now(timezone.utc)
+    reset = True
+    if token:
+        try:
+            positions, issued_at, token_kind = decode_token(token)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        reset = token_kind != kind or is_expired(issued_at, now)
+    if reset:
+        # Start over; deletions from before now do not concern a client with nothing stored
+        positions = dict.fromkeys(SYNC_STREAMS)
+        positions["deleted"] = latest_tombstone_position(db)
+    
+    owner = current_user.id if current_user.role == UserRole.RESIDENT else None
+    page = {"reset": reset, "alerts": [], "reports": [], "deleted": {"alerts": [], "reports": []}}
+    more = []
+    if kind in (None, "alert"):
+        rows = db.execute(alert_changes_statement(positions["alerts"]).limit(limit + 1)).all()
+        positions["alerts"], has_more = next_position(rows, positions["alerts"], limit)
+        page["alerts"] = [row._asdict() for row in rows[:limit]]
+        more.append(has_more)
+    if kind in (None, "report"):
+        rows = db.execute(report_changes_statement(positions["reports"], owner).limit(limit + 1)).all()
+        positions["reports"], has_more = next_position(rows, positions["reports"], limit)
+        page["reports"] = [row._asdict() for row in rows[:limit]]
+        more.append(has_more)
+    rows = db.execute(tombstones_statement(positions["deleted"], kind, owner, limit)).all()
+    positions["deleted"], has_more = next_position(rows, positions["deleted"], limit)
+    for row in rows[:limit]:
+        page["deleted"][row.kind + "s"].append(row.object_id)
+    more.append(has_more)
+    
+    page["has_more"] = any(more)
+    page["token"] = encode_token(positions, now, kind)
+    return json_response(SYNC_PAGE_ADAPTER.dump_json(page))
 
 # Chatbot Route
 @app.post("/api/chatbot/query", response_model=ChatbotResponse)
 def chatbot_query(
     query: ChatbotQuery,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    current_user: Principal = Depends(get_current_principal)
 ):
-    # Sanitize input
-    sanitized_message = sanitize_input(query.message, max_length=1000)
-    
-    # Get rule-based response
-    response_text = get_chatbot_response(sanitized_message)
-    
-    # Log action
-    create_system_log(db, "chatbot_query", current_user.id, f"Chatbot query: {sanitized_message[:50]}")
-    db.commit()
-    
-    return ChatbotResponse(
-        response=response_text,
-        session_id=query.session_id or f"session_{datetime.now(timezone.utc).timestamp()}"
-    )
+    return answer_chatbot_query(query, request, current_user)
 
-# Dashboard Stats Route - Optimized with single query
+# Dashboard Stats Route - served from materialized counters
 @app.get("/api/stats/dashboard", response_model=DashboardStats)
 def get_dashboard_stats(
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
-):
-    # Optimized: Get all stats in fewer queries using CASE statements
-    # Single query for report stats
-    report_stats = db.query(
-        func.count(Report.id).label('total'),
-        func.sum(case((Report.status == ReportStatus.PENDING, 1), else_=0)).label('pending'),
-        func.sum(case((Report.status == ReportStatus.RESOLVED, 1), else_=0)).label('resolved')
-    ).first()
-    
-    # Single query for alert stats
-    active_alerts = db.query(func.count(Alert.id)).filter(Alert.status == AlertStatus.ACTIVE).scalar() or 0
-    
-    # Single query for user stats
-    user_stats = db.query(
-        func.count(User.id).label('total'),
-        func.sum(case((User.role == UserRole.RESIDENT, 1), else_=0)).label('residents'),
-        func.sum(case((User.role == UserRole.OFFICIAL, 1), else_=0)).label('officials')
-    ).first()
-    
-    return DashboardStats(
-        total_reports=report_stats.total or 0,
-        pending_reports=int(report_stats.pending or 0),
-        resolved_reports=int(report_stats.resolved or 0),
-        active_alerts=active_alerts,
-        total_users=user_stats.total or 0,
-        residents=int(user_stats.residents or 0),
-        officials=int(user_stats.officials or 0)
-    )
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    # O(1): the counters are kept current by the write handlers and reconciled periodically
+    etag, cached = response_cache.lookup(request, DASHBOARD_CACHE_RESOURCES)
+    if cached is not None:
+        return cached
+    stats = DashboardStats(**read_counters(db))
+    return response_cache.store(etag, stats.model_dump_json().encode("utf-8"))
+
+@app.post("/api/stats/reconcile", response_model=DashboardStats)
+def reconcile_dashboard_stats(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Recompute the dashboard counters from the source tables now."""
+    values = counter_reconciler.run_once()
+    invalidate_cache("stats")
+    return DashboardStats(**values)
+
+# Analytics Routes - aggregated in the database for Analytics.js
+ANALYTICS_BUCKET_PATTERN = "^(day|week|month)$"
+
+@app.get("/api/stats/analytics/reports", response_model=ReportAnalytics)
+def get_report_analytics(
+    bucket: str = Query("day", pattern=ANALYTICS_BUCKET_PATTERN),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    """Report counts per time bucket by type and by status."""
+    return {
+        "bucket": bucket,
+        "by_type": bucketed_counts(db, Report, Report.type, bucket, date_from, date_to),
+        "by_status": bucketed_counts(db, Report, Report.status, bucket, date_from, date_to)
+    }
+
+@app.get("/api/stats/analytics/alerts", response_model=AlertAnalytics)
+def get_alert_analytics(
+    bucket: str = Query("day", pattern=ANALYTICS_BUCKET_PATTERN),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    """Alert counts per time bucket by type and by priority."""
+    return {
+        "bucket": bucket,
+        "by_type": bucketed_counts(db, Alert, Alert.type, bucket, date_from, date_to),
+        "by_priority": bucketed_counts(db, Alert, Alert.priority, bucket, date_from, date_to)
+    }
+
+@app.get("/api/stats/analytics/users", response_model=UserAnalytics)
+def get_user_analytics(
+    bucket: str = Query("month", pattern=ANALYTICS_BUCKET_PATTERN),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    """User registrations per time bucket by role."""
+    return {
+        "bucket": bucket,
+        "registrations_by_role": bucketed_counts(db, User, User.role, bucket, date_from, date_to)
+    }
+
+@app.get("/api/stats/analytics/resolution", response_model=ResolutionTimeStats)
+def get_resolution_analytics(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_role([UserRole.ADMIN, UserRole.OFFICIAL]))
+):
+    """Average and percentile time from report creation to resolution, in hours."""
+    return duration_percentiles(db, Report, Report.created_at, Report.resolved_at, date_from, date_to)
 
 # System Logs Route
-@app.get("/api/logs", response_model=List[SystemLogResponse])
+@app.get("/api/logs", response_model=SystemLogPage)
 def get_logs(
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN])),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    action: Optional[str] = None,
+    user_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson)$")
 ):
-    try:
-        # Get logs ordered by timestamp
-        logs = db.query(SystemLog).order_by(desc(SystemLog.timestamp)).limit(100).all()
-        
-        # Get all user IDs that exist in logs
-        user_ids = [log.user_id for log in logs if log.user_id]
-        
-        # Load all users in one query if there are any
-        users_dict = {}
-        if user_ids:
-            users = db.query(User).filter(User.id.in_(user_ids)).all()
-            users_dict = {user.id: user.name for user in users}
-        
-        # Build response
-        result = []
-        for log in logs:
-            # Manually construct the response dict to avoid Pydantic validation issues
-            # with the user relationship (which is a User object, not a string)
-            log_dict = {
-                'id': log.id,
-                'action': log.action,
-                'user': users_dict.get(log.user_id, "System") if log.user_id else "System",
-                'details': log.details,
-                'timestamp': log.timestamp
-            }
-            result.append(SystemLogResponse(**log_dict))
-        
-        return result
-    except Exception as e:
-        print(f"Error fetching logs: {e}")
-        import traceback
-        traceback.print_exc()
+    """
+    List system logs newest first using keyset pagination on (timestamp, id), walking
+    idx_log_timestamp_action (or idx_log_user_timestamp for one user). format=ndjson streams
+    every matching row from the cursor on, one JSON object per line, instead of a page.
+    """
+    stmt = logs_statement(cursor, action, user_id, date_from, date_to)
+    if export_format == "ndjson":
+        return export_response(request, ndjson_rows(stmt, LOG_ROW_ADAPTER), "application/x-ndjson", "system_logs.ndjson")
+    
+    # The unfiltered first page is versioned by audit writer flushes (and user renames/registrations)
+    etag = None
+    if cursor is None and action is None and user_id is None and date_from is None and date_to is None:
+        etag, cached = response_cache.lookup(request, ("logs", "users"), variant=str(limit))
+        if cached is not None:
+            return cached
+    
+    body = log_page_json(db.execute(stmt.limit(limit + 1)).all(), limit)
+    if etag is not None:
+        return response_cache.store(etag, body)
+    return json_response(body)
+
+@app.get("/api/logs/audit-stats")
+def get_audit_stats(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Counters for the background audit writer (queued, flushed, dropped, failed, pending)."""
+    return audit_log.stats()
+
+@app.get("/api/logs/retention")
+def get_log_retention(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Retention policy for system_logs and the result of this worker's last retention pass."""
+    return {**log_retention.policy(), "last_run": log_retention.last_run}
+
+@app.get("/api/metrics/db")
+def get_db_metrics(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Connection pool gauges, checkout wait and pre-ping latency, invalidations and disconnects per engine."""
+    return db_metrics.snapshot()
+
+@app.get("/api/metrics/routes")
+def get_route_metrics(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Per-route request count, p50/p95/p99 latency and mean queries per request for this worker."""
+    return metrics_registry.route_summary()
+
+@app.get("/api/profiles")
+def list_profiles(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Captured request profiles, newest first. Send "X-Profile: 1" as an admin to capture one."""
+    return request_profiler.store.list()
+
+@app.get("/api/profiles/{profile_id}")
+def get_profile(
+    profile_id: str,
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """One capture: SQL statements with timings and the most expensive functions."""
+    record = request_profiler.store.get(profile_id)
+    if record is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error fetching logs: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
         )
+    return record
+
+@app.get("/api/profiles/{profile_id}/pstats")
+def download_profile(
+    profile_id: str,
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Raw cProfile dump, for snakeviz or python -m pstats."""
+    path = request_profiler.store.pstats_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No call profile for this capture"
+        )
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+@app.delete("/api/profiles")
+def clear_profiles(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    removed = request_profiler.store.clear()
+    return {"message": f"Removed {removed} profiles"}
+
+@app.get("/api/cache/stats")
+def get_cache_stats(
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
+):
+    """Response cache hits, misses, 304s and resource versions for this worker."""
+    return response_cache.stats()
 
 # Seed Data Route (for development)
 @app.post("/api/seed")
 def seed_data(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_role([UserRole.ADMIN]))
+    current_user: Principal = Depends(require_role([UserRole.ADMIN]))
 ):
     # Create demo alerts
     alert1 = Alert(
@@ -938,11 +1779,36 @@ def seed_data(
         )
         db.add(report1)
         db.add(report2)
+        bump_counters(db, {"total_reports": 2, "pending_reports": 1})
     
+    bump_counters(db, {"active_alerts": 2})
     db.commit()
+    invalidate_cache("alerts", "reports", "users")
+    for alert in (alert1, alert2):
+        index_search_document("alert", alert.id, alert_text(alert))
+    if resident:
+        for report in (report1, report2):
+            index_search_document("report", report.id, report_text(report), report.created_by)
     
     return {"message": "Demo data loaded successfully"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Prometheus scrape endpoint; requires METRICS_TOKEN, or an admin token when none is configured."""
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        if not hmac.compare_digest(supplied.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid metrics token"
+            )
+    elif not await is_admin_request(request):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Admin token required (or set METRICS_TOKEN)"
+        )
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def root():
     return {"message": "AndreaBrgy API is running"}
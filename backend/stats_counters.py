@@ -0,0 +1,232 @@
+"""
+Materialized dashboard counters
+Write handlers apply deltas in their own transaction; a periodic reconciliation recomputes from the source tables
+"""
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func, case, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import StatsCounter, Report, Alert, User, ReportStatus, AlertStatus, UserRole
+
+STATS_RECONCILE_INTERVAL_SECONDS = int(os.getenv('STATS_RECONCILE_INTERVAL_SECONDS', '900'))
+
+COUNTER_NAMES = (
+    "total_reports",
+    "pending_reports",
+    "resolved_reports",
+    "active_alerts",
+    "total_users",
+    "residents",
+    "officials",
+)
+
+_REPORT_STATUS_COUNTERS = {
+    ReportStatus.PENDING: "pending_reports",
+    ReportStatus.RESOLVED: "resolved_reports",
+}
+_USER_ROLE_COUNTERS = {
+    UserRole.RESIDENT: "residents",
+    UserRole.OFFICIAL: "officials",
+}
+
+
+def _add(deltas: Dict[str, int], name: Optional[str], amount: int) -> Dict[str, int]:
+    if name:
+        deltas[name] = deltas.get(name, 0) + amount
+    return deltas
+
+
+def report_deltas(report_status, sign: int = 1) -> Dict[str, int]:
+    """Deltas for creating (sign=1) or deleting (sign=-1) a report in the given status."""
+    deltas = {"total_reports": sign}
+    return _add(deltas, _REPORT_STATUS_COUNTERS.get(report_status), sign)
+
+
+def report_status_deltas(old_status, new_status) -> Dict[str, int]:
+    deltas: Dict[str, int] = {}
+    if old_status != new_status:
+        _add(deltas, _REPORT_STATUS_COUNTERS.get(old_status), -1)
+        _add(deltas, _REPORT_STATUS_COUNTERS.get(new_status), 1)
+    return deltas
+
+
+def alert_deltas(alert_status, sign: int = 1) -> Dict[str, int]:
+    return {"active_alerts": sign} if alert_status == AlertStatus.ACTIVE else {}
+
+
+def user_deltas(role, sign: int = 1) -> Dict[str, int]:
+    deltas = {"total_users": sign}
+    return _add(deltas, _USER_ROLE_COUNTERS.get(role), sign)
+
+
+def user_role_deltas(old_role, new_role) -> Dict[str, int]:
+    deltas: Dict[str, int] = {}
+    if old_role != new_role:
+        _add(deltas, _USER_ROLE_COUNTERS.get(old_role), -1)
+        _add(deltas, _USER_ROLE_COUNTERS.get(new_role), 1)
+    return deltas
+
+
+def combine_deltas(deltas_list: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Sum per-row deltas so a bulk write bumps each counter once."""
+    combined: Dict[str, int] = {}
+    for deltas in deltas_list:
+        for name, amount in deltas.items():
+            _add(combined, name, amount)
+    return combined
+
+
+def bump_counters(db: Session, deltas: Dict[str, int]) -> None:
+    """
+    Apply deltas as atomic `value = value + delta` updates in the caller's transaction.
+    Rows are touched in a fixed order so concurrent writers cannot deadlock on them.
+    """
+    for name in sorted(deltas):
+        if deltas[name]:
+            db.execute(
+                update(StatsCounter)
+                .where(StatsCounter.name == name)
+                .values(value=StatsCounter.value + deltas[name])
+            )
+
+
+_READ_COUNTERS = select(StatsCounter.name, StatsCounter.value).where(StatsCounter.name.in_(COUNTER_NAMES))
+
+
+def _counter_values(rows) -> Dict[str, int]:
+    values = {name: 0 for name in COUNTER_NAMES}
+    for name, value in rows:
+        values[name] = int(value or 0)
+    return values
+
+
+def read_counters(db: Session) -> Dict[str, int]:
+    """All counters in one primary-key lookup."""
+    return _counter_values(db.execute(_READ_COUNTERS))
+
+
+async def read_counters_async(db: AsyncSession) -> Dict[str, int]:
+    """read_counters() for an AsyncSession."""
+    return _counter_values(await db.execute(_READ_COUNTERS))
+
+
+def compute_counters(db: Session) -> Dict[str, int]:
+    """Recompute every counter from the source tables (three aggregate scans)."""
+    report_stats = db.query(
+        func.count(Report.id).label('total'),
+        func.sum(case((Report.status == ReportStatus.PENDING, 1), else_=0)).label('pending'),
+        func.sum(case((Report.status == ReportStatus.RESOLVED, 1), else_=0)).label('resolved')
+    ).first()
+    active_alerts = db.query(func.count(Alert.id)).filter(Alert.status == AlertStatus.ACTIVE).scalar() or 0
+    user_stats = db.query(
+        func.count(User.id).label('total'),
+        func.sum(case((User.role == UserRole.RESIDENT, 1), else_=0)).label('residents'),
+        func.sum(case((User.role == UserRole.OFFICIAL, 1), else_=0)).label('officials')
+    ).first()
+    return {
+        "total_reports": report_stats.total or 0,
+        "pending_reports": int(report_stats.pending or 0),
+        "resolved_reports": int(report_stats.resolved or 0),
+        "active_alerts": active_alerts,
+        "total_users": user_stats.total or 0,
+        "residents": int(user_stats.residents or 0),
+        "officials": int(user_stats.officials or 0),
+    }
+
+
+def seed_counter_rows(db: Session) -> set:
+    """
+    Create missing counter rows (at 0) and commit; returns the names this call created.
+    Workers starting together on a fresh database all get here, so duplicates are ignored
+    rather than failing on the primary key.
+    """
+    present = set(db.execute(select(StatsCounter.name).where(StatsCounter.name.in_(COUNTER_NAMES))).scalars())
+    missing = [name for name in COUNTER_NAMES if name not in present]
+    if not missing:
+        return set()
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = insert(StatsCounter).prefix_with("IGNORE")
+    else:
+        stmt = sqlite_insert(StatsCounter).on_conflict_do_nothing(index_elements=["name"])
+    db.execute(stmt, [{"name": name, "value": 0} for name in missing])
+    db.commit()
+    return set(missing)
+
+
+def reconcile_counters(db: Session) -> Dict[str, int]:
+    """
+    Overwrite the counters with freshly computed values and commit.
+
+    The counter rows are locked first, so writers that bump them wait for us;
+    anything committed before the lock is included in the recount, and anything
+    after applies its delta on top of it.
+    """
+    seeded = seed_counter_rows(db)
+    existing = {
+        row.name: row
+        for row in db.query(StatsCounter).filter(StatsCounter.name.in_(COUNTER_NAMES))
+        .order_by(StatsCounter.name).with_for_update()
+    }
+    values = compute_counters(db)
+    drift = {}
+    for name in COUNTER_NAMES:
+        row = existing[name]
+        if row.value != values[name]:
+            # A row created just now starts at 0; that is not drift
+            if name not in seeded:
+                drift[name] = values[name] - row.value
+            row.value = values[name]
+    db.commit()
+    if drift:
+        print(f"Stats counters reconciled with drift: {drift}")
+    return values
+
+
+class CounterReconciler:
+    """Background thread that periodically reconciles the counters."""
+
+    def __init__(self, interval_seconds: int = STATS_RECONCILE_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict[str, int]:
+        db = SessionLocal()
+        try:
+            return reconcile_counters(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """Warm the counters synchronously, then keep reconciling in the background."""
+        self.run_once()
+        if self._thread is None and self.interval_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="stats-reconciler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Stats counter reconciliation failed: {e}")
+
+
+counter_reconciler = CounterReconciler()
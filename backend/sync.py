@@ -0,0 +1,135 @@
+"""
+Incremental sync for reports and alerts
+Clients keep an opaque change token and fetch only the rows created, updated or deleted since it,
+instead of re-downloading the lists. Deletes are recorded as tombstones in sync_tombstones.
+
+Rows are walked in (coalesce(updated_at, created_at), id) order. Once a client has caught up, its
+position is moved back by SYNC_OVERLAP_SECONDS, so a row stamped before the client's last sync but
+committed after it is still delivered; clients apply rows as upserts, so repeats are harmless.
+"""
+import base64
+import binascii
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, desc, func, insert, or_, select, true
+from sqlalchemy.orm import Session
+
+from models import SyncTombstone
+
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+MAX_SYNC_PAGE_SIZE = 2000
+SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', '30'))
+# Tombstones older than this are pruned; tokens issued before then get a full resync
+SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', '30'))
+
+STREAMS = ("alerts", "reports", "deleted")
+
+Position = Optional[Tuple[datetime, int]]
+
+
+def changed_at(model):
+    """When a row last changed; matches the idx_*_changed expression indexes."""
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+def encode_token(positions: Dict[str, Position], issued_at: datetime, kind: Optional[str]) -> str:
+    payload = {
+        "i": issued_at.isoformat(),
+        # A token only covers the kinds it was issued for
+        "k": kind,
+        "p": {name: [pos[0].isoformat(), pos[1]] if pos else None for name, pos in positions.items()},
+    }
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> Tuple[Dict[str, Position], datetime, Optional[str]]:
+    """Positions per stream, issue time and kind of a token. Raises ValueError if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        positions = {}
+        for name in STREAMS:
+            pos = payload["p"].get(name)
+            positions[name] = (datetime.fromisoformat(pos[0]), int(pos[1])) if pos else None
+        issued_at = datetime.fromisoformat(payload["i"])
+        kind = payload["k"]
+    except (KeyError, TypeError, IndexError, AttributeError, json.JSONDecodeError, UnicodeError, binascii.Error) as e:
+        raise ValueError(f"Invalid sync token: {e}")
+    if issued_at.tzinfo is None:
+        issued_at = issued_at.replace(tzinfo=timezone.utc)
+    return positions, issued_at, kind
+
+
+def is_expired(issued_at: datetime, now: datetime) -> bool:
+    """Tombstones the token still needs may have been pruned."""
+    return issued_at < now - timedelta(days=SYNC_TOMBSTONE_DAYS) + timedelta(seconds=SYNC_OVERLAP_SECONDS)
+
+
+def after(sort_column, id_column, position: Position):
+    """
+    WHERE clause for rows past a stream position in (sort_column, id_column) order; None selects
+    everything. Ties are matched as "within a microsecond" rather than with equality, because SQLite
+    stores server-default timestamps without fractional seconds and compares them as text.
+    """
+    if position is None:
+        return true()
+    sort_value, row_id = position
+    # The leading range lets MySQL and SQLite seek the (changed, id) index
+    return and_(
+        sort_column > sort_value - timedelta(microseconds=1),
+        or_(sort_column > sort_value, id_column > row_id),
+    )
+
+
+def next_position(rows: List, position: Position, limit: int) -> Tuple[Position, bool]:
+    """
+    Position to store after delivering rows (selected with limit + 1), and whether more are waiting.
+    Each row's first element must be its change time.
+    """
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return (last[0], last.id), True
+    if rows:
+        # Caught up: step back so late-committing changes are picked up on the next sync
+        return (rows[-1][0] - timedelta(seconds=SYNC_OVERLAP_SECONDS), 0), False
+    return position, False
+
+
+def latest_tombstone_position(db: Session) -> Position:
+    """Where a client starting from scratch begins the deleted stream: it has nothing to delete yet."""
+    row = db.execute(
+        select(SyncTombstone.deleted_at, SyncTombstone.id)
+        .order_by(desc(SyncTombstone.deleted_at), desc(SyncTombstone.id)).limit(1)
+    ).first()
+    if row is None:
+        return None
+    return row.deleted_at - timedelta(seconds=SYNC_OVERLAP_SECONDS), 0
+
+
+def tombstones_statement(position: Position, kind: Optional[str], owner: Optional[int], limit: int):
+    stmt = select(SyncTombstone.deleted_at, SyncTombstone.id, SyncTombstone.kind, SyncTombstone.object_id)
+    stmt = stmt.where(after(SyncTombstone.deleted_at, SyncTombstone.id, position))
+    if kind is not None:
+        stmt = stmt.where(SyncTombstone.kind == kind)
+    if owner is not None:
+        # Residents see every alert but only their own reports
+        stmt = stmt.where((SyncTombstone.kind == "alert") | (SyncTombstone.owner_id == owner))
+    return stmt.order_by(SyncTombstone.deleted_at, SyncTombstone.id).limit(limit + 1)
+
+
+def record_tombstones(db: Session, kind: str, deleted: List[Tuple[int, Optional[int]]]) -> None:
+    """
+    Record deleted (object_id, owner_id) pairs in the caller's transaction, and prune tombstones
+    past retention while at it (an indexed range delete; deletes are rare).
+    """
+    if not deleted:
+        return
+    db.execute(insert(SyncTombstone), [
+        {"kind": kind, "object_id": object_id, "owner_id": owner_id} for object_id, owner_id in deleted
+    ])
+    horizon = datetime.now(timezone.utc) - timedelta(days=SYNC_TOMBSTONE_DAYS)
+    db.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < horizon))
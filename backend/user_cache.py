@@ -0,0 +1,74 @@
+"""
+Bounded TTL cache of authenticated principals
+Lets authenticated requests skip the per-request users lookup; writes that change a user invalidate its entry
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from models import UserRole
+
+USER_CACHE_TTL_SECONDS = float(os.getenv('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', '10000'))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller: just what handlers need for authorization and attribution."""
+    id: int
+    email: str
+    name: str
+    role: UserRole
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(id=user.id, email=user.email, name=user.name, role=user.role)
+
+
+class UserCache:
+    """
+    LRU cache with per-entry expiry.
+
+    Invalidation is process-local; server.invalidate_user broadcasts it to the
+    other workers over the alert hub.
+    """
+
+    def __init__(self, max_entries: int = USER_CACHE_MAX_ENTRIES, ttl_seconds: float = USER_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= now:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, principal: Principal) -> None:
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
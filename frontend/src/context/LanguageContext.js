@@ -41,6 +41,7 @@ const translations = {
     noAlerts: 'No alerts yet',
     loadDemoData: 'Load Demo Data',
     myReportsDesc: 'View your submitted reports',
+    loadMore: 'Load more',
     dashboardOverview: 'Dashboard Overview',
     totalUsers: 'Total Users',
     pending: 'Pending',
@@ -176,6 +177,7 @@ const translations = {
     noAlerts: 'Wala pang mga abiso',
     loadDemoData: 'I-load ang Demo Data',
     myReportsDesc: 'Tingnan ang iyong mga na-submit',
+    loadMore: 'Magpakita pa',
     dashboardOverview: 'Dashboard Overview',
     totalUsers: 'Kabuuang Users',
     pending: 'Naghihintay',
@@ -2,9 +2,13 @@ import { useEffect, useRef, useState } from 'react';
 import { alertsAPI } from '../lib/api';
 import { toast } from 'sonner';
 
+// Matches the retry interval the server sends on the stream
+const STREAM_RECONNECT_MS = 5000;
+const STREAM_MAX_FAILURES = 3;
+
 /**
  * Hook for real-time alert notifications
- * Polls for new alerts and shows browser notifications
+ * Listens on the alert stream (polling if unavailable) and shows browser notifications
  */
 export function useNotifications(enabled = true) {
   const [newAlertsCount, setNewAlertsCount] = useState(0);
@@ -24,63 +28,63 @@ export function useNotifications(enabled = true) {
     }
   }, []);
 
-  // Poll for new alerts
+  // Receive new alerts: server push when available, polling as a fallback
   useEffect(() => {
     if (!enabled) return;
 
+    const showAlerts = (newAlerts) => {
+      // Filter out alerts that have already been shown
+      const unseenAlerts = newAlerts.filter(alert => {
+        if (shownAlertIdsRef.current.has(alert.id)) {
+          return false; // Already shown, skip it
+        }
+        shownAlertIdsRef.current.add(alert.id); // Mark as shown
+        return true;
+      });
+
+      if (unseenAlerts.length === 0) return;
+
+      setNewAlertsCount((prev) => prev + unseenAlerts.length);
+
+      // Show notification for each unseen alert (only once)
+      unseenAlerts.forEach((alert) => {
+        // Show toast notification
+        const alertTypeColors = {
+          emergency: 'error',
+          warning: 'warning',
+          announcement: 'info',
+          info: 'info',
+        };
+
+        toast[alertTypeColors[alert.type] || 'info'](alert.title, {
+          description: alert.message.substring(0, 100) + (alert.message.length > 100 ? '...' : ''),
+          duration: 5000,
+          id: `alert-${alert.id}`, // Use alert ID as toast ID to prevent duplicates
+        });
+
+        // Show browser notification if permission granted
+        if (
+          'Notification' in window &&
+          notificationPermissionRef.current === 'granted'
+        ) {
+          new Notification(`New ${alert.type} Alert: ${alert.title}`, {
+            body: alert.message.substring(0, 200),
+            icon: '/favicon.ico',
+            badge: '/favicon.ico',
+            tag: `alert-${alert.id}`, // Browser uses tag to prevent duplicate notifications
+            requireInteraction: alert.type === 'emergency' || alert.priority === 'high',
+          });
+        }
+      });
+
+      // Update last check time only after processing alerts
+      lastCheckTimeRef.current = new Date().toISOString();
+    };
+
     const checkForNewAlerts = async () => {
       try {
         const response = await alertsAPI.getNew(lastCheckTimeRef.current);
-        const newAlerts = response.data || [];
-
-        if (newAlerts.length > 0) {
-          // Filter out alerts that have already been shown
-          const unseenAlerts = newAlerts.filter(alert => {
-            if (shownAlertIdsRef.current.has(alert.id)) {
-              return false; // Already shown, skip it
-            }
-            shownAlertIdsRef.current.add(alert.id); // Mark as shown
-            return true;
-          });
-
-          if (unseenAlerts.length > 0) {
-            setNewAlertsCount((prev) => prev + unseenAlerts.length);
-
-            // Show notification for each unseen alert (only once)
-            unseenAlerts.forEach((alert) => {
-              // Show toast notification
-              const alertTypeColors = {
-                emergency: 'error',
-                warning: 'warning',
-                announcement: 'info',
-                info: 'info',
-              };
-
-              toast[alertTypeColors[alert.type] || 'info'](alert.title, {
-                description: alert.message.substring(0, 100) + (alert.message.length > 100 ? '...' : ''),
-                duration: 5000,
-                id: `alert-${alert.id}`, // Use alert ID as toast ID to prevent duplicates
-              });
-
-              // Show browser notification if permission granted
-              if (
-                'Notification' in window &&
-                notificationPermissionRef.current === 'granted'
-              ) {
-                new Notification(`New ${alert.type} Alert: ${alert.title}`, {
-                  body: alert.message.substring(0, 200),
-                  icon: '/favicon.ico',
-                  badge: '/favicon.ico',
-                  tag: `alert-${alert.id}`, // Browser uses tag to prevent duplicate notifications
-                  requireInteraction: alert.type === 'emergency' || alert.priority === 'high',
-                });
-              }
-            });
-
-            // Update last check time only after processing alerts
-            lastCheckTimeRef.current = new Date().toISOString();
-          }
-        }
+        showAlerts(response.data || []);
       } catch (error) {
         // Silently fail - don't spam errors for polling
         if (error.response?.status !== 401) {
@@ -89,15 +93,64 @@ export function useNotifications(enabled = true) {
       }
     };
 
-    // Check immediately
-    checkForNewAlerts();
+    const startPolling = () => {
+      if (intervalRef.current) return;
+      // Check immediately, then poll every 30 seconds
+      checkForNewAlerts();
+      intervalRef.current = setInterval(checkForNewAlerts, 30000);
+    };
+
+    let source = null;
+    let reconnectTimer = null;
+    let failures = 0;
+    let stopped = false;
+
+    const connect = async () => {
+      let token;
+      try {
+        token = (await alertsAPI.streamToken()).data.token;
+      } catch (error) {
+        startPolling();
+        return;
+      }
+      if (stopped) return;
+      source = new EventSource(alertsAPI.streamUrl(token));
+      source.addEventListener('alert_created', (event) => {
+        showAlerts([JSON.parse(event.data)]);
+      });
+      source.onopen = () => {
+        failures = 0;
+        // Catch anything created while the stream was (re)connecting
+        checkForNewAlerts();
+      };
+      source.onerror = () => {
+        // The stream token expires soon after connecting, so EventSource's own retry with the
+        // same URL would be refused; reconnect with a fresh token, and poll if that keeps failing
+        source.close();
+        failures += 1;
+        if (failures >= STREAM_MAX_FAILURES) {
+          startPolling();
+        } else {
+          reconnectTimer = setTimeout(connect, STREAM_RECONNECT_MS);
+        }
+      };
+    };
 
-    // Poll every 30 seconds
-    intervalRef.current = setInterval(checkForNewAlerts, 30000);
+    if ('EventSource' in window) {
+      connect();
+    } else {
+      startPolling();
+    }
 
     return () => {
+      stopped = true;
+      clearTimeout(reconnectTimer);
+      if (source) {
+        source.close();
+      }
       if (intervalRef.current) {
         clearInterval(intervalRef.current);
+        intervalRef.current = null;
       }
     };
   }, [enabled]); // Removed lastCheckTime from dependencies to prevent re-running
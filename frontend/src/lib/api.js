@@ -42,14 +42,32 @@ export const authAPI = {
 export const alertsAPI = {
   getAll: () => api.get('/alerts'),
   getNew: (since) => api.get('/alerts/new', { params: { since } }),
+  // EventSource cannot send headers, so a short-lived stream token travels as a query parameter
+  streamToken: () => api.post('/alerts/stream-token'),
+  streamUrl: (token) => `${API_URL}/alerts/stream?token=${encodeURIComponent(token)}`,
   create: (data) => api.post('/alerts', data),
 };
 
 // Reports
 export const reportsAPI = {
-  getAll: () => api.get('/reports'),
+  // Returns a page: { items, next_cursor }. Pass next_cursor back as `cursor` for the next page.
+  getAll: (params) => api.get('/reports', { params }),
   create: (data) => api.post('/reports', data),
   updateStatus: (id, data) => api.put(`/reports/${id}/status`, data),
+  // Every matching report, oldest first (Admin/Official); params: { format: 'csv' | 'ndjson', status, type, date_from, date_to }
+  export: (params) => api.get('/reports/export', { params, responseType: 'blob' }),
+};
+
+// Search (relevance-ranked; params: { q, kind: 'report' | 'alert', limit, offset })
+// Returns { items: [{ kind, id, score, report | alert }], next_offset }
+export const searchAPI = {
+  query: (params) => api.get('/search', { params }),
+};
+
+// Incremental sync (params: { token, kind: 'report' | 'alert', limit })
+// Returns { token, reset, has_more, alerts, reports, deleted: { alerts, reports } }; see lib/sync.js
+export const syncAPI = {
+  changes: (params) => api.get('/sync', { params }),
 };
 
 // Users (Admin)
@@ -66,11 +84,19 @@ export const chatbotAPI = {
 // Dashboard Stats
 export const statsAPI = {
   getDashboard: () => api.get('/stats/dashboard'),
+  // Aggregated server-side; params: { bucket: 'day' | 'week' | 'month', date_from, date_to }
+  getReportAnalytics: (params) => api.get('/stats/analytics/reports', { params }),
+  getAlertAnalytics: (params) => api.get('/stats/analytics/alerts', { params }),
+  getUserAnalytics: (params) => api.get('/stats/analytics/users', { params }),
+  getResolutionStats: (params) => api.get('/stats/analytics/resolution', { params }),
 };
 
 // System Logs
 export const logsAPI = {
-  getAll: () => api.get('/logs'),
+  // Returns a page: { items, next_cursor }; params: { cursor, limit, action, user_id, date_from, date_to }
+  getAll: (params) => api.get('/logs', { params }),
+  // Every matching log as NDJSON (one JSON object per line)
+  export: (params) => api.get('/logs', { params: { ...params, format: 'ndjson' }, responseType: 'blob' }),
 };
 
 // Seed Data
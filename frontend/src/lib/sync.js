@@ -0,0 +1,49 @@
+import { syncAPI } from './api';
+
+// Local copies of the alert and report lists, kept current through /api/sync so a returning
+// visitor only downloads what changed since the last visit
+const KEY_PREFIX = 'sync:';
+const LIST_KEYS = { alert: 'alerts', report: 'reports' };
+
+const storageKey = (kind) => {
+  const user = JSON.parse(localStorage.getItem('user') || '{}');
+  return `${KEY_PREFIX}${kind}:${user.id || 'anonymous'}`;
+};
+
+const loadState = (kind) => {
+  try {
+    return JSON.parse(localStorage.getItem(storageKey(kind))) || { token: null, rows: {} };
+  } catch (error) {
+    return { token: null, rows: {} };
+  }
+};
+
+// Returns the full list for kind ('alert' or 'report'), newest first, like GET /api/alerts
+export async function syncList(kind) {
+  const listKey = LIST_KEYS[kind];
+  let { token, rows } = loadState(kind);
+  let hasMore = true;
+  while (hasMore) {
+    const { data } = await syncAPI.changes({ kind, token: token || undefined });
+    if (data.reset) rows = {};
+    data[listKey].forEach((row) => { rows[row.id] = row; });
+    data.deleted[listKey].forEach((id) => { delete rows[id]; });
+    token = data.token;
+    hasMore = data.has_more;
+  }
+
+  try {
+    localStorage.setItem(storageKey(kind), JSON.stringify({ token, rows }));
+  } catch (error) {
+    // Over the storage quota: fetch everything again next time
+    localStorage.removeItem(storageKey(kind));
+  }
+  return Object.values(rows).sort((a, b) => new Date(b.created_at) - new Date(a.created_at) || b.id - a.id);
+}
+
+// Called on logout so the next user of this browser does not inherit the lists
+export function clearSyncCache() {
+  Object.keys(localStorage)
+    .filter((key) => key.startsWith(KEY_PREFIX))
+    .forEach((key) => localStorage.removeItem(key));
+}
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useLanguage } from '../context/LanguageContext';
 import { useNotifications } from '../hooks/useNotifications';
-import { alertsAPI } from '../lib/api';
+import { syncList } from '../lib/sync';
 import { formatRelativeTime, getAlertTypeColor, getAlertBorderClass } from '../lib/utils';
 import { Card, CardContent } from '../components/ui/card';
 import { Badge } from '../components/ui/badge';
@@ -23,8 +23,7 @@ export default function Alerts() {
 
   const loadAlerts = async () => {
     try {
-      const response = await alertsAPI.getAll();
-      setAlerts(response.data);
+      setAlerts(await syncList('alert'));
     } catch (error) {
       console.error('Error:', error);
     } finally {
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useLanguage } from '../context/LanguageContext';
-import { statsAPI, reportsAPI, alertsAPI, usersAPI } from '../lib/api';
+import { statsAPI, alertsAPI } from '../lib/api';
 import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card';
 import { Badge } from '../components/ui/badge';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../components/ui/tabs';
@@ -12,22 +12,29 @@ const COLORS = ['#DC2626', '#F59E0B', '#10B981', '#3B82F6', '#8B5CF6'];
 export default function Analytics() {
   const { t } = useLanguage();
   const [stats, setStats] = useState(null);
-  const [reports, setReports] = useState([]);
+  const [reportAnalytics, setReportAnalytics] = useState(null);
+  const [alertAnalytics, setAlertAnalytics] = useState(null);
+  const [userAnalytics, setUserAnalytics] = useState(null);
   const [alerts, setAlerts] = useState([]);
-  const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => { loadData(); }, []);
 
   const loadData = async () => {
     try {
-      const [statsRes, reportsRes, alertsRes, usersRes] = await Promise.all([
-        statsAPI.getDashboard(), reportsAPI.getAll(), alertsAPI.getAll(), usersAPI.getAll()
+      // Counts are aggregated server-side; only the latest alerts are fetched as rows
+      const [statsRes, reportAnalyticsRes, alertAnalyticsRes, userAnalyticsRes, alertsRes] = await Promise.all([
+        statsAPI.getDashboard(),
+        statsAPI.getReportAnalytics({ bucket: 'month' }),
+        statsAPI.getAlertAnalytics({ bucket: 'month' }),
+        statsAPI.getUserAnalytics({ bucket: 'month' }),
+        alertsAPI.getNew()
       ]);
       setStats(statsRes.data);
-      setReports(reportsRes.data);
+      setReportAnalytics(reportAnalyticsRes.data);
+      setAlertAnalytics(alertAnalyticsRes.data);
+      setUserAnalytics(userAnalyticsRes.data);
       setAlerts(alertsRes.data);
-      setUsers(usersRes.data);
     } catch (error) {
       console.error('Error:', error);
     } finally {
@@ -37,25 +44,29 @@ export default function Analytics() {
 
   if (loading) return <div className="flex items-center justify-center min-h-[60vh]"><Loader2 className="w-8 h-8 animate-spin text-primary" /></div>;
 
+  const reportStatusTotals = reportAnalytics?.by_status.totals || {};
+  const alertTypeTotals = alertAnalytics?.by_type.totals || {};
+  const userRoleTotals = userAnalytics?.registrations_by_role.totals || {};
+
   const reportStatusData = [
     { name: t('statusPending'), value: stats?.pending_reports || 0, color: '#F59E0B' },
-    { name: t('statusInProgress'), value: reports.filter(r => r.status === 'in_progress').length, color: '#3B82F6' },
+    { name: t('statusInProgress'), value: reportStatusTotals.in_progress || 0, color: '#3B82F6' },
     { name: t('statusResolved'), value: stats?.resolved_reports || 0, color: '#10B981' },
-    { name: t('statusRejected'), value: reports.filter(r => r.status === 'rejected').length, color: '#DC2626' }
+    { name: t('statusRejected'), value: reportStatusTotals.rejected || 0, color: '#DC2626' }
   ];
 
-  const reportTypeData = Object.entries(stats?.report_types || {}).map(([type, count]) => ({ name: type, count }));
+  const reportTypeData = Object.entries(reportAnalytics?.by_type.totals || {}).map(([type, count]) => ({ name: type, count }));
 
   const alertTypeData = [
-    { name: t('emergency'), value: alerts.filter(a => a.type === 'Emergency').length, color: '#DC2626' },
-    { name: t('advisory'), value: alerts.filter(a => a.type === 'Advisory').length, color: '#F59E0B' },
-    { name: t('announcement'), value: alerts.filter(a => a.type === 'Announcement').length, color: '#10B981' }
+    { name: t('emergency'), value: alertTypeTotals.emergency || 0, color: '#DC2626' },
+    { name: t('advisory'), value: alertTypeTotals.warning || 0, color: '#F59E0B' },
+    { name: t('announcement'), value: alertTypeTotals.announcement || 0, color: '#10B981' }
   ];
 
   const userRoleData = [
-    { name: t('residents'), value: users.filter(u => u.role === 'RESIDENT').length, color: '#3B82F6' },
-    { name: t('officials'), value: users.filter(u => u.role === 'OFFICIAL').length, color: '#8B5CF6' },
-    { name: t('admins'), value: users.filter(u => u.role === 'ADMIN').length, color: '#DC2626' }
+    { name: t('residents'), value: userRoleTotals.RESIDENT || 0, color: '#3B82F6' },
+    { name: t('officials'), value: userRoleTotals.OFFICIAL || 0, color: '#8B5CF6' },
+    { name: t('admins'), value: userRoleTotals.ADMIN || 0, color: '#DC2626' }
   ];
 
   return (
@@ -203,19 +214,19 @@ export default function Analytics() {
             <CardContent className="space-y-3">
               <div className="flex items-center justify-between p-3 bg-blue-50 dark:bg-blue-900/20 rounded-lg">
                 <span className="text-sm">{t('residents')}</span>
-                <span className="text-lg font-bold text-blue-600">{users.filter(u => u.role === 'RESIDENT').length}</span>
+                <span className="text-lg font-bold text-blue-600">{userRoleTotals.RESIDENT || 0}</span>
               </div>
               <div className="flex items-center justify-between p-3 bg-purple-50 dark:bg-purple-900/20 rounded-lg">
                 <span className="text-sm">{t('officials')}</span>
-                <span className="text-lg font-bold text-purple-600">{users.filter(u => u.role === 'OFFICIAL').length}</span>
+                <span className="text-lg font-bold text-purple-600">{userRoleTotals.OFFICIAL || 0}</span>
               </div>
               <div className="flex items-center justify-between p-3 bg-red-50 dark:bg-red-900/20 rounded-lg">
                 <span className="text-sm">{t('admins')}</span>
-                <span className="text-lg font-bold text-red-600">{users.filter(u => u.role === 'ADMIN').length}</span>
+                <span className="text-lg font-bold text-red-600">{userRoleTotals.ADMIN || 0}</span>
               </div>
               <div className="flex items-center justify-between p-3 bg-emerald-50 dark:bg-emerald-900/20 rounded-lg">
                 <span className="text-sm">{t('activeUsers')}</span>
-                <span className="text-lg font-bold text-emerald-600">{users.filter(u => u.status === 'active').length}</span>
+                <span className="text-lg font-bold text-emerald-600">{stats?.total_users || 0}</span>
               </div>
             </CardContent>
           </Card>
@@ -2,7 +2,8 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { useLanguage } from '../context/LanguageContext';
-import { alertsAPI, statsAPI, seedAPI } from '../lib/api';
+import { statsAPI, seedAPI } from '../lib/api';
+import { syncList } from '../lib/sync';
 import { formatRelativeTime, getAlertTypeColor, getAlertBorderClass } from '../lib/utils';
 import { Card, CardContent } from '../components/ui/card';
 import { Button } from '../components/ui/button';
@@ -37,8 +38,8 @@ export default function Dashboard() {
 
   const loadData = async () => {
     try {
-      const alertsRes = await alertsAPI.getAll();
-      setAlerts(alertsRes.data.slice(0, 5));
+      const allAlerts = await syncList('alert');
+      setAlerts(allAlerts.slice(0, 5));
 
       if (isOfficial || isAdmin) {
         const statsRes = await statsAPI.getDashboard();
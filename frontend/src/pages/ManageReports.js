@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { reportsAPI } from '../lib/api';
+import { reportsAPI, searchAPI } from '../lib/api';
 import { formatRelativeTime, getStatusColor } from '../lib/utils';
 import { Card, CardContent } from '../components/ui/card';
 import { Button } from '../components/ui/button';
@@ -9,7 +9,7 @@ import { Textarea } from '../components/ui/textarea';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '../components/ui/select';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from '../components/ui/dialog';
 import { toast } from 'sonner';
-import { FileText, MapPin, User, Clock, Loader2, Search, Filter } from 'lucide-react';
+import { FileText, MapPin, User, Clock, Loader2, Search, Filter, Download } from 'lucide-react';
 
 const STATUS_OPTIONS = [
   { value: 'pending', label: 'Pending' },
@@ -20,22 +20,52 @@ const STATUS_OPTIONS = [
 
 export default function ManageReports() {
   const [reports, setReports] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [search, setSearch] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
   const [statusFilter, setStatusFilter] = useState('all');
   const [selectedReport, setSelectedReport] = useState(null);
   const [newStatus, setNewStatus] = useState('');
   const [response, setResponse] = useState('');
   const [updating, setUpdating] = useState(false);
+  const [exporting, setExporting] = useState(false);
 
+  // The status filter is applied server-side so it covers every report, not just the loaded pages
   useEffect(() => {
     loadReports();
-  }, []);
+  }, [statusFilter]);
+
+  // Searching is done server-side so it covers every report, not just the loaded page
+  useEffect(() => {
+    const term = search.trim();
+    if (term.length < 2) {
+      setSearchResults(null);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      try {
+        const res = await searchAPI.query({ q: term, kind: 'report', limit: 50 });
+        if (!cancelled) setSearchResults(res.data.items.map(hit => hit.report));
+      } catch (error) {
+        console.error('Error searching reports:', error);
+      }
+    }, 300);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [search]);
+
+  const statusParams = () => (statusFilter === 'all' ? {} : { status: statusFilter });
 
   const loadReports = async () => {
     try {
-      const res = await reportsAPI.getAll();
-      setReports(res.data);
+      const res = await reportsAPI.getAll(statusParams());
+      setReports(res.data.items);
+      setNextCursor(res.data.next_cursor);
     } catch (error) {
       console.error('Error loading reports:', error);
     } finally {
@@ -43,6 +73,19 @@ export default function ManageReports() {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const res = await reportsAPI.getAll({ ...statusParams(), cursor: nextCursor });
+      setReports((current) => [...current, ...res.data.items]);
+      setNextCursor(res.data.next_cursor);
+    } catch (error) {
+      console.error('Error loading reports:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleUpdateStatus = async () => {
     if (!newStatus) {
       toast.error('Please select a status');
@@ -67,13 +110,28 @@ export default function ManageReports() {
     }
   };
 
-  const filteredReports = reports.filter(report => {
-    const matchesSearch = report.description.toLowerCase().includes(search.toLowerCase()) ||
-      report.report_type.toLowerCase().includes(search.toLowerCase()) ||
-      report.user_name.toLowerCase().includes(search.toLowerCase());
-    const matchesStatus = statusFilter === 'all' || report.status === statusFilter;
-    return matchesSearch && matchesStatus;
-  });
+  // Exports the full history (honouring the status filter), not just the loaded page
+  const handleExport = async () => {
+    setExporting(true);
+    try {
+      const res = await reportsAPI.export({ ...statusParams(), format: 'csv' });
+      const url = URL.createObjectURL(res.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `reports-${new Date().toISOString().slice(0, 10)}.csv`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (error) {
+      toast.error('Failed to export reports');
+    } finally {
+      setExporting(false);
+    }
+  };
+
+  // Search hits come from /api/search, which does not filter by status
+  const filteredReports = searchResults
+    ? searchResults.filter(report => statusFilter === 'all' || report.status === statusFilter)
+    : reports;
 
   if (loading) {
     return (
@@ -85,13 +143,19 @@ export default function ManageReports() {
 
   return (
     <div className="space-y-6 pb-20 md:pb-0" data-testid="manage-reports-page">
-      <div className="animate-fade-in">
-        <h1 className="text-2xl sm:text-3xl font-bold font-['Outfit']">
-          Manage Reports
-        </h1>
-        <p className="text-muted-foreground mt-1">
-          View and respond to resident reports
-        </p>
+      <div className="flex items-start justify-between gap-4 animate-fade-in">
+        <div>
+          <h1 className="text-2xl sm:text-3xl font-bold font-['Outfit']">
+            Manage Reports
+          </h1>
+          <p className="text-muted-foreground mt-1">
+            View and respond to resident reports
+          </p>
+        </div>
+        <Button variant="outline" onClick={handleExport} disabled={exporting} data-testid="export-reports-button">
+          {exporting ? <Loader2 className="w-4 h-4 mr-2 animate-spin" /> : <Download className="w-4 h-4 mr-2" />}
+          Export CSV
+        </Button>
       </div>
 
       {/* Filters */}
@@ -172,6 +236,15 @@ export default function ManageReports() {
         </div>
       )}
 
+      {!searchResults && nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore} data-testid="load-more-reports-button">
+            {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
+
       {/* Update Dialog */}
       <Dialog open={!!selectedReport} onOpenChange={() => setSelectedReport(null)}>
         <DialogContent className="max-w-lg">
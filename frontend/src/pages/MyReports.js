@@ -1,22 +1,34 @@
 import React, { useState, useEffect } from 'react';
 import { useLanguage } from '../context/LanguageContext';
+import { useAuth } from '../context/AuthContext';
 import { reportsAPI } from '../lib/api';
+import { syncList } from '../lib/sync';
 import { formatRelativeTime, getStatusColor } from '../lib/utils';
 import { Card, CardContent } from '../components/ui/card';
 import { Badge } from '../components/ui/badge';
+import { Button } from '../components/ui/button';
 import { FileText, MapPin, Loader2, Clock, CheckCircle } from 'lucide-react';
 
 export default function MyReports() {
   const { t } = useLanguage();
+  const { isResident } = useAuth();
   const [reports, setReports] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => { loadReports(); }, []);
 
   const loadReports = async () => {
     try {
-      const response = await reportsAPI.getAll();
-      setReports(response.data);
+      if (isResident) {
+        // A resident's own reports are few, so the whole list is kept locally and synced
+        setReports(await syncList('report'));
+      } else {
+        const response = await reportsAPI.getAll();
+        setReports(response.data.items);
+        setNextCursor(response.data.next_cursor);
+      }
     } catch (error) {
       console.error('Error:', error);
     } finally {
@@ -24,6 +36,19 @@ export default function MyReports() {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await reportsAPI.getAll({ cursor: nextCursor });
+      setReports((current) => [...current, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Error:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getStatusLabel = (status) => {
     const labels = { pending: t('statusPending'), in_progress: t('statusInProgress'), resolved: t('statusResolved'), rejected: t('statusRejected') };
     return labels[status] || status;
@@ -72,6 +97,15 @@ export default function MyReports() {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore} data-testid="load-more-reports-button">
+            {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+            {t('loadMore')}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -4,11 +4,15 @@ import { formatRelativeTime } from '../lib/utils';
 import { Card, CardContent } from '../components/ui/card';
 import { Input } from '../components/ui/input';
 import { Badge } from '../components/ui/badge';
-import { Activity, Search, Loader2, User, Clock } from 'lucide-react';
+import { Button } from '../components/ui/button';
+import { Activity, Search, Loader2, User, Clock, Download } from 'lucide-react';
 
 export default function SystemLogs() {
   const [logs, setLogs] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [exporting, setExporting] = useState(false);
   const [search, setSearch] = useState('');
 
   useEffect(() => {
@@ -18,7 +22,8 @@ export default function SystemLogs() {
   const loadLogs = async () => {
     try {
       const res = await logsAPI.getAll();
-      setLogs(res.data);
+      setLogs(res.data.items);
+      setNextCursor(res.data.next_cursor);
     } catch (error) {
       console.error('Error loading logs:', error);
     } finally {
@@ -26,9 +31,39 @@ export default function SystemLogs() {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const res = await logsAPI.getAll({ cursor: nextCursor });
+      setLogs((current) => [...current, ...res.data.items]);
+      setNextCursor(res.data.next_cursor);
+    } catch (error) {
+      console.error('Error loading logs:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const exportLogs = async () => {
+    setExporting(true);
+    try {
+      const res = await logsAPI.export();
+      const url = URL.createObjectURL(res.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = 'system_logs.ndjson';
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error('Error exporting logs:', error);
+    } finally {
+      setExporting(false);
+    }
+  };
+
   const filteredLogs = logs.filter(log =>
     log.action.toLowerCase().includes(search.toLowerCase()) ||
-    log.user_name.toLowerCase().includes(search.toLowerCase()) ||
+    (log.user && log.user.toLowerCase().includes(search.toLowerCase())) ||
     (log.details && log.details.toLowerCase().includes(search.toLowerCase()))
   );
 
@@ -50,13 +85,19 @@ export default function SystemLogs() {
 
   return (
     <div className="space-y-6 pb-20 md:pb-0" data-testid="system-logs-page">
-      <div className="animate-fade-in">
-        <h1 className="text-2xl sm:text-3xl font-bold font-['Outfit']">
-          System Logs
-        </h1>
-        <p className="text-muted-foreground mt-1">
-          View user activity and system events
-        </p>
+      <div className="flex items-start justify-between gap-4 animate-fade-in">
+        <div>
+          <h1 className="text-2xl sm:text-3xl font-bold font-['Outfit']">
+            System Logs
+          </h1>
+          <p className="text-muted-foreground mt-1">
+            View user activity and system events
+          </p>
+        </div>
+        <Button variant="outline" onClick={exportLogs} disabled={exporting} data-testid="export-logs-button">
+          {exporting ? <Loader2 className="w-4 h-4 mr-2 animate-spin" /> : <Download className="w-4 h-4 mr-2" />}
+          Export
+        </Button>
       </div>
 
       {/* Search */}
@@ -95,7 +136,7 @@ export default function SystemLogs() {
                       </Badge>
                       <div className="flex items-center gap-1 text-sm text-muted-foreground">
                         <User className="w-3 h-3" />
-                        {log.user_name}
+                        {log.user}
                       </div>
                     </div>
                     {log.details && (
@@ -114,6 +155,15 @@ export default function SystemLogs() {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore} data-testid="load-more-logs-button">
+            {loadingMore && <Loader2 className="w-4 h-4 mr-2 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
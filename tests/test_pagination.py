@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_engine, desc, func, insert, select
+
+from pagination import encode_cursor, keyset_before
+
+
+def walk(engine, table, limit):
+    """Follow cursors the way /api/reports does; returns the ids of each page."""
+    pages, cursor = [], None
+    while len(pages) < 20:
+        stmt = select(table.c.id, table.c.created_at)
+        if cursor:
+            stmt = stmt.where(keyset_before(table.c.created_at, table.c.id, cursor))
+        with engine.connect() as conn:
+            rows = conn.execute(stmt.order_by(desc(table.c.created_at), desc(table.c.id)).limit(limit + 1)).all()
+        pages.append([row.id for row in rows[:limit]])
+        if len(rows) <= limit:
+            return pages
+        cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id)
+    raise AssertionError(f"cursor did not advance: {pages}")
+
+
+def test_cursor_pages_through_rows_from_the_same_second_on_sqlite():
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    reports = Table(
+        "reports", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Server defaults are stored as whole-second text, so these all share one second
+        conn.execute(insert(reports), [{"id": n} for n in range(1, 6)])
+        conn.execute(insert(reports).values(id=6, created_at=func.datetime("now", "-1 day")))
+
+    pages = walk(engine, reports, limit=2)
+
+    assert pages == [[5, 4], [3, 2], [1, 6]]
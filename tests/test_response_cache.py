@@ -0,0 +1,33 @@
+from unittest import mock
+
+from starlette.requests import Request
+
+from response_cache import ResponseCache
+
+
+def request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_entries_expire_with_the_ttl_window():
+    # A worker that never sees the bump must stop serving the old body and 304
+    cache = ResponseCache(ttl_seconds=5)
+    with mock.patch("response_cache.time.time", return_value=1000.0):
+        etag, cached = cache.lookup(request(), ("alerts",))
+        assert cached is None
+        cache.store(etag, b"[]")
+        assert cache.lookup(request(), ("alerts",))[1].body == b"[]"
+        assert cache.lookup(request(etag), ("alerts",))[1].status_code == 304
+    with mock.patch("response_cache.time.time", return_value=1005.0):
+        new_etag, cached = cache.lookup(request(etag), ("alerts",))
+    assert cached is None
+    assert new_etag != etag
+
+
+def test_bump_invalidates_at_once():
+    cache = ResponseCache(ttl_seconds=0)
+    etag, _ = cache.lookup(request(), ("logs",))
+    cache.store(etag, b"[]")
+    cache.bump("logs")
+    assert cache.lookup(request(etag), ("logs",))[1] is None